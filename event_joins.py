@@ -0,0 +1,273 @@
+import numpy as np
+from session_record import AOI_LEFT, AOI_RIGHT, AOI_NAMES
+
+
+
+
+###########################################################
+#
+#   Temporal joins of the fixation, saccade, and trigger streams of one experiment session, see extract_scalars.py
+#
+#   All streams are sorted by time on the same filtered time axis (see correct_times() in extract_scalars.py),
+#       so each event of one stream is related to the events of another stream by binary search with np.searchsorted()
+#       instead of a loop over both streams.
+#   Missing partners (e.g. a trigger before the first fixation on the functioning disc) are given as index -1.
+#   The time spent on each interest area in time bins around events (e.g. from 2 s before to 3 s after each trigger)
+#       is the difference of the cumulative fixation time on the interest area at the bin edges,
+#       which is evaluated for all edges of all events at once.
+#
+#   Functions:
+#       join_preceding(times, query_times, candidates=None) returns i_preceding
+#       join_triggers(fixation_times, fixation_durations, fixation_codes, trigger_times, code) returns trigger_events
+#       join_saccades(fixation_times, fixation_codes, saccade_times) returns saccade_events
+#       get_peri_event_dwell(fixation_times, fixation_durations, fixation_codes, event_times, bin_edges, N_codes)
+#           returns dwell
+#       get_occupancy(dwell_sum, N_events, bin_edges) returns occupancy
+#       aggregate_peri_events(records, group_keys, key='peri_trigger') returns groups
+#
+###########################################################
+
+
+TRIGGER_EVENT_DTYPE = np.dtype([('time', np.int32), ('i_fixation', np.int32), ('latency', np.int32),
+    ('during_fixation', np.bool_)])
+    # one row per trigger, see join_triggers()
+SACCADE_EVENT_DTYPE = np.dtype([('i_source', np.int32), ('i_target', np.int32), ('source_area', np.int8),
+    ('target_area', np.int8)])
+    # one row per saccade, see join_saccades()
+PERI_AREAS = AOI_NAMES + ['functioning', 'nonfunctioning']
+    # interest areas of aggregated peri-event data, see aggregate_peri_events()
+FUNCT_CODES = {'R':(AOI_RIGHT, AOI_LEFT), 'L':(AOI_LEFT, AOI_RIGHT)}
+    # codes of functioning and nonfunctioning disc for each functioning side
+
+
+
+
+def join_preceding(times, query_times, candidates=None):
+    """
+    function for finding the last event at or before each query time in a sorted stream of events
+
+    input:
+        times (ndarray), sorted times of events in ms
+        query_times (ndarray), times in ms for which the preceding event is searched
+        candidates (ndarray), optional, boolean mask of the events which may be joined, by default all events
+
+    output: i_preceding (ndarray), index of preceding event for each query time, -1 if there is none
+    """
+
+    times = np.asarray(times)
+    if candidates is None:
+        i_candidates = np.arange(len(times))
+    else:
+        i_candidates = np.flatnonzero(candidates)
+    i_found = np.searchsorted(times[i_candidates], query_times, side='right') - 1
+    i_preceding = np.append(i_candidates, -1)[i_found]  # index -1 of i_found selects the appended -1
+
+    return i_preceding
+
+
+###
+#
+###
+
+
+def join_triggers(fixation_times, fixation_durations, fixation_codes, trigger_times, code):
+    """
+    function for joining each image trigger with the preceding fixation on one interest area,
+        e.g. the functioning disc whose fixation triggers the images
+
+    input:
+        fixation_times (ndarray), sorted start times of fixations in ms
+        fixation_durations (ndarray), durations of fixations in ms
+        fixation_codes (ndarray), interest area codes of fixations
+        trigger_times (ndarray), sorted times of image triggers in ms
+        code (int), interest area code of joined fixations, None if no fixation is joined
+
+    output: trigger_events (ndarray), structured array of dtype TRIGGER_EVENT_DTYPE with one row per trigger
+        - time: trigger time in ms
+        - i_fixation: index of the last fixation on the interest area starting at or before the trigger, -1 if none
+        - latency: time from start of this fixation to trigger in ms, -42 if no fixation
+        - during_fixation: True if the trigger occurred before the end of this fixation
+    """
+
+    fixation_times = np.asarray(fixation_times)
+    trigger_times = np.asarray(trigger_times)
+    if code is None:
+        i_fixations = np.zeros(len(trigger_times), dtype=int) - 1
+    else:
+        i_fixations = join_preceding(fixation_times, trigger_times, np.asarray(fixation_codes) == code)
+    joined = i_fixations >= 0
+    start_times = fixation_times[i_fixations[joined]]
+    end_times = start_times + np.asarray(fixation_durations)[i_fixations[joined]]
+
+    trigger_events = np.zeros(len(trigger_times), dtype=TRIGGER_EVENT_DTYPE)
+    trigger_events['time'] = trigger_times
+    trigger_events['i_fixation'] = i_fixations
+    trigger_events['latency'] = -42     # some dummy value
+    trigger_events['latency'][joined] = trigger_times[joined] - start_times
+    trigger_events['during_fixation'][joined] = trigger_times[joined] <= end_times
+
+    return trigger_events
+
+
+###
+#
+###
+
+
+def join_saccades(fixation_times, fixation_codes, saccade_times):
+    """
+    function for joining each saccade with its source and target fixation
+    -> the source is the last fixation starting at or before the saccade, the target is the fixation following it
+
+    input:
+        fixation_times (ndarray), sorted start times of fixations in ms
+        fixation_codes (ndarray), interest area codes of fixations
+        saccade_times (ndarray), sorted start times of saccades in ms
+
+    output: saccade_events (ndarray), structured array of dtype SACCADE_EVENT_DTYPE with one row per saccade
+        - i_source, i_target: index of source and target fixation, -1 if none
+        - source_area, target_area: interest area code of source and target fixation, -1 if none
+    """
+
+    N_fix = len(fixation_times)
+    i_sources = join_preceding(fixation_times, saccade_times)
+    i_targets = i_sources + 1
+    i_targets[i_targets == N_fix] = -1
+    area_codes = np.append(np.asarray(fixation_codes, dtype=np.int8), -1)   # index -1 selects the appended -1
+
+    saccade_events = np.zeros(len(i_sources), dtype=SACCADE_EVENT_DTYPE)
+    saccade_events['i_source'] = i_sources
+    saccade_events['i_target'] = i_targets
+    saccade_events['source_area'] = area_codes[i_sources]
+    saccade_events['target_area'] = area_codes[i_targets]
+
+    return saccade_events
+
+
+###
+#
+###
+
+
+def get_peri_event_dwell(fixation_times, fixation_durations, fixation_codes, event_times, bin_edges, N_codes):
+    """
+    function for computing the time spent on each interest area in time bins around each event, e.g. image triggers
+    -> the cumulative fixation time on an interest area grows by the elapsed part of the ongoing fixation,
+        so its values at all bin edges of all events are found with one binary search in the fixation times
+
+    input:
+        fixation_times (ndarray), sorted start times of fixations in ms
+        fixation_durations (ndarray), durations of fixations in ms
+        fixation_codes (ndarray), interest area codes of fixations
+        event_times (ndarray), times of events in ms
+        bin_edges (ndarray), sorted edges of time bins relative to each event in ms, e.g. [-2000, -1500, ..., 3000]
+        N_codes (int), number of interest area codes
+
+    output: dwell (ndarray), time in ms spent on each interest area in each bin around each event,
+        shape (number of events, number of bins, N_codes)
+    """
+
+    fixation_times = np.asarray(fixation_times, dtype=np.int64)
+    fixation_durations = np.asarray(fixation_durations, dtype=np.int64)
+    fixation_codes = np.asarray(fixation_codes, dtype=int)
+    N_fix = len(fixation_times)
+    edge_times = np.asarray(event_times, dtype=np.int64)[:, None] + np.asarray(bin_edges, dtype=np.int64)[None, :]
+    if N_fix == 0:
+        return np.zeros((edge_times.shape[0], edge_times.shape[1]-1, N_codes), dtype=np.int32)
+
+    cumulative_times = np.zeros((N_fix+1, N_codes), dtype=np.int64)
+    cumulative_times[np.arange(1, N_fix+1), fixation_codes] = fixation_durations
+    cumulative_times = np.cumsum(cumulative_times, axis=0)
+        # row i contains the time spent on each interest area during the fixations before fixation i
+
+    i_fixations = np.searchsorted(fixation_times, edge_times, side='right') - 1
+        # fixation started last at or before each edge
+    started = i_fixations >= 0
+    i_fixations[~started] = 0
+    elapsed_times = np.minimum(edge_times - fixation_times[i_fixations], fixation_durations[i_fixations])
+    elapsed_times[~started] = 0     # edges before first fixation
+    fixation_time = cumulative_times[i_fixations]
+    fixation_time[~started] = 0
+    fixation_time += elapsed_times[..., None] * (fixation_codes[i_fixations][..., None] == np.arange(N_codes))
+        # cumulative fixation time on each interest area at each edge
+
+    dwell = np.diff(fixation_time, axis=1).astype(np.int32)
+
+    return dwell
+
+
+###
+#
+###
+
+
+def get_occupancy(dwell_sum, N_events, bin_edges):
+    """
+    function for converting summed dwell times into the fraction of each time bin spent on each interest area
+
+    input:
+        dwell_sum (ndarray), dwell times of get_peri_event_dwell() summed over events,
+            shape (number of bins, number of areas)
+        N_events (int), number of summed events
+        bin_edges (ndarray), edges of time bins relative to each event in ms
+
+    output: occupancy (ndarray), mean fraction of each bin spent on each interest area, zero if there are no events
+    """
+
+    if N_events == 0:
+        return np.zeros(np.shape(dwell_sum))
+    bin_widths = np.diff(bin_edges).astype(float)
+
+    return np.asarray(dwell_sum) / (N_events * bin_widths[:, None])
+
+
+###
+#
+###
+
+
+def aggregate_peri_events(records, group_keys, key='peri_trigger'):
+    """
+    function for pooling the peri-event dwell times of the events of several sessions,
+        e.g. by subject group, age, and session type
+    -> only sessions with functioning side 'R' or 'L' are pooled, left and right disc are also pooled as
+        functioning and nonfunctioning disc
+
+    input:
+        records (list), SessionRecords (or dictionaries) of sessions containing peri-event data under key,
+            see join_session_events() in extract_scalars.py
+        group_keys (list), keys of session data defining the groups, e.g. ['group', 'age', 'session_type']
+        key (str), key of peri-event data
+
+    output: groups (dictionary), for each tuple of values of group_keys a dictionary containing
+        - N_sessions: number of pooled sessions
+        - N_events: number of pooled events
+        - bin_edges: edges of time bins relative to each event in ms
+        - dwell_sum: summed dwell times in ms of each bin (first axis) and interest area of PERI_AREAS (second axis)
+        - occupancy: mean fraction of each bin spent on each interest area of PERI_AREAS
+    """
+
+    groups = {}
+    for record in records:  # loop over sessions
+        if key not in record or record.get('functioning_side') not in FUNCT_CODES:
+            continue
+        peri_data = record[key]
+        funct_code, nonfunct_code = FUNCT_CODES[record['functioning_side']]
+        dwell_sum = peri_data['dwell'].sum(axis=0, dtype=np.int64)
+        dwell_sum = np.column_stack([dwell_sum, dwell_sum[:, funct_code], dwell_sum[:, nonfunct_code]])
+
+        group = tuple(record.get(group_key, '.') for group_key in group_keys)
+        if group not in groups:
+            groups[group] = {'N_sessions':0, 'N_events':0, 'bin_edges':peri_data['bin_edges'],
+                'dwell_sum':np.zeros(dwell_sum.shape, dtype=np.int64)}
+        elif not np.array_equal(groups[group]['bin_edges'], peri_data['bin_edges']):
+            raise ValueError('sessions of group {} have different time bins'.format(group))
+        groups[group]['N_sessions'] += 1
+        groups[group]['N_events'] += len(peri_data['dwell'])
+        groups[group]['dwell_sum'] += dwell_sum
+
+    for group in groups:
+        groups[group]['occupancy'] = get_occupancy(groups[group]['dwell_sum'], groups[group]['N_events'],
+            groups[group]['bin_edges'])
+
+    return groups
@@ -1,11 +1,18 @@
 import os
+import re
+import hashlib
+import zipfile
+import mmap
+import StringIO
+import multiprocessing
 import xlrd
 import cPickle
 import numpy as np
 import argparse
 import scipy as sp
-from scipy import stats, spatial
+from scipy import stats, signal
 import sys
+import time
 import platform
 import traceback
 if platform.system() == 'Windows':
@@ -16,6 +23,10 @@ else:
     if os.path.exists(site_packages_path):
         sys.path.append(site_packages_path)
 from tqdm import tqdm
+from session_record import SessionRecord, AOI_BACKGROUND, AOI_IMAGE, AOI_LEFT, AOI_RIGHT, AOI_NAMES, SACCADE_DTYPE
+from gaze_patterns import compile_patterns, scan_patterns
+from event_joins import join_triggers, join_saccades, get_peri_event_dwell, get_occupancy, aggregate_peri_events
+from event_joins import PERI_AREAS
 
 
 
@@ -30,10 +41,91 @@ from tqdm import tqdm
 
 FAILURE_RATE = None
 parser = argparse.ArgumentParser()
-parser.add_argument('-c', '--dt_cutoff', type=int, default=200, help='Cutoff value of saccade duration for filtering in ms')
+parser.add_argument('-c', '--dt_cutoff', default='200', metavar='DT_CUTOFF[,DT_CUTOFF...]',
+    help='Cutoff value of saccade duration for filtering in ms, several comma-separated values are extracted in one pass '
+        '(default 200)')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes for processing fixation reports')
+parser.add_argument('--no_cache', action='store_true',
+    help='Parse all reports from text and estimate all failure rates without using the parse cache and failure rate memo')
+parser.add_argument('--clear_cache', action='store_true', help='Delete the parse cache and failure rate memo before extraction')
+parser.add_argument('-i', '--incremental', action='store_true',
+    help='Only process sessions whose reports, overview data, or parameters changed since the last extraction')
+parser.add_argument('--kde_method', choices=['fft', 'exact', 'search'], default='fft',
+    help='Kernel density estimate of fixation coordinates for the failure rate: binned FFT (default), exact evaluation, '
+        'or exact evaluation in the disc regions with a coarse-to-fine peak search')
+parser.add_argument('--peak_tolerance', type=int, default=1,
+    help='Step of the finest grid of the peak search in pixels (default 1)')
+parser.add_argument('--validate_peaks', action='store_true',
+    help='Report the distance of the peak search results from the maxima of the exhaustive grid evaluation')
+parser.add_argument('--failure_rate_timeout', type=float, default=600.0,
+    help='Time budget of the failure rate estimation of one session in s (default 600)')
+parser.add_argument('--memo_size', type=float, default=100.0,
+    help='Maximal size of the failure rate memo in MB (default 100)')
+parser.add_argument('--epochs', nargs='+', default=['60:5'], metavar='LENGTH:NUMBER',
+    help='Epoch schemes as epoch length in s and number of epochs, the epoch data of each scheme are stored (default 60:5)')
+parser.add_argument('--peri_trigger', default='2:3:0.5', metavar='BEFORE:AFTER:BIN',
+    help='Window of the interest area occupancy around each image trigger as time before and after the trigger'
+        + ' and width of its time bins in s (default 2:3:0.5)')
 
 args = parser.parse_args()
-dt_cutoff = args.dt_cutoff
+DT_CUTOFFS = []     # cutoff values of saccade duration in ms, all extracted from the same parsed reports
+for cutoff_value in args.dt_cutoff.split(','):
+    try:
+        cutoff_value = int(cutoff_value)
+    except ValueError:
+        parser.error('cutoff value {} not recognized as number'.format(cutoff_value))
+    if cutoff_value not in DT_CUTOFFS:
+        DT_CUTOFFS.append(cutoff_value)
+dt_cutoff = DT_CUTOFFS[0]   # cutoff value of the results currently stored, set by the main script
+jobs = args.jobs
+use_cache = not args.no_cache
+incremental = args.incremental
+KDE_METHOD = args.kde_method
+PEAK_TOLERANCE = max(args.peak_tolerance, 1)
+VALIDATE_PEAKS = args.validate_peaks
+FAILURE_RATE_TIMEOUT = args.failure_rate_timeout
+FAILURE_RATE_MEMO_SIZE = int(args.memo_size * 2**20)     # in bytes
+FAILURE_RATE_MEMO_VERSION = 2   # version of failure rate memo entries, increase whenever extract_failure_rate() changes
+PEAK_SEARCH_STEP = 16       # step of the coarsest grid of the peak search in pixels
+PEAK_SEARCH_CANDIDATES = 3  # number of grid points refined in each step of the peak search
+EPOCH_SCHEMES = []      # list of (epoch length in ms, number of epochs)
+for epoch_scheme in args.epochs:
+    try:
+        epoch_length, N_epochs = epoch_scheme.split(':')
+        epoch_length, N_epochs = int(round(1000*float(epoch_length))), int(N_epochs)
+    except ValueError:
+        parser.error('epoch scheme {} not recognized, use <epoch length in s>:<number of epochs>'.format(epoch_scheme))
+    if epoch_length <= 0 or N_epochs <= 0:
+        parser.error('epoch scheme {} needs a positive epoch length and number of epochs'.format(epoch_scheme))
+    EPOCH_SCHEMES.append((epoch_length, N_epochs))
+try:
+    time_before, time_after, bin_width = [float(value) for value in args.peri_trigger.split(':')]
+except ValueError:
+    parser.error('peri-trigger window {} not recognized, use <time before>:<time after>:<bin width> in s'.format(
+        args.peri_trigger))
+if bin_width <= 0:
+    parser.error('peri-trigger window {} needs a positive bin width'.format(args.peri_trigger))
+N_peri_bins = int(round((time_before+time_after) / bin_width))
+if N_peri_bins <= 0 or abs(N_peri_bins*bin_width - (time_before+time_after)) > 1e-6:
+    parser.error('peri-trigger window {} needs a positive length which is a multiple of the bin width'.format(
+        args.peri_trigger))
+PERI_TRIGGER_EDGES = np.round(1000 * (bin_width*np.arange(N_peri_bins+1) - time_before)).astype(int)
+    # edges of time bins relative to each image trigger in ms
+CACHE_VERSION = 6     # version of parse cache format, increase whenever parsed columns change
+TRIGGER_MESSAGE = 'PLAY_SOUND_b'    # message for sound playback signals image trigger
+JOIN_SCALARS = [('median_trigger_latency', 'median functioning side fixation trigger latency'),
+    ('trigger_fixation_ratio', 'functioning side fixation trigger ratio'),
+    ('sac_area_change_ratio', 'saccade area change ratio')]
+    # keys and labels of the scalars of the event joins, stored after the epoch columns of scalars.xls
+PATTERN_L, PATTERN_R, PATTERN_LR = 0, 1, 2      # codes of extended gaze patterns, index of their declaration
+PATTERNS_EX = compile_patterns([     # extended gaze patterns: disc fixations between two successive image fixations
+    ('L_pattern_ex', 'image -> ![R image]* -> L -> ![R image]* -> image'),
+    ('R_pattern_ex', 'image -> ![L image]* -> R -> ![L image]* -> image'),
+    ('LR_pattern_ex', 'image -> !image* -> (L -> !image* -> R | R -> !image* -> L) -> !image* -> image')])
+PATTERNS_FULL = compile_patterns([   # full gaze patterns: disc gaze event between two image gaze events
+    ('L_full_gaze_pattern', 'image -> L -> image'),
+    ('R_full_gaze_pattern', 'image -> R -> image')])
+    # new gaze patterns are declared here, see gaze_patterns.py for the pattern language
 invalid_sessions = ['52.2', '10my6.2', '8m8.1', '24.3', '59.3', '8m15.3']
 tamara_affices = ['msc_4_', 'msc4_', 'm4_15_', 'm5_15_', 'm_15_', 'm4_14_']
 
@@ -47,24 +139,86 @@ tamara_affices = ['msc_4_', 'msc4_', 'm4_15_', 'm5_15_', 'm_15_', 'm4_14_']
 #       get_user_args()
 #       get_linebreak() returns linebreak
 #       convert_number(number_with_comma) returns number_with_period
+#       convert_numbers(numbers_with_comma) returns numbers_with_period
+#       cast_column(column, dtype) returns values, i_bad
+#       cast_decimal_column(column, dtype) returns values, i_bad, numbers
 #       extract_subject_no(key_appendix) returns key_number, yoked
 #       set_key_key_value(dic, sup_key, sub_key, value) returns dic
 #       get_cell_entry(cell) returns entry
 #       filter_dic(dic_total) returns dic_total
 #       process_overviews() returns error, overview_dic
 #       get_parameters(experiment_name, overview_dic) returns params_dic, error
-#       extract_failure_rate(coordinates, functioning_side, subject_name) returns trigger_failure_rate
-#       wrap_up(dic_total, R_times, L_times, im_times, white_times, all_times, L_pattern_im_times, R_pattern_im_times)
+#       binned_gaussian_kde(values, bw_factor, grid_x, grid_y) returns Z
+#       search_density_peak(kernel, grid_x, grid_y, x_range, y_range, tolerance) returns coord_max
+#       extract_failure_rate(coordinates, functioning_side, subject_name)
+#           returns (trigger_failure_rate, fixation_trajectory_est, N_patterns_ex_est)
+#       get_estimated_scalars(N_areas_est, N_patterns_ex_est, total_time) returns dic_est
+#       build_epoch_index(times, codes, durations, N_codes) returns epoch_index
+#       get_epoch_sums(epoch_index, epoch_length, N_epochs) returns (counts, durations)
+#       get_epochs_data(epoch_indices, epoch_length, N_epochs, functioning_side, end_time) returns (N_full_epochs, epochs_data)
+#       get_ordinal(number) returns ordinal
+#       wrap_up(dic_total, current_name, R_times, L_times, im_times, white_times, all_times, L_pattern_im_times,
+#             R_pattern_im_times, L_pattern_ex_times, R_pattern_ex_times, LR_pattern_ex_times, all_gaze_events_times,
+#             all_gaze_events_durations, R_gaze_events_times, R_gaze_events_durations, L_gaze_events_times,
+#             L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, white_gaze_events_times,
+#             white_gaze_events_durations, all_durations, R_durations, L_durations, im_durations, white_durations,
+#             fixation_trajectory, gaze_event_trajectory, N_full_gaze_pattern_R, N_full_gaze_pattern_L,
+#             epoch_indices, cutoff_data, overview_dic, coordinates)
 #           returns (dic_total, error_in_loop)
 #       store_results(dic_total)
-#       initialize_fixation_data() returns
-#           (all_times, all_durations, R_times, R_durations, L_times, L_durations, im_times, im_durations, white_times,
-#             white_durations, R_pattern_im_times, L_pattern_im_times, R_pattern_ex_times, L_pattern_ex_times, R_pattern_ex_eligible,
-#             L_pattern_ex_eligible, gaze_pattern_ex_time_temp, all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times,
-#             R_gaze_events_durations, L_gaze_events_times, L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations,
-#             white_gaze_events_times, white_gaze_events_durations)
-#       process_message_files(files_msg, dic_total) returns (dic_total, error_in_loop)
-#       process_fixation_files(files_fix, dic_total) returns (dic_total, error_in_loop)
+#       store_cutoff_comparison(dic_totals)
+#       build_report_index(report) returns session_index
+#       load_report_index(report) returns session_index
+#       read_report_lines(report, session_start, session_end, raw=False) returns lines
+#       iter_report_sessions(report, session_labels=None, raw=False) yields (i_first_line, lines)
+#       get_file_hash(path) returns file_hash
+#       load_report_cache(report, report_stat) returns parsed_sessions
+#       store_report_cache(report, report_stat, parsed_sessions)
+#       clear_report_cache()
+#       iter_parsed_sessions(report, parse_lines, use_cache, raw=False) yields (columns, error)
+#       build_time_correction(times, durations, dt_cutoff) returns (time_correction, cutoff_data)
+#       correct_times(time_correction, times) returns corrected_times
+#       get_time_correction(dic_total, current_name) returns time_correction
+#       parse_message_rows(rows_msg, report_msg, i_first_line) returns (message_columns, error)
+#       parse_message_events(rows_msg, report_msg, i_first_line) returns (times, types, type_codes, error)
+#       build_message_events(types, type_codes, times, times_real) returns message_events
+#       parse_message_files(files_msg, use_cache, session_names=None) returns (parsed_sessions, error_in_loop)
+#       join_message_session(dic_total, message_columns) returns (dic_total, error)
+#       join_message_files(parsed_sessions, dic_total) returns (dic_total, error_in_loop)
+#       classify_interest_areas(labels) returns codes
+#       parse_fixation_lines(lines, report_fix, i_first_line) returns (fixation_columns, error)
+#       segment_gaze_events(codes, times, durations, changed=None)
+#           returns (i_events, event_times, event_durations, event_codes)
+#       process_fixation_session(dic_total, fixation_columns, dt_cutoff, overview_dic) returns (dic_total, error)
+#       init_worker(failure_rate, kde_method, peak_tolerance, validate_peaks, epoch_schemes, folder, folder_cache)
+#       process_fixation_job(job) returns (session_dics, error)
+#       iter_fixation_jobs(report_fix, dt_cutoffs, overview_dic, use_cache, session_names, parse_status) yields job
+#       process_fixation_files(files_fix, dic_totals, dt_cutoffs, overview_dic, jobs=1, use_cache=True, session_names=None,
+#           failure_rate_jobs=None) returns (dic_totals, error_in_loop)
+#       parse_saccade_rows(rows_sac, report_sac, i_first_line) returns (saccade_columns, error)
+#       parse_saccade_files(files_sac, use_cache, session_names=None) returns (parsed_sessions, error_in_loop)
+#       join_saccade_session(dic_total, saccade_columns) returns dic_total
+#       join_saccade_files(parsed_sessions, dic_total) returns dic_total
+#       join_session_events(dic_total, current_name) returns dic_total
+#       join_event_streams(dic_total) returns dic_total
+#       store_peri_trigger_occupancy(dic_total, dic_total_keys, file_suffix)
+#       run_captured(function, args) returns (result, output)
+#       start_report_parsing(files_msg, files_sac, use_cache, session_names=None) returns (pool, parse_jobs)
+#       get_failure_rate_key(coordinates, functioning_side) returns memo_key
+#       load_failure_rate_memo(memo_key) returns results
+#       store_failure_rate_memo(memo_key, results)
+#       evict_failure_rate_memo()
+#       clear_failure_rate_memo()
+#       init_failure_rate_jobs(N_processes, use_memo=True) returns failure_rate_jobs
+#       run_failure_rate_job(connection, worker_args, coordinates, functioning_side, subject_name)
+#       update_failure_rate_jobs(failure_rate_jobs)
+#       submit_failure_rate_job(failure_rate_jobs, current_name, coordinates, functioning_side)
+#       join_failure_rates(failure_rate_jobs, dic_total) returns (dic_total, failed_sessions)
+#       store_failure_rates(failure_rate_jobs, dic_total) returns dic_total
+#       get_session_name(label) returns session_name
+#       get_session_fingerprints(files, overview_dic) returns (fingerprints, report_sessions)
+#       load_previous_results(fingerprints, check_up_to_date=True) returns (dic_previous, changed_sessions)
+#       store_manifest(fingerprints)
 #
 ###########################################################
 
@@ -143,6 +297,105 @@ def convert_number(number_with_comma):
 ###
 
 
+def convert_numbers(numbers_with_comma):
+    """
+    function for modifying a whole column of number strings so they can be cast into float:
+        ["4,5", "3.2"] -> ["4.5", "3.2"]
+    -> same conversion as convert_number(), applied to the joined column at once
+
+    input: numbers_with_comma (list), list of strings representing float numbers with comma
+
+    output: numbers_with_period (list), list of strings representing float numbers with period
+    """
+    if len(numbers_with_comma) == 0:
+        return []
+
+    numbers_str = '\n'.join(numbers_with_comma)
+    if re.search(',[^\n]*,', numbers_str):   # convert_number() drops everything after a second comma
+        numbers_with_period = [convert_number(number_with_comma) for number_with_comma in numbers_with_comma]
+    else:
+        numbers_with_period = numbers_str.replace(',', '.').split('\n')
+
+    return numbers_with_period
+
+
+###
+#
+###
+
+
+def cast_column(column, dtype):
+    """
+    function for casting a column of number strings into a numerical array
+    -> columns of non-negative integers are parsed from their joined text at once,
+        all other columns are cast entry by entry, so the result is the same as for int() or float()
+
+    inputs:
+        column (list), list of number strings
+        dtype (type), int or float, or a numpy integer or float type
+
+    outputs:
+        values (ndarray), numerical array (None if casting failed)
+        i_bad (int), index of first entry that could not be cast (None if casting successful)
+    """
+    values = None
+    if np.dtype(dtype).kind == 'i' and len(column) > 0:
+        column_text = '\n'.join(column)
+        if column_text.translate(None, '0123456789\n') == '' and '\n\n' not in column_text and column_text[0] != '\n':
+                # only digits and one number per entry
+            values = np.fromstring(column_text, dtype=np.int64, sep='\n')
+            if len(values) == len(column) and values.max() <= np.iinfo(np.int32).max:
+                values = values.astype(dtype)
+            else:   # e.g. numbers exceeding 32 bit integers are cast entry by entry
+                values = None
+    try:
+        if values is None:
+            values = np.array(column, dtype=dtype)
+        i_bad = None
+    except ValueError:
+        values = None
+        for i_bad in xrange(len(column)):   # only executed for broken reports -> find first broken entry
+            try:
+                dtype(column[i_bad])
+            except ValueError:
+                break
+
+    return values, i_bad
+
+
+###
+#
+###
+
+
+def cast_decimal_column(column, dtype):
+    """
+    function for casting a column of decimal number strings into a numerical array
+    -> decimal commas are converted as in convert_numbers(), missing values ('.') are set to 0.0
+
+    inputs:
+        column (list), list of number strings
+        dtype (type), float type of array, e.g. np.float32
+
+    outputs:
+        values (ndarray), numerical array (None if casting failed)
+        i_bad (int), index of first entry that could not be cast (None if casting successful)
+        numbers (list), number strings with decimal periods, for reporting broken entries
+    """
+
+    numbers = convert_numbers(column)
+    if '.' in numbers:      # missing values
+        numbers = ['0' if number == '.' else number for number in numbers]
+    values, i_bad = cast_column(numbers, dtype)
+
+    return values, i_bad, numbers
+
+
+###
+#
+###
+
+
 def extract_subject_no(key_appendix):
     """
     function for parsing session keys
@@ -200,24 +453,22 @@ def set_key_key_value(dic, sup_key, sub_key, value):
     function for setting key-value of subdirectory of given directory
 
     input:
-        dic (dictionary), total dictionary containing dictionaries of each subject session as subdictionaries
-        -> structure: {'vp1':{param1:value1, param2:value2,...}, 'vp2':{param1:value1, param2:value2,...}...}
-        sup_key (str), key of dictionary corresponding to subject session subdirectory ('vpX')
-        sub_key (str), key of subject session subdirectory (paramX)
+        dic (dictionary), total dictionary containing a SessionRecord of each subject session
+        -> structure: {'vp1':SessionRecord({param1:value1, param2:value2,...}), 'vp2':SessionRecord({...})...}
+        sup_key (str), key of dictionary corresponding to subject session record ('vpX')
+        sub_key (str), key of subject session record (paramX)
         value (any), value corresponding to sub_key (valueX)
 
     output: dic (dictionary), updated total dictionary
     """
 
-    try:        # check whether dic is actually a dictionary
-        keys = dic.keys()
-    except AttributeError:
+    if not isinstance(dic, dict):   # check whether dic is actually a dictionary
         print 'Error:', dic, 'is not a dictionary!'
 
-    if sup_key in keys:     # check whether subdirectory already exists
-        dic[sup_key].update({sub_key:value})
-    else:       # create subdirectory with given key-value pair
-        dic[sup_key] = {sub_key:value}
+    if sup_key in dic:      # check whether session record already exists
+        dic[sup_key][sub_key] = value
+    else:       # create session record with given key-value pair
+        dic[sup_key] = SessionRecord({sub_key:value})
 
     return dic
 
@@ -478,6 +729,129 @@ def get_parameters(experiment_name, overview_dic):
 ###
 
 
+def binned_gaussian_kde(values, bw_factor, grid_x, grid_y):
+    """
+    function for estimating the density of two-dimensional data on a regular grid with a binned Gaussian kernel density estimate
+    -> uses the same kernel as scipy.stats.gaussian_kde(values, bw_factor),
+        i.e. a Gaussian with the covariance of the data times bw_factor**2
+    -> data are linearly binned on the grid and the binned counts are convolved with the kernel using FFT,
+        the grid is padded by the kernel radius so that data outside the grid still contribute
+
+    input:
+        values (ndarray), array of x- and y-coordinates of data with shape (2, number of data points)
+        bw_factor (float), bandwidth factor
+        grid_x (ndarray), equally spaced x-coordinates of grid
+        grid_y (ndarray), equally spaced y-coordinates of grid
+
+    output: Z (ndarray), estimated density at grid points with shape (len(grid_x), len(grid_y))
+    """
+
+    N_data = values.shape[1]
+    N_x = len(grid_x)
+    N_y = len(grid_y)
+    dx = grid_x[1] - grid_x[0]
+    dy = grid_y[1] - grid_y[0]
+
+    covariance = np.cov(values) * bw_factor**2
+    inv_cov = np.linalg.inv(covariance)
+    norm_factor = np.sqrt(np.linalg.det(2*np.pi*covariance))
+
+        # kernel on grid offsets, truncated at 5 standard deviations
+    K_x = int(np.ceil(5.0*np.sqrt(covariance[0,0])/dx))
+    K_y = int(np.ceil(5.0*np.sqrt(covariance[1,1])/dy))
+    K_x = min(K_x, N_x)
+    K_y = min(K_y, N_y)
+    offsets_x, offsets_y = np.meshgrid(np.arange(-K_x, K_x+1)*dx, np.arange(-K_y, K_y+1)*dy, indexing='ij')
+    kernel = np.exp(-0.5*(inv_cov[0,0]*offsets_x**2 + 2*inv_cov[0,1]*offsets_x*offsets_y +
+        inv_cov[1,1]*offsets_y**2)) / norm_factor
+
+        # linear binning on padded grid
+    N_x_padded = N_x + 2*K_x
+    N_y_padded = N_y + 2*K_y
+    position_x = (values[0] - grid_x[0])/dx + K_x
+    position_y = (values[1] - grid_y[0])/dy + K_y
+    i_x = np.floor(position_x).astype(int)
+    i_y = np.floor(position_y).astype(int)
+    weight_x = position_x - i_x
+    weight_y = position_y - i_y
+    counts = np.zeros(N_x_padded*N_y_padded)
+    for shift_x, weights_x in [(0, 1.0-weight_x), (1, weight_x)]:
+        for shift_y, weights_y in [(0, 1.0-weight_y), (1, weight_y)]:
+            bin_x = i_x + shift_x
+            bin_y = i_y + shift_y
+            inside = (bin_x >= 0) & (bin_x < N_x_padded) & (bin_y >= 0) & (bin_y < N_y_padded)
+                # data beyond the padding are further than the kernel radius from the grid
+            counts += np.bincount(bin_x[inside]*N_y_padded + bin_y[inside], weights=(weights_x*weights_y)[inside],
+                minlength=N_x_padded*N_y_padded)
+    counts = counts.reshape((N_x_padded, N_y_padded))
+
+    Z = signal.fftconvolve(counts, kernel, mode='same')[K_x:K_x+N_x, K_y:K_y+N_y] / N_data
+
+    return Z
+
+
+###
+#
+###
+
+
+def search_density_peak(kernel, grid_x, grid_y, x_range, y_range, tolerance):
+    """
+    function for locating the maximum of a kernel density estimate within a rectangular region of a grid
+        by a coarse-to-fine search
+    -> the density is evaluated on every PEAK_SEARCH_STEP-th grid point of the region first,
+        then the step is halved around the best PEAK_SEARCH_CANDIDATES points until it is not larger than tolerance
+    -> only a few hundred grid points are evaluated instead of every grid point of the region
+
+    input:
+        kernel (scipy.stats.gaussian_kde), kernel density estimate
+        grid_x (ndarray), x-coordinates of grid
+        grid_y (ndarray), y-coordinates of grid
+        x_range (tuple), first and last+1 x-index of search region
+        y_range (tuple), first and last+1 y-index of search region
+        tolerance (int), step of finest search grid in pixels
+
+    output: coord_max (ndarray), x- and y-index of grid point with maximal density
+    """
+
+    densities = {}      # density of each evaluated grid point
+
+    step = PEAK_SEARCH_STEP
+    indices_x = range(x_range[0], x_range[1], step) + [x_range[1]-1]
+    indices_y = range(y_range[0], y_range[1], step) + [y_range[1]-1]
+    points = set([(i_x, i_y) for i_x in indices_x for i_y in indices_y])
+
+    while True:
+        new_points = [point for point in points if point not in densities]
+        if len(new_points) > 0:
+            indices = np.array(new_points)
+            values = kernel(np.vstack([grid_x[indices[:,0]], grid_y[indices[:,1]]]))
+            for point, value in zip(new_points, values):
+                densities[point] = value
+        candidates = sorted(points, key=densities.get, reverse=True)[:PEAK_SEARCH_CANDIDATES]
+        if step <= tolerance:
+            break
+
+        # refine grid around candidates
+        new_step = max(step/2, tolerance)
+        points = set()
+        for i_x, i_y in candidates:
+            for shift_x in xrange(-step, step+1, new_step):
+                for shift_y in xrange(-step, step+1, new_step):
+                    if x_range[0] <= i_x+shift_x < x_range[1] and y_range[0] <= i_y+shift_y < y_range[1]:
+                        points.add((i_x+shift_x, i_y+shift_y))
+        step = new_step
+
+    coord_max = np.array(candidates[0])
+
+    return coord_max
+
+
+###
+#
+###
+
+
 def extract_failure_rate(coordinates, functioning_side, subject_name):
     """
     functiong for calculating empirical trigger failure rates:
@@ -488,7 +862,10 @@ def extract_failure_rate(coordinates, functioning_side, subject_name):
         functioning_side (string), 'R' or 'L'
         subject_name (string), name of subject
 
-    output: trigger_failure_rate (float), empirical trigger failure rate
+    output:
+        trigger_failure_rate (float), empirical trigger failure rate
+        fixation_trajectory_est (ndarray), int8 array of estimated interest area codes of all fixations
+        N_patterns_ex_est (ndarray), number of estimated extended gaze patterns, indexed by pattern code
     """
     len_coord = len(coordinates[0])
 
@@ -502,23 +879,41 @@ def extract_failure_rate(coordinates, functioning_side, subject_name):
 
     # Perform a kernel density estimate on the data:
 
-    X, Y = np.mgrid[xmin:xmax:1024j, ymin:ymax:768j]
-    positions = np.vstack([X.ravel(), Y.ravel()])
     values = np.vstack([m1, m2])
-    kernel = sp.stats.gaussian_kde(values, 0.1)
-    Z = np.reshape(kernel(positions).T, X.shape)
+    if KDE_METHOD == 'search':    # density is only evaluated around the maxima within the disc regions
+        grid_x = np.linspace(xmin, xmax, 1024)
+        grid_y = np.linspace(ymin, ymax, 768)
+        kernel = sp.stats.gaussian_kde(values, 0.1)
+        coord_max_L = search_density_peak(kernel, grid_x, grid_y, (0, 256), (0, 768), PEAK_TOLERANCE)
+        coord_max_R = search_density_peak(kernel, grid_x, grid_y, (768, 1024), (0, 768), PEAK_TOLERANCE)
+        if VALIDATE_PEAKS:
+            deviations = []
+            for coord_max, x_start, x_end in [(coord_max_L, 0, 256), (coord_max_R, 768, 1024)]:
+                X, Y = np.meshgrid(grid_x[x_start:x_end], grid_y, indexing='ij')
+                Z = np.reshape(kernel(np.vstack([X.ravel(), Y.ravel()])), X.shape)
+                coord_max_grid = np.array(np.unravel_index(Z.argmax(), Z.shape)) + np.array([x_start,0])
+                deviations.append(np.sqrt(np.sum((coord_max - coord_max_grid)**2)))
+            print '\nPeak search of session {}: distance from grid maximum {:.1f} px (left disc), {:.1f} px (right disc)'.format(
+                subject_name, deviations[0], deviations[1])
+    else:
+        if KDE_METHOD == 'exact':
+            X, Y = np.mgrid[xmin:xmax:1024j, ymin:ymax:768j]
+            positions = np.vstack([X.ravel(), Y.ravel()])
+            kernel = sp.stats.gaussian_kde(values, 0.1)
+            Z = np.reshape(kernel(positions).T, X.shape)
+        else:
+            Z = binned_gaussian_kde(values, 0.1, np.linspace(xmin, xmax, 1024), np.linspace(ymin, ymax, 768))
 
-    # Classify disc fixations
+        Z_L = Z[:256]
+        Z_R = Z[768:]
+        coord_max_L = Z_L.argmax()
+        coord_max_L = np.array(np.unravel_index(coord_max_L, Z_L.shape))
+        coord_max_R = Z_R.argmax()
+        coord_max_R = np.array(np.unravel_index(coord_max_R, Z_R.shape))
+        coord_max_R += np.array([768,0])
 
-    Z_L = Z[:256]
-    Z_R = Z[768:]
-    coord_max_L = Z_L.argmax()
-    coord_max_L = np.array(np.unravel_index(coord_max_L, Z_L.shape))
-    coord_max_R = Z_R.argmax()
-    coord_max_R = np.array(np.unravel_index(coord_max_R, Z_R.shape))
-    coord_max_R += np.array([768.0,0.0])
+    # Classify disc fixations
 
-    V = [1,1]   # euclidean weighting
     L_center = [100.0, 384.0]
     R_center = [924.0, 384.0]
     im_x_min = 312.0
@@ -526,50 +921,36 @@ def extract_failure_rate(coordinates, functioning_side, subject_name):
     im_y_min = 250.0
     im_y_max = 518.0
 
+    x = np.asarray(coordinates[0], dtype=float)
+    y = np.asarray(coordinates[1], dtype=float)
+
+        # euclidean distances of all fixations to estimated disc maxima and nominal disc centers
+    distance_L = np.sqrt((x-coord_max_L[0])**2 + (y-coord_max_L[1])**2)
+    distance_R = np.sqrt((x-coord_max_R[0])**2 + (y-coord_max_R[1])**2)
+    distance_L_center = np.sqrt((x-L_center[0])**2 + (y-L_center[1])**2)
+    distance_R_center = np.sqrt((x-R_center[0])**2 + (y-R_center[1])**2)
+
+        # left disc has priority over right disc, right disc over image
+    on_L = distance_L < 90.0
+    on_R = ~on_L & (distance_R < 90.0)
+    on_im = ~on_L & ~on_R & (x > im_x_min) & (x < im_x_max) & (y > im_y_min) & (y < im_y_max)
+
+    fixation_trajectory_est = np.zeros(len_coord, dtype=np.int8) + AOI_BACKGROUND
+    fixation_trajectory_est[on_L] = AOI_LEFT
+    fixation_trajectory_est[on_R] = AOI_RIGHT
+    fixation_trajectory_est[on_im] = AOI_IMAGE
+
     N_TrueNegatives = 0
     N_TruePositives = 0
+    if functioning_side == 'L':
+        N_TruePositives = np.count_nonzero(on_L & (distance_L_center < 90.0))
+        N_TrueNegatives = np.count_nonzero(on_L) - N_TruePositives
+    elif functioning_side == 'R':
+        N_TruePositives = np.count_nonzero(on_R & (distance_R_center < 90.0))
+        N_TrueNegatives = np.count_nonzero(on_R) - N_TruePositives
 
-    fixation_trajectory_est = []
-    gaze_pattern_ex_trajectory_est = []
-    gaze_pattern_ex_loc_temp = []
-
-    for i_fix in xrange(len_coord):
-        coord_i = [coordinates[0][i_fix], coordinates[1][i_fix]]
-        # left disc
-        if spatial.distance.seuclidean(coord_i, coord_max_L, V) < 90.0:
-            fixation_trajectory_est.append('L')
-            gaze_pattern_ex_loc_temp.append('L')
-            if functioning_side == 'L':
-                if spatial.distance.seuclidean(coord_i, L_center, V) < 90.0:
-                    N_TruePositives += 1
-                else:
-                    N_TrueNegatives += 1
-        # right disc
-        elif spatial.distance.seuclidean(coord_i, coord_max_R, V) < 90.0:
-            fixation_trajectory_est.append('R')
-            gaze_pattern_ex_loc_temp.append('R')
-            if functioning_side == 'R':
-                if spatial.distance.seuclidean(coord_i, R_center, V) < 90.0:
-                    N_TruePositives += 1
-                else:
-                    N_TrueNegatives += 1
-        # image
-        elif (coord_i[0] > im_x_min) and (coord_i[0] < im_x_max) and (coord_i[1] > im_y_min) and (coord_i[1] < im_y_max):
-            fixation_trajectory_est.append('image')
-            if len(gaze_pattern_ex_loc_temp) > 0:
-                if 'image' in gaze_pattern_ex_loc_temp[0]:
-                    if ('R' in gaze_pattern_ex_loc_temp) and not ('L' in gaze_pattern_ex_loc_temp):
-                        gaze_pattern_ex_trajectory_est.append('R')
-                    elif ('L' in gaze_pattern_ex_loc_temp) and not ('R' in gaze_pattern_ex_loc_temp):
-                        gaze_pattern_ex_trajectory_est.append('L')
-                    elif ('L' in gaze_pattern_ex_loc_temp) and ('R' in gaze_pattern_ex_loc_temp):
-                        gaze_pattern_ex_trajectory_est.append('LR')
-                gaze_pattern_ex_loc_temp = []
-            gaze_pattern_ex_loc_temp.append('image')
-        # white
-        else:
-            fixation_trajectory_est.append('white')
-
+    patterns_ex_est = scan_patterns(PATTERNS_EX, fixation_trajectory_est)
+    N_patterns_ex_est = np.array([patterns_ex_est[name]['N'] for name in PATTERNS_EX['names']], dtype=int)
 
     try:
         trigger_failure_rate = 1.0*N_TrueNegatives/(N_TrueNegatives+N_TruePositives)
@@ -577,9 +958,223 @@ def extract_failure_rate(coordinates, functioning_side, subject_name):
         print 'Warning: No functioning disc fixations of session {}!'.format(subject_name)
         trigger_failure_rate = -42.0
 
+    return trigger_failure_rate, fixation_trajectory_est, N_patterns_ex_est
+
+
+###
+#
+###
+
+
+def get_estimated_scalars(N_areas_est, N_patterns_ex_est, total_time):
+    """
+    function for calculating the scalars of a session which are based on the estimated interest areas of fixations
+
+    input:
+        N_areas_est (ndarray), number of fixations on each interest area, indexed by interest area code
+        N_patterns_ex_est (ndarray), number of each extended gaze pattern, indexed by pattern code
+        total_time (int), session duration in ms
+
+    output: dic_est (dictionary), numbers and mean frequencies per minute of estimated disc and background fixations
+        and of estimated extended gaze patterns
+    """
+
+    N_R_est = int(N_areas_est[AOI_RIGHT])
+    N_L_est = int(N_areas_est[AOI_LEFT])
+    N_white_est = int(N_areas_est[AOI_BACKGROUND])
+    N_R_pattern_ex_est = int(N_patterns_ex_est[PATTERN_R])
+    N_L_pattern_ex_est = int(N_patterns_ex_est[PATTERN_L])
+    N_LR_pattern_ex_est = int(N_patterns_ex_est[PATTERN_LR])
+    N_pattern_ex_total_est = N_R_pattern_ex_est + N_L_pattern_ex_est + N_LR_pattern_ex_est
+
+    mean_R_freq_est = 60000.0 * N_R_est / total_time
+    mean_L_freq_est = 60000.0 * N_L_est / total_time
+    mean_white_freq_est = 60000.0 * N_white_est / total_time
+    mean_R_pattern_ex_freq_est = 60000.0 * N_R_pattern_ex_est / total_time
+    mean_L_pattern_ex_freq_est = 60000.0 * N_L_pattern_ex_est / total_time
+    mean_LR_pattern_ex_freq_est = 60000.0 * N_LR_pattern_ex_est / total_time
+    mean_pattern_ex_total_freq_est = 60000.0 * N_pattern_ex_total_est / total_time
+
+    dic_est = {'N_R_est':N_R_est, 'N_L_est':N_L_est, 'N_white_est':N_white_est, 'mean_R_freq_est':mean_R_freq_est,
+        'mean_L_freq_est':mean_L_freq_est, 'mean_white_freq_est':mean_white_freq_est,
+        'N_R_pattern_ex_est':N_R_pattern_ex_est, 'N_L_pattern_ex_est':N_L_pattern_ex_est,
+        'N_LR_pattern_ex_est':N_LR_pattern_ex_est, 'N_pattern_ex_total_est':N_pattern_ex_total_est,
+        'mean_R_pattern_ex_freq_est':mean_R_pattern_ex_freq_est,
+        'mean_L_pattern_ex_freq_est':mean_L_pattern_ex_freq_est,
+        'mean_LR_pattern_ex_freq_est':mean_LR_pattern_ex_freq_est,
+        'mean_pattern_ex_total_freq_est':mean_pattern_ex_total_freq_est}
+
+    return dic_est
+
+
+###
+#
+###
+
+
+def build_epoch_index(times, codes, durations, N_codes):
+    """
+    function for building the cumulative counts and durations of the events of one session over time
+    -> built once per session for fixations, gaze events, and extended gaze patterns,
+        the sums of any epoch are the difference of two rows, see get_epoch_sums()
+
+    input:
+        times (ndarray), ascending times of events in ms
+        codes (ndarray), code of each event, i.e. interest area or pattern code
+        durations (ndarray), duration of each event in ms, None if events have no duration
+        N_codes (int), number of codes
+
+    output: epoch_index (dictionary), dictionary containing
+        - times: times of events
+        - counts: cumulative number of events of each code, row i covers the first i events
+        - durations: cumulative durations of events of each code, None if no durations given
+    """
+
+    N_events = len(times)
+    counts = np.zeros((N_events+1, N_codes), dtype=int)
+    counts[np.arange(1, N_events+1), codes] = 1
+    epoch_index = {'times':np.asarray(times), 'counts':np.cumsum(counts, axis=0), 'durations':None}
+    if durations is not None:
+        duration_sums = np.zeros((N_events+1, N_codes), dtype=int)
+        duration_sums[np.arange(1, N_events+1), codes] = durations
+        epoch_index['durations'] = np.cumsum(duration_sums, axis=0)
+
+    return epoch_index
+
+
+###
+#
+###
+
+
+def get_epoch_sums(epoch_index, epoch_length, N_epochs):
+    """
+    function for getting the number and total duration of events of each code in successive epochs
+    -> epoch i covers the times from i*epoch_length to (i+1)*epoch_length, the first N_epochs epochs are evaluated
+
+    input:
+        epoch_index (dictionary), cumulative counts and durations returned by build_epoch_index()
+        epoch_length (int), epoch length in ms
+        N_epochs (int), number of epochs
+
+    output:
+        counts (ndarray), number of events of each code in each epoch, shape (N_epochs, N_codes)
+        durations (ndarray), total duration of events of each code in each epoch, None if index has no durations
+    """
+
+    i_bounds = np.searchsorted(epoch_index['times'], epoch_length*np.arange(N_epochs+1))
+        # index of first event of each epoch, events at the end of an epoch belong to the next one
+    counts = np.diff(epoch_index['counts'][i_bounds], axis=0)
+    durations = None
+    if epoch_index['durations'] is not None:
+        durations = np.diff(epoch_index['durations'][i_bounds], axis=0)
+
+    return counts, durations
+
+
+###
+#
+###
+
+
+def get_epochs_data(epoch_indices, epoch_length, N_epochs, functioning_side, end_time):
+    """
+    function for evaluating the epochs of one epoch scheme of a session
+    -> an epoch is complete if a fixation started after its end, the data of incomplete epochs are set to -42
+
+    input:
+        epoch_indices (dictionary), epoch indices of 'fixations', 'gaze_events', and 'patterns_ex'
+            returned by build_epoch_index()
+        epoch_length (int), epoch length in ms
+        N_epochs (int), number of evaluated epochs
+        functioning_side (str), 'R' or 'L'
+        end_time (int), start time of last fixation in ms
+
+    output:
+        N_full_epochs (int), number of complete epochs, also those exceeding N_epochs
+        epochs_data (list), for each epoch a dictionary containing fixation, gaze event, and extended gaze pattern
+            counts, mean rates (per minute), and mean durations of each interest area
+    """
+
+    N_full_epochs = max(int(end_time // epoch_length), 0)
+    N_areas, durations = get_epoch_sums(epoch_indices['fixations'], epoch_length, N_epochs)
+    N_gaze_areas, gaze_durations = get_epoch_sums(epoch_indices['gaze_events'], epoch_length, N_epochs)
+    N_patterns_ex = get_epoch_sums(epoch_indices['patterns_ex'], epoch_length, N_epochs)[0]
+        # extended gaze patterns are assigned to the epoch of the image fixation finishing them
+    if functioning_side == 'R':
+        funct_prefixes = [('funct', AOI_RIGHT, PATTERN_R), ('nonfunct', AOI_LEFT, PATTERN_L)]
+    else:
+        funct_prefixes = [('funct', AOI_LEFT, PATTERN_L), ('nonfunct', AOI_RIGHT, PATTERN_R)]
+    prefixes = [('R', AOI_RIGHT, PATTERN_R), ('L', AOI_LEFT, PATTERN_L), ('im', AOI_IMAGE, None),
+        ('white', AOI_BACKGROUND, None)] + funct_prefixes
+        # key prefix, interest area code, and extended gaze pattern code of each interest area
+    freq_factor = 60000.0 / epoch_length    # rates are given per minute
+
+    epochs_data = []
+    for i in xrange(N_epochs):     # epochs loop
+        epoch_data = {'N_all':int(N_areas[i].sum()), 'N_gaze_all':int(N_gaze_areas[i].sum()),
+            'N_LR_pattern_ex':int(N_patterns_ex[i, PATTERN_LR]), 'N_pattern_ex_total':int(N_patterns_ex[i].sum())}
+        epoch_data['mean_all_freq'] = freq_factor * epoch_data['N_all']
+        epoch_data['mean_all_gaze_events_freq'] = freq_factor * epoch_data['N_gaze_all']
+        epoch_data['mean_LR_pattern_ex_freq'] = freq_factor * epoch_data['N_LR_pattern_ex']
+        epoch_data['mean_pattern_ex_total_freq'] = freq_factor * epoch_data['N_pattern_ex_total']
+        if epoch_data['N_all'] > 0:
+            epoch_data['mean_all_dur'] = 1.0 * durations[i].sum() / epoch_data['N_all']
+        else:
+            epoch_data['mean_all_dur'] = 0.0
+        if epoch_data['N_gaze_all'] > 0:
+            epoch_data['mean_all_gaze_events_dur'] = 1.0 * gaze_durations[i].sum() / epoch_data['N_gaze_all']
+        else:
+            epoch_data['mean_all_gaze_events_dur'] = 0.0
+
+        for prefix, area_code, pattern_code in prefixes:
+            N = int(N_areas[i, area_code])
+            N_gaze = int(N_gaze_areas[i, area_code])
+            epoch_data['N_'+prefix] = N
+            epoch_data['mean_'+prefix+'_freq'] = freq_factor * N
+            epoch_data['N_gaze_'+prefix] = N_gaze
+            epoch_data['mean_'+prefix+'_gaze_events_freq'] = freq_factor * N_gaze
+            if N > 0:
+                epoch_data['mean_'+prefix+'_dur'] = 1.0 * durations[i, area_code] / N
+            else:
+                epoch_data['mean_'+prefix+'_dur'] = 0.0
+            if N_gaze > 0:
+                epoch_data['mean_'+prefix+'_gaze_events_dur'] = 1.0 * gaze_durations[i, area_code] / N_gaze
+            else:
+                epoch_data['mean_'+prefix+'_gaze_events_dur'] = 0.0
+            if pattern_code is not None:
+                epoch_data['N_'+prefix+'_pattern_ex'] = int(N_patterns_ex[i, pattern_code])
+                epoch_data['mean_'+prefix+'_pattern_ex_freq'] = freq_factor * epoch_data['N_'+prefix+'_pattern_ex']
+
+        if i >= N_full_epochs:
+            for key in epoch_data:
+                epoch_data[key] = -42
+        epochs_data.append(epoch_data)
+        # end of epochs loop
+
+    return N_full_epochs, epochs_data
 
 
-    return trigger_failure_rate, fixation_trajectory_est, gaze_pattern_ex_trajectory_est
+###
+#
+###
+
+
+def get_ordinal(number):
+    """
+    function for getting the ordinal of a number, e.g. '2nd'
+
+    input: number (int), positive number
+
+    output: ordinal (str), number with ordinal suffix
+    """
+
+    if number % 100 in [11, 12, 13]:
+        suffix = 'th'
+    else:
+        suffix = {1:'st', 2:'nd', 3:'rd'}.get(number % 10, 'th')
+
+    return '{}{}'.format(number, suffix)
 
 
 ###
@@ -593,7 +1188,7 @@ def wrap_up(dic_total, current_name, R_times, L_times, im_times, white_times, al
     R_gaze_events_durations, L_gaze_events_times, L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, 
     white_gaze_events_times, white_gaze_events_durations, all_durations, R_durations, L_durations, im_durations, white_durations,
     fixation_trajectory, gaze_event_trajectory, N_full_gaze_pattern_R, N_full_gaze_pattern_L,
-    fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs, cutoff_data, overview_dic, coordinates):
+    epoch_indices, cutoff_data, overview_dic, coordinates):
 
     """
     function for processing fixation data and storing everything in total dictionary
@@ -601,35 +1196,40 @@ def wrap_up(dic_total, current_name, R_times, L_times, im_times, white_times, al
     input:
         dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
         current_name (str), current experiment session label
-        R_times (list), list of fixation times on right disc
-        L_times (list), list of fixation times on left disc
-        im_times (list), list of fixation times on image
-        white_times (list), list of fixation times on rest of screen
-        all_times (list), list of all recorded fixation times
-        L_pattern_im_times (list), list of immediate left gaze pattern times
-        R_pattern_im_times (list), list of immediate right gaze pattern times
-        L_pattern_ex_times (list), list of extended left gaze pattern times
-        R_pattern_ex_times (list), list of extended right gaze pattern times
-        LR_pattern_ex_times (list), list of extended left&right gaze pattern times
-        all_gaze_events_times (list), list of gaze event start times
-        all_gaze_events_durations (list), list of gaze event durations
-        R_gaze_events_times (list), list of right disc gaze event start times
-        R_gaze_events_durations (list), list of right disc gaze event durations
-        L_gaze_events_times (list), list of left disc gaze event start times
-        L_gaze_events_durations (list), list of left disc gaze event durations
-        im_gaze_events_times (list), list of image gaze event start times
-        im_gaze_events_durations (list), list of image gaze event durations
-        white_gaze_events_times (list), list of background gaze event start times
-        white_gaze_events_durations (list), list of background gaze event durations
-        all_durations (list), list of all fixation durations
-        R_durations (list), list of right disc fixation durations
-        L_durations (list), list of left disc fixation durations
-        im_durations (list), list of image fixation durations
-        white_durations (list), list of background fixation durations
-        fixation_trajectory (list), sequence of fixated areas
-        gaze_event_trajectory (list), sequence of gazed at areas
-N_full_gaze_pattern_R, N_full_gaze_pattern_L,
-    fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs, cutoff_data, overview_dic, coordinates
+        R_times (ndarray), array of fixation times on right disc
+        L_times (ndarray), array of fixation times on left disc
+        im_times (ndarray), array of fixation times on image
+        white_times (ndarray), array of fixation times on rest of screen
+        all_times (ndarray), array of all recorded fixation times
+        L_pattern_im_times (ndarray), array of immediate left gaze pattern times
+        R_pattern_im_times (ndarray), array of immediate right gaze pattern times
+        L_pattern_ex_times (ndarray), array of extended left gaze pattern times
+        R_pattern_ex_times (ndarray), array of extended right gaze pattern times
+        LR_pattern_ex_times (ndarray), array of extended left&right gaze pattern times
+        all_gaze_events_times (ndarray), array of gaze event start times
+        all_gaze_events_durations (ndarray), array of gaze event durations
+        R_gaze_events_times (ndarray), array of right disc gaze event start times
+        R_gaze_events_durations (ndarray), array of right disc gaze event durations
+        L_gaze_events_times (ndarray), array of left disc gaze event start times
+        L_gaze_events_durations (ndarray), array of left disc gaze event durations
+        im_gaze_events_times (ndarray), array of image gaze event start times
+        im_gaze_events_durations (ndarray), array of image gaze event durations
+        white_gaze_events_times (ndarray), array of background gaze event start times
+        white_gaze_events_durations (ndarray), array of background gaze event durations
+        all_durations (ndarray), array of all fixation durations
+        R_durations (ndarray), array of right disc fixation durations
+        L_durations (ndarray), array of left disc fixation durations
+        im_durations (ndarray), array of image fixation durations
+        white_durations (ndarray), array of background fixation durations
+        fixation_trajectory (ndarray), sequence of interest area codes of fixations
+        gaze_event_trajectory (ndarray), sequence of interest area codes of gaze events
+        N_full_gaze_pattern_R (int), number of right full gaze patterns
+        N_full_gaze_pattern_L (int), number of left full gaze patterns
+        epoch_indices (dictionary), epoch indices of 'fixations', 'gaze_events', and 'patterns_ex'
+            returned by build_epoch_index()
+        cutoff_data (list), cutoff data returned by build_time_correction()
+        overview_dic (dictionary), subject data extracted from overview files
+        coordinates (ndarray), x (first row) and y (second row) coordinates of fixations
 
     output:
         dic_total (dictionary), updated total dictionary
@@ -652,14 +1252,10 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
             # call get_parameters() to get experiment parameters of current session
         if error:
             break
-        coordinates = np.array(coordinates)
+        fixation_trajectory = np.asarray(fixation_trajectory, dtype=np.int8)
+        gaze_event_trajectory = np.asarray(gaze_event_trajectory, dtype=np.int8)
         functioning_side = dic_params['functioning_side']
-        if FAILURE_RATE:
-            failure_rate, fixation_trajectory_est, gaze_pattern_ex_trajectory_est = extract_failure_rate(coordinates, 
-                functioning_side, current_name)
-        else:
-            failure_rate = 5
-            fixation_trajectory_est = fixation_trajectory
+        failure_rate = 5    # estimated failure rate is stored by join_failure_rates() if calculated
 
         N_R = len(R_times)      # number of fixations on right disc
         N_L = len(L_times)      # number of fixations on left disc
@@ -671,25 +1267,12 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
             print 'Warning: number total fixations not equal to sum of fixations!'
             print ' N_all:', N_all
             print ' sum of fixations:', N_R+N_L+N_im+N_white
-        N_R_est = fixation_trajectory_est.count('R')
-        N_L_est = fixation_trajectory_est.count('L')
-        N_white_est = fixation_trajectory_est.count('white')
         N_R_pattern_im = len(R_pattern_im_times)    # number of immediate right disc gaze patterns
         N_L_pattern_im = len(L_pattern_im_times)    # number of immediate left disc gaze patterns
         N_R_pattern_ex = len(R_pattern_ex_times)    # number of extended right disc gaze patterns
         N_L_pattern_ex = len(L_pattern_ex_times)    # number of extended left disc gaze patterns
         N_LR_pattern_ex = len(LR_pattern_ex_times)  # number of extended left-right disc gaze patterns
         N_pattern_ex_total = N_L_pattern_ex + N_R_pattern_ex + N_LR_pattern_ex
-        if FAILURE_RATE:
-            N_R_pattern_ex_est = gaze_pattern_ex_trajectory_est.count('R')
-            N_L_pattern_ex_est = gaze_pattern_ex_trajectory_est.count('L')
-            N_LR_pattern_ex_est = gaze_pattern_ex_trajectory_est.count('LR')
-            N_pattern_ex_total_est = N_R_pattern_ex_est + N_L_pattern_ex_est + N_LR_pattern_ex_est
-        else:
-            N_R_pattern_ex_est = N_R_pattern_ex
-            N_L_pattern_ex_est = N_L_pattern_ex
-            N_LR_pattern_ex_est = N_LR_pattern_ex
-            N_pattern_ex_total_est = N_pattern_ex_total
         N_gaze_all = len(all_gaze_events_times)     # number of total gaze events
         N_gaze_R = len(R_gaze_events_times)     # number of gaze events on right disc
         N_gaze_L = len(L_gaze_events_times)     # number of gaze events on left disc
@@ -697,8 +1280,6 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
         N_gaze_white = len(white_gaze_events_times) # number of gaze events on white background
         total_time = all_times[-1]-all_times[0]     # total session time
 
-        N_epochs = len(fixation_trajectory_epochs)
-        epochs_data = [{}, {}, {}, {}, {}]      
 
         if len(R_times) == 0 and len(L_times) > 0:
             first_fix = 'L'
@@ -711,33 +1292,6 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
         else:
             first_fix = 'L'
 
-            # convert all fixation time lists into numpy arrays for computational efficiency
-        R_times = np.array(R_times, dtype=int)
-        L_times = np.array(L_times, dtype=int)
-        all_times = np.array(all_times, dtype=int)
-        im_times = np.array(im_times, dtype=int)
-        white_times = np.array(white_times, dtype=int)
-        all_durations = np.array(all_durations, dtype=int)
-        R_durations = np.array(R_durations, dtype=int)
-        L_durations = np.array(L_durations, dtype=int)
-        im_durations = np.array(im_durations, dtype=int)
-        white_durations = np.array(white_durations, dtype=int)
-        R_pattern_im_times = np.array(R_pattern_im_times, dtype=int)
-        L_pattern_im_times = np.array(L_pattern_im_times, dtype=int)
-        R_pattern_ex_times = np.array(R_pattern_ex_times, dtype=int)
-        L_pattern_ex_times = np.array(L_pattern_ex_times, dtype=int)
-        LR_pattern_ex_times = np.array(LR_pattern_ex_times, dtype=int)
-        all_gaze_events_times = np.array(all_gaze_events_times, dtype=int)
-        all_gaze_events_durations = np.array(all_gaze_events_durations, dtype=int)
-        R_gaze_events_times = np.array(R_gaze_events_times, dtype=int)
-        R_gaze_events_durations = np.array(R_gaze_events_durations, dtype=int)
-        L_gaze_events_times = np.array(L_gaze_events_times, dtype=int)
-        L_gaze_events_durations = np.array(L_gaze_events_durations, dtype=int)
-        im_gaze_events_times = np.array(im_gaze_events_times, dtype=int)
-        im_gaze_events_durations = np.array(im_gaze_events_durations, dtype=int)
-        white_gaze_events_times = np.array(white_gaze_events_times, dtype=int)
-        white_gaze_events_durations = np.array(white_gaze_events_durations, dtype=int)
-
             # calculate mean frequencies in minutes (fixation times are stored in milliseconds)
         mean_R_freq = 60000.0 * N_R / total_time
         mean_L_freq = 60000.0 * N_L / total_time
@@ -755,13 +1309,6 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
         mean_L_gaze_events_freq = 60000.0 * N_gaze_L / total_time
         mean_im_gaze_events_freq = 60000.0 * N_gaze_im / total_time
         mean_white_gaze_events_freq = 60000.0 * N_gaze_white / total_time
-        mean_R_freq_est = 60000.0 * N_R_est / total_time
-        mean_L_freq_est = 60000.0 * N_L_est / total_time
-        mean_white_freq_est = 60000.0 * N_white_est / total_time
-        mean_R_pattern_ex_freq_est = 60000.0 * N_R_pattern_ex_est / total_time
-        mean_L_pattern_ex_freq_est = 60000.0 * N_L_pattern_ex_est / total_time
-        mean_LR_pattern_ex_freq_est = 60000.0 * N_LR_pattern_ex_est / total_time
-        mean_pattern_ex_total_freq_est = 60000.0 * N_pattern_ex_total_est / total_time
 
             # calculate mean durations
         if len(R_durations) > 0:
@@ -809,308 +1356,59 @@ N_full_gaze_pattern_R, N_full_gaze_pattern_L,
         age = dic_params['age']
 
             # we know the functioning side, so we can group the fixations across all subjects accordingly
-        if functioning_side == 'R':
-            funct_times = R_times.copy()
-            nonfunct_times = L_times.copy()
-            funct_durations = R_durations.copy()
-            nonfunct_durations = L_durations.copy()
-            N_funct = N_R
-            N_nonfunct = N_L
-            mean_funct_freq = mean_R_freq
-            mean_nonfunct_freq = mean_L_freq
-            mean_funct_dur = mean_R_dur
-            mean_nonfunct_dur = mean_L_dur
-            functioning_pattern_im_times = R_pattern_im_times.copy()
-            N_functioning_pattern_im = N_R_pattern_im
-            nonfunctioning_pattern_im_times = L_pattern_im_times.copy()
-            N_nonfunctioning_pattern_im = N_L_pattern_im
-            mean_funct_pattern_im_freq = mean_R_pattern_im_freq
-            mean_nonfunct_pattern_im_freq = mean_L_pattern_im_freq
-            functioning_pattern_ex_times = R_pattern_ex_times.copy()
-            N_functioning_pattern_ex = N_R_pattern_ex
-            nonfunctioning_pattern_ex_times = L_pattern_ex_times.copy()
-            N_nonfunctioning_pattern_ex = N_L_pattern_ex
-            mean_funct_pattern_ex_freq = mean_R_pattern_ex_freq
-            mean_nonfunct_pattern_ex_freq = mean_L_pattern_ex_freq
-            N_gaze_funct = N_gaze_R
-            N_gaze_nonfunct = N_gaze_L
-            funct_gaze_events_times = R_gaze_events_times.copy()
-            nonfunct_gaze_events_times = L_gaze_events_times.copy()
-            funct_gaze_events_durations = R_gaze_events_durations.copy()
-            nonfunct_gaze_events_durations = L_gaze_events_durations.copy()
-            mean_funct_gaze_events_freq = mean_R_gaze_events_freq
-            mean_nonfunct_gaze_events_freq = mean_L_gaze_events_freq
-            mean_funct_gaze_events_dur = mean_R_gaze_events_dur
-            mean_nonfunct_gaze_events_dur = mean_L_gaze_events_dur
-            N_full_gaze_funct = N_full_gaze_pattern_R
-            N_full_gaze_nonfunct = N_full_gaze_pattern_L
-            N_funct_est = N_R_est
-            mean_funct_freq_est = mean_R_freq_est
-            N_nonfunct_est = N_L_est
-            mean_nonfunct_freq_est = mean_L_freq_est
-            N_funct_pattern_ex_est = N_R_pattern_ex_est
-            mean_funct_pattern_ex_freq_est = mean_R_pattern_ex_freq_est
-            N_nonfunct_pattern_ex_est = N_L_pattern_ex_est
-            mean_nonfunct_pattern_ex_freq_est = mean_L_pattern_ex_freq_est
-
-            for i in xrange(5):     # epochs loop
-                min_data = epochs_data[i]
-                if i < N_epochs:
-                    try:
-                        fixation_trajectory_min = fixation_trajectory_epochs[i]
-                        pattern_ex_min = pattern_ex_epochs[i]
-                        gaze_event_trajectory_min = gaze_event_trajectory_epochs[i]
-
-                        N_R_min = fixation_trajectory_min.count('right')
-                        min_data.update({'N_R':N_R_min})
-                        N_L_min = fixation_trajectory_min.count('left')
-                        min_data.update({'N_L':N_L_min})
-                        N_im_min = fixation_trajectory_min.count('image')
-                        min_data.update({'N_im':N_im_min})
-                        N_white_min = fixation_trajectory_min.count('background')
-                        min_data.update({'N_white':N_white_min})
-                        N_all_min = len(fixation_trajectory_min)
-                        min_data.update({'N_all':N_all_min})
-                        min_data.update({'N_funct':N_R_min})
-                        min_data.update({'N_nonfunct':N_L_min})
-
-                        N_R_pattern_ex_min = pattern_ex_min.count('R')
-                        min_data.update({'N_R_pattern_ex':N_R_pattern_ex_min})
-                        N_L_pattern_ex_min = pattern_ex_min.count('L')
-                        min_data.update({'N_L_pattern_ex':N_L_pattern_ex_min})
-                        N_LR_pattern_ex_min = pattern_ex_min.count('LR')
-                        min_data.update({'N_LR_pattern_ex':N_LR_pattern_ex_min})
-                        min_data.update({'N_funct_pattern_ex':N_R_pattern_ex_min})
-                        min_data.update({'N_nonfunct_pattern_ex':N_L_pattern_ex_min})
-                        min_data.update({'N_pattern_ex_total':N_R_pattern_ex_min+N_L_pattern_ex_min+N_LR_pattern_ex_min})
-
-                        N_gaze_R_min = gaze_event_trajectory_min.count('right')
-                        min_data.update({'N_gaze_R':N_gaze_R_min})
-                        N_gaze_L_min = gaze_event_trajectory_min.count('left')
-                        min_data.update({'N_gaze_L':N_gaze_L_min})
-                        N_gaze_im_min = gaze_event_trajectory_min.count('image')
-                        min_data.update({'N_gaze_im':N_gaze_im_min})
-                        N_gaze_white_min = gaze_event_trajectory_min.count('background')
-                        min_data.update({'N_gaze_white':N_gaze_white_min})
-                        N_gaze_all_min = len(gaze_event_trajectory_min)
-                        min_data.update({'N_gaze_all':N_gaze_all_min})
-                        min_data.update({'N_gaze_funct':N_gaze_R_min})
-                        min_data.update({'N_gaze_nonfunct':N_gaze_L_min})
-
-                    except IndexError:
-                        print 'Error: Number of epochs of {} doesn\'t match data! (N_epochs={}, current epoch={})'.format(current_name,
-                            N_epochs, i)
-                        error = True
-                        break
-
-                else:
-                    min_data.update({'N_R':-42})
-                    min_data.update({'N_L':-42})
-                    min_data.update({'N_im':-42})
-                    min_data.update({'N_white':-42})
-                    min_data.update({'N_all':-42})
-                    min_data.update({'N_R_pattern_ex':-42})
-                    min_data.update({'N_L_pattern_ex':-42})
-                    min_data.update({'N_LR_pattern_ex':-42})
-                    min_data.update({'N_pattern_ex_total':-42})
-                    min_data.update({'N_gaze_R':-42})
-                    min_data.update({'N_gaze_L':-42})
-                    min_data.update({'N_gaze_im':-42})
-                    min_data.update({'N_gaze_white':-42})
-                    min_data.update({'N_gaze_all':-42})
-                    min_data.update({'N_funct':-42})
-                    min_data.update({'N_nonfunct':-42})
-                    min_data.update({'N_funct_pattern_ex':-42})
-                    min_data.update({'N_nonfunct_pattern_ex':-42})
-                    min_data.update({'N_gaze_funct':-42})
-                    min_data.update({'N_gaze_nonfunct':-42})
-                # end of epochs loop
-            # end of functioning side == R clause
-
-        elif functioning_side == 'L':
-            funct_times = L_times.copy()
-            funct_durations = L_durations.copy()
-            N_funct = N_L
-            nonfunct_times = R_times.copy()
-            nonfunct_durations = R_durations.copy()
-            N_nonfunct = N_R
-            functioning_pattern_im_times = L_pattern_im_times.copy()
-            N_functioning_pattern_im = N_L_pattern_im
-            nonfunctioning_pattern_im_times = R_pattern_im_times.copy()
-            N_nonfunctioning_pattern_im = N_R_pattern_im
-            mean_funct_freq = mean_L_freq
-            mean_nonfunct_freq = mean_R_freq
-            mean_funct_dur = mean_L_dur
-            mean_nonfunct_dur = mean_R_dur
-            mean_funct_pattern_im_freq = mean_L_pattern_im_freq
-            mean_nonfunct_pattern_im_freq = mean_R_pattern_im_freq
-            functioning_pattern_ex_times = L_pattern_ex_times.copy()
-            N_functioning_pattern_ex = N_L_pattern_ex
-            nonfunctioning_pattern_ex_times = R_pattern_ex_times.copy()
-            N_nonfunctioning_pattern_ex = N_R_pattern_ex
-            mean_funct_pattern_ex_freq = mean_L_pattern_ex_freq
-            mean_nonfunct_pattern_ex_freq = mean_R_pattern_ex_freq
-            N_gaze_funct = N_gaze_L
-            N_gaze_nonfunct = N_gaze_R
-            funct_gaze_events_times = L_gaze_events_times.copy()
-            nonfunct_gaze_events_times = R_gaze_events_times.copy()
-            funct_gaze_events_durations = L_gaze_events_durations.copy()
-            nonfunct_gaze_events_durations = R_gaze_events_durations.copy()
-            mean_funct_gaze_events_freq = mean_L_gaze_events_freq
-            mean_nonfunct_gaze_events_freq = mean_R_gaze_events_freq
-            mean_funct_gaze_events_dur = mean_L_gaze_events_dur
-            mean_nonfunct_gaze_events_dur = mean_R_gaze_events_dur
-            N_full_gaze_funct = N_full_gaze_pattern_L
-            N_full_gaze_nonfunct = N_full_gaze_pattern_R
-            N_funct_est = N_L_est
-            mean_funct_freq_est = mean_L_freq_est
-            N_nonfunct_est = N_R_est
-            mean_nonfunct_freq_est = mean_R_freq_est
-            N_funct_pattern_ex_est = N_L_pattern_ex_est
-            mean_funct_pattern_ex_freq_est = mean_L_pattern_ex_freq_est
-            N_nonfunct_pattern_ex_est = N_R_pattern_ex_est
-            mean_nonfunct_pattern_ex_freq_est = mean_R_pattern_ex_freq_est
-
-            for i in xrange(5):     # epochs loop
-                min_data = epochs_data[i]
-                if i < N_epochs:
-                    try:
-                        fixation_trajectory_min = fixation_trajectory_epochs[i]
-                        pattern_ex_min = pattern_ex_epochs[i]
-                        gaze_event_trajectory_min = gaze_event_trajectory_epochs[i]
-
-                        N_R_min = fixation_trajectory_min.count('right')
-                        min_data.update({'N_R':N_R_min})
-                        N_L_min = fixation_trajectory_min.count('left')
-                        min_data.update({'N_L':N_L_min})
-                        N_im_min = fixation_trajectory_min.count('image')
-                        min_data.update({'N_im':N_im_min})
-                        N_white_min = fixation_trajectory_min.count('background')
-                        min_data.update({'N_white':N_white_min})
-                        N_all_min = len(fixation_trajectory_min)
-                        min_data.update({'N_all':N_all_min})
-                        min_data.update({'N_funct':N_L_min})
-                        min_data.update({'N_nonfunct':N_R_min})
-
-                        N_R_pattern_ex_min = pattern_ex_min.count('R')
-                        min_data.update({'N_R_pattern_ex':N_R_pattern_ex_min})
-                        N_L_pattern_ex_min = pattern_ex_min.count('L')
-                        min_data.update({'N_L_pattern_ex':N_L_pattern_ex_min})
-                        N_LR_pattern_ex_min = pattern_ex_min.count('LR')
-                        min_data.update({'N_LR_pattern_ex':N_LR_pattern_ex_min})
-                        min_data.update({'N_funct_pattern_ex':N_L_pattern_ex_min})
-                        min_data.update({'N_nonfunct_pattern_ex':N_R_pattern_ex_min})
-                        min_data.update({'N_pattern_ex_total':N_R_pattern_ex_min+N_L_pattern_ex_min+N_LR_pattern_ex_min})
-
-                        N_gaze_R_min = gaze_event_trajectory_min.count('right')
-                        min_data.update({'N_gaze_R':N_gaze_R_min})
-                        N_gaze_L_min = gaze_event_trajectory_min.count('left')
-                        min_data.update({'N_gaze_L':N_gaze_L_min})
-                        N_gaze_im_min = gaze_event_trajectory_min.count('image')
-                        min_data.update({'N_gaze_im':N_gaze_im_min})
-                        N_gaze_white_min = gaze_event_trajectory_min.count('background')
-                        min_data.update({'N_gaze_white':N_gaze_white_min})
-                        N_gaze_all_min = len(gaze_event_trajectory_min)
-                        min_data.update({'N_gaze_all':N_gaze_all_min})
-                        min_data.update({'N_gaze_funct':N_gaze_L_min})
-                        min_data.update({'N_gaze_nonfunct':N_gaze_R_min})
-
-                    except IndexError:
-                        print 'Error: Number of epochs of {} doesn\'t match data! (N_epochs={}, current epoch={})'.format(current_name, N_epochs, i)
-                        error = True
-                        break
-
-                else:
-                    min_data.update({'N_R':-42})
-                    min_data.update({'N_L':-42})
-                    min_data.update({'N_im':-42})
-                    min_data.update({'N_white':-42})
-                    min_data.update({'N_all':-42})
-                    min_data.update({'N_R_pattern_ex':-42})
-                    min_data.update({'N_L_pattern_ex':-42})
-                    min_data.update({'N_LR_pattern_ex':-42})
-                    min_data.update({'N_pattern_ex_total':-42})
-                    min_data.update({'N_gaze_R':-42})
-                    min_data.update({'N_gaze_L':-42})
-                    min_data.update({'N_gaze_im':-42})
-                    min_data.update({'N_gaze_white':-42})
-                    min_data.update({'N_gaze_all':-42})
-                    min_data.update({'N_funct':-42})
-                    min_data.update({'N_nonfunct':-42})
-                    min_data.update({'N_funct_pattern_ex':-42})
-                    min_data.update({'N_nonfunct_pattern_ex':-42})
-                    min_data.update({'N_gaze_funct':-42})
-                    min_data.update({'N_gaze_nonfunct':-42})
-                # end of epochs loop
-            # end of functioning side == L clause
-
+        epoch_schemes = []
+        if functioning_side in ['R', 'L']:
+            for epoch_length, N_epochs in EPOCH_SCHEMES:    # epoch schemes loop
+                N_full_epochs, epochs_data = get_epochs_data(epoch_indices, epoch_length, N_epochs, functioning_side,
+                    all_times[-1])
+                epoch_schemes.append({'epoch_length':epoch_length, 'N_epochs':N_full_epochs, 'epochs_data':epochs_data})
         else:       # could not obtain valid functioning side from overview file
             print 'Error: functioning side', functioning_side, 'not recognized!'
             error_loop = True
+            for epoch_length, N_epochs in EPOCH_SCHEMES:
+                epoch_schemes.append({'epoch_length':epoch_length, 'N_epochs':max(int(all_times[-1] // epoch_length), 0),
+                    'epochs_data':[{} for i in xrange(N_epochs)]})
 
 
         dic_current = {'N_all':N_all, 'N_R':N_R, 'N_L':N_L, 'N_im':N_im, 'N_white':N_white,
-        'N_R_pattern_im':N_R_pattern_im, 'N_L_pattern_im':N_L_pattern_im, 'R_times':R_times, 'L_times':L_times,
-        'all_times':all_times, 'im_times':im_times, 'white_times':white_times, 'first_fix':first_fix,
-        'R_pattern_im_times':R_pattern_im_times, 'L_pattern_im_times':L_pattern_im_times, 'total_time':total_time,
-        'funct_times':funct_times, 'N_funct':N_funct, 'nonfunct_times':nonfunct_times, 'N_nonfunct':N_nonfunct,
-        'funct_pattern_im_times':functioning_pattern_im_times, 'N_funct_pattern_im':N_functioning_pattern_im,
-        'nonfunct_pattern_im_times':nonfunctioning_pattern_im_times, 'N_nonfunct_pattern_im':N_nonfunctioning_pattern_im,
-        'mean_all_freq':mean_all_freq, 'mean_im_freq':mean_im_freq, 'mean_white_freq':mean_white_freq,
-        'mean_R_freq':mean_R_freq, 'mean_L_freq':mean_L_freq, 'mean_R_pattern_im_freq':mean_R_pattern_im_freq,
-        'mean_L_pattern_im_freq':mean_L_pattern_im_freq, 'mean_funct_freq':mean_funct_freq,
-        'mean_nonfunct_freq':mean_nonfunct_freq, 'mean_funct_pattern_im_freq':mean_funct_pattern_im_freq,
-        'mean_nonfunct_pattern_im_freq':mean_nonfunct_pattern_im_freq,
-        'N_R_pattern_ex':N_R_pattern_ex, 'N_L_pattern_ex':N_L_pattern_ex, 'N_LR_pattern_ex':N_LR_pattern_ex, 
-        'N_pattern_ex_total':N_pattern_ex_total, 'R_pattern_ex_times':R_pattern_ex_times,
-        'L_pattern_ex_times':L_pattern_ex_times, 'LR_pattern_ex_times':LR_pattern_ex_times, 
-        'funct_pattern_ex_times':functioning_pattern_ex_times,
-        'N_funct_pattern_ex':N_functioning_pattern_ex, 'nonfunct_pattern_ex_times':nonfunctioning_pattern_ex_times,
-        'N_nonfunct_pattern_ex':N_nonfunctioning_pattern_ex, 'mean_R_pattern_ex_freq':mean_R_pattern_ex_freq,
-        'mean_L_pattern_ex_freq':mean_L_pattern_ex_freq, 'mean_LR_pattern_ex_freq':mean_LR_pattern_ex_freq, 
-        'mean_pattern_ex_total_freq':mean_pattern_ex_total_freq, 'mean_funct_pattern_ex_freq':mean_funct_pattern_ex_freq,
-        'mean_nonfunct_pattern_ex_freq':mean_nonfunct_pattern_ex_freq, 'N_gaze_all':N_gaze_all, 'N_gaze_R':N_gaze_R,
-        'N_gaze_L':N_gaze_L, 'N_gaze_im':N_gaze_im, 'N_gaze_white':N_gaze_white, 'N_gaze_funct':N_gaze_funct,
-        'N_gaze_nonfunct':N_gaze_nonfunct, 'all_durations':all_durations, 'R_durations':R_durations, 'L_durations':L_durations,
-        'im_durations':im_durations, 'white_durations':white_durations, 'funct_durations':funct_durations, 
-        'nonfunct_durations':nonfunct_durations, 'all_gaze_events_durations':all_gaze_events_durations,
-        'R_gaze_events_durations':R_gaze_events_durations, 'L_gaze_events_durations':L_gaze_events_durations,
-        'im_gaze_events_durations':im_gaze_events_durations, 'white_gaze_events_durations':white_gaze_events_durations,
-        'funct_gaze_events_durations':funct_gaze_events_durations, 'nonfunct_gaze_events_durations':nonfunct_gaze_events_durations,
-        'all_gaze_events_times':all_gaze_events_times, 'R_gaze_events_times':R_gaze_events_times, 
-        'L_gaze_events_times':L_gaze_events_times, 'im_gaze_events_times':im_gaze_events_times, 
-        'white_gaze_events_times':white_gaze_events_times, 'funct_gaze_events_times':funct_gaze_events_times,
-        'nonfunct_gaze_events_times':nonfunct_gaze_events_times, 'mean_all_gaze_events_freq':mean_all_gaze_events_freq,
-        'mean_R_gaze_events_freq':mean_R_gaze_events_freq, 'mean_L_gaze_events_freq':mean_L_gaze_events_freq,
-        'mean_im_gaze_events_freq':mean_im_gaze_events_freq, 'mean_white_gaze_events_freq':mean_white_gaze_events_freq,
-        'mean_funct_gaze_events_freq':mean_funct_gaze_events_freq, 'mean_nonfunct_gaze_events_freq':mean_nonfunct_gaze_events_freq,
-        'mean_all_gaze_events_dur':mean_all_gaze_events_dur, 'mean_R_gaze_events_dur':mean_R_gaze_events_dur,
-        'mean_L_gaze_events_dur':mean_L_gaze_events_dur, 'mean_im_gaze_events_dur':mean_im_gaze_events_dur,
-        'mean_white_gaze_events_dur':mean_white_gaze_events_dur, 'mean_funct_gaze_events_dur':mean_funct_gaze_events_dur,
-        'mean_nonfunct_gaze_events_dur':mean_nonfunct_gaze_events_dur, 'mean_all_dur':mean_all_dur, 'mean_R_dur':mean_R_dur,
-        'mean_L_dur':mean_L_dur, 'mean_im_dur':mean_im_dur, 'mean_white_dur':mean_white_dur, 'mean_funct_dur':mean_funct_dur,
-        'mean_nonfunct_dur':mean_nonfunct_dur, 'fixation_trajectory':fixation_trajectory, 
-        'gaze_event_trajectory':gaze_event_trajectory,
-        'N_R_full_gaze_pattern':N_full_gaze_pattern_R, 'N_L_full_gaze_pattern':N_full_gaze_pattern_L,
-        'N_funct_full_gaze_pattern':N_full_gaze_funct, 'N_nonfunct_full_gaze_pattern':N_full_gaze_nonfunct,
-        'N_epochs':N_epochs, 'epochs_data':epochs_data, 'cutoff_data':cutoff_data, 'fix_coordinates':coordinates, 'age':age,
-        'failure_rate':failure_rate, 'N_R_est':N_R_est, 'N_L_est':N_L_est, 'N_white_est':N_white_est, 'N_funct_est':N_funct_est,
-        'N_nonfunct_est':N_nonfunct_est, 'mean_R_freq_est':mean_R_freq_est, 'mean_L_freq_est':mean_L_freq_est,
-        'mean_white_freq_est':mean_white_freq_est, 'mean_funct_freq_est':mean_funct_freq_est,
-        'mean_nonfunct_freq_est':mean_nonfunct_freq_est, 'N_R_pattern_ex_est':N_R_pattern_ex_est,
-        'N_L_pattern_ex_est':N_L_pattern_ex_est, 'N_LR_pattern_ex_est':N_LR_pattern_ex_est, 
-        'N_funct_pattern_ex_est':N_funct_pattern_ex_est, 'N_nonfunct_pattern_ex_est':N_nonfunct_pattern_ex_est,
-        'N_pattern_ex_total_est':N_pattern_ex_total_est, 'mean_R_pattern_ex_freq_est':mean_R_pattern_ex_freq_est,
-        'mean_L_pattern_ex_freq_est':mean_L_pattern_ex_freq_est, 'mean_LR_pattern_ex_freq_est':mean_LR_pattern_ex_freq_est,
-        'mean_pattern_ex_total_freq_est':mean_pattern_ex_total_freq_est, 
-        'mean_funct_pattern_ex_freq_est':mean_funct_pattern_ex_freq_est,
-        'mean_nonfunct_pattern_ex_freq_est':mean_nonfunct_pattern_ex_freq_est}
+            'N_R_pattern_im':N_R_pattern_im, 'N_L_pattern_im':N_L_pattern_im, 'all_times':all_times, 'first_fix':first_fix,
+            'R_pattern_im_times':R_pattern_im_times, 'L_pattern_im_times':L_pattern_im_times, 'total_time':total_time,
+            'mean_all_freq':mean_all_freq, 'mean_im_freq':mean_im_freq, 'mean_white_freq':mean_white_freq,
+            'mean_R_freq':mean_R_freq, 'mean_L_freq':mean_L_freq, 'mean_R_pattern_im_freq':mean_R_pattern_im_freq,
+            'mean_L_pattern_im_freq':mean_L_pattern_im_freq, 'N_R_pattern_ex':N_R_pattern_ex,
+            'N_L_pattern_ex':N_L_pattern_ex, 'N_LR_pattern_ex':N_LR_pattern_ex, 'N_pattern_ex_total':N_pattern_ex_total,
+            'R_pattern_ex_times':R_pattern_ex_times, 'L_pattern_ex_times':L_pattern_ex_times,
+            'LR_pattern_ex_times':LR_pattern_ex_times, 'mean_R_pattern_ex_freq':mean_R_pattern_ex_freq,
+            'mean_L_pattern_ex_freq':mean_L_pattern_ex_freq, 'mean_LR_pattern_ex_freq':mean_LR_pattern_ex_freq,
+            'mean_pattern_ex_total_freq':mean_pattern_ex_total_freq, 'N_gaze_all':N_gaze_all, 'N_gaze_R':N_gaze_R,
+            'N_gaze_L':N_gaze_L, 'N_gaze_im':N_gaze_im, 'N_gaze_white':N_gaze_white, 'all_durations':all_durations,
+            'all_gaze_events_durations':all_gaze_events_durations, 'R_gaze_events_durations':R_gaze_events_durations,
+            'L_gaze_events_durations':L_gaze_events_durations, 'im_gaze_events_durations':im_gaze_events_durations,
+            'white_gaze_events_durations':white_gaze_events_durations, 'all_gaze_events_times':all_gaze_events_times,
+            'mean_all_gaze_events_freq':mean_all_gaze_events_freq, 'mean_R_gaze_events_freq':mean_R_gaze_events_freq,
+            'mean_L_gaze_events_freq':mean_L_gaze_events_freq, 'mean_im_gaze_events_freq':mean_im_gaze_events_freq,
+            'mean_white_gaze_events_freq':mean_white_gaze_events_freq, 'mean_all_gaze_events_dur':mean_all_gaze_events_dur,
+            'mean_R_gaze_events_dur':mean_R_gaze_events_dur, 'mean_L_gaze_events_dur':mean_L_gaze_events_dur,
+            'mean_im_gaze_events_dur':mean_im_gaze_events_dur, 'mean_white_gaze_events_dur':mean_white_gaze_events_dur,
+            'mean_all_dur':mean_all_dur, 'mean_R_dur':mean_R_dur, 'mean_L_dur':mean_L_dur, 'mean_im_dur':mean_im_dur,
+            'mean_white_dur':mean_white_dur, 'fixation_trajectory':fixation_trajectory,
+            'gaze_event_trajectory':gaze_event_trajectory, 'N_R_full_gaze_pattern':N_full_gaze_pattern_R,
+            'N_L_full_gaze_pattern':N_full_gaze_pattern_L, 'N_epochs':epoch_schemes[0]['N_epochs'],
+            'epochs_data':epoch_schemes[0]['epochs_data'], 'epoch_schemes':epoch_schemes,
+            'cutoff_data':cutoff_data, 'fix_coordinates':coordinates, 'age':age, 'failure_rate':failure_rate}
             # dic_current contains all evaluated data of current experiment session to be stored in output file
-
-        for key in dic_current:     # store dic_current in dic_total
-            dic_total = set_key_key_value(dic_total, current_name, key, dic_current[key])
-        for key in dic_params:      # store experiment parameters in dic_total
-            dic_total = set_key_key_value(dic_total, current_name, key, dic_params[key])
+            # -> data of single interest areas and of functioning and nonfunctioning disc are derived by SessionRecord
+        N_patterns_ex = np.zeros(3, dtype=int)
+        N_patterns_ex[[PATTERN_L, PATTERN_R, PATTERN_LR]] = [N_L_pattern_ex, N_R_pattern_ex, N_LR_pattern_ex]
+        dic_current.update(get_estimated_scalars(np.bincount(fixation_trajectory, minlength=len(AOI_NAMES)), N_patterns_ex,
+            total_time))
+            # estimated scalars are based on the recorded interest areas until the failure rate is estimated
+        dic_current.update(dic_params)      # store experiment parameters together with evaluated data
+
+        if current_name in dic_total:       # store dic_current in session record of dic_total
+            dic_total[current_name].update(dic_current)
+        else:
+            dic_total[current_name] = SessionRecord(dic_current)
 
         break
 
@@ -1136,6 +1434,10 @@ def store_results(dic_total):
   while True:   # loop broken if storing successful or error encountered while processing session names
 
     print 'Storing results.'
+    if len(DT_CUTOFFS) > 1:     # output files of each cutoff value of a sweep are kept apart
+        file_suffix = '_{}'.format(dt_cutoff)
+    else:
+        file_suffix = ''
    
         # extract and sort session names
     dic_total_keys = dic_total.keys()   # get all experiment session names
@@ -1456,7 +1758,7 @@ def store_results(dic_total):
     outputfile_dic.close()
 
         # store scalar data (no time series) in a tab-separated text file which can be read like an excel sheet
-    outputfilename_xls = './extracted_data/scalars.xls'
+    outputfilename_xls = './extracted_data/scalars{}.xls'.format(file_suffix)
     outputfile_xls = open(outputfilename_xls, 'w')
     first_line = ('subject name\tsession number\tage (months)\tsubject group\tsession type\tgender\tlatency\tfunctioning side\t'
                   'lab setup\t'
@@ -1500,38 +1802,25 @@ def store_results(dic_total):
                   'mean nonfunctioning side gaze event rate\tmean nonfunctioning side gaze event duration\t'
                   'left full gaze pattern count\tright full gaze pattern count\tfunctioning side full gaze pattern count\t'
                   'nonfunctioning side full gaze pattern count\t'
-                  'number of saccades\tmean saccade rate\tnumber of blinks\tblink ratio\t'
-                  'number of full minutes\t1st minute\t'
-                  'fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
-                  'functioning side fixation count\tnonfunctioning side fixation count\t'
-                  'left extended gaze pattern count\tright extended gaze pattern count\t'
-                  'functioning side extended gaze pattern count\tnonfunctioning side extended gaze pattern count\t'
-                  'gaze event count\timage gaze event count\tleft gaze event count\tright gaze event count\twhite gaze event count\t'
-                  'functioning side gaze event count\tnonfunctioning side gaze event count\t2nd minute\t'
-                  'fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
-                  'functioning side fixation count\tnonfunctioning side fixation count\t'
-                  'left extended gaze pattern count\tright extended gaze pattern count\t'
-                  'functioning side extended gaze pattern count\tnonfunctioning side extended gaze pattern count\t'
-                  'gaze event count\timage gaze event count\tleft gaze event count\tright gaze event count\twhite gaze event count\t'
-                  'functioning side gaze event count\tnonfunctioning side gaze event count\t3rd minute\t'
-                  'fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
-                  'functioning side fixation count\tnonfunctioning side fixation count\t'
-                  'left extended gaze pattern count\tright extended gaze pattern count\t'
-                  'functioning side extended gaze pattern count\tnonfunctioning side extended gaze pattern count\t'
-                  'gaze event count\timage gaze event count\tleft gaze event count\tright gaze event count\twhite gaze event count\t'
-                  'functioning side gaze event count\tnonfunctioning side gaze event count\t4th minute\t'
-                  'fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
-                  'functioning side fixation count\tnonfunctioning side fixation count\t'
-                  'left extended gaze pattern count\tright extended gaze pattern count\t'
-                  'functioning side extended gaze pattern count\tnonfunctioning side extended gaze pattern count\t'
-                  'gaze event count\timage gaze event count\tleft gaze event count\tright gaze event count\twhite gaze event count\t'
-                  'functioning side gaze event count\tnonfunctioning side gaze event count\t5th minute\t'
-                  'fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
+                  'number of saccades\tmean saccade rate\tnumber of blinks\tblink ratio\t')
+    epochs_line = ('fixation count\timage fixation count\tleft fixation count\tright fixation count\twhite fixation count\t'
                   'functioning side fixation count\tnonfunctioning side fixation count\t'
                   'left extended gaze pattern count\tright extended gaze pattern count\t'
                   'functioning side extended gaze pattern count\tnonfunctioning side extended gaze pattern count\t'
                   'gaze event count\timage gaze event count\tleft gaze event count\tright gaze event count\twhite gaze event count\t'
                   'functioning side gaze event count\tnonfunctioning side gaze event count\t')
+        # columns of each epoch
+    for epoch_length, N_epochs in EPOCH_SCHEMES:   # loop over epoch schemes
+        if epoch_length == 60000:
+            first_line += 'number of full minutes\t'
+            epoch_names = ['{} minute'.format(get_ordinal(i+1)) for i in xrange(N_epochs)]
+        else:
+            first_line += 'number of full epochs of {:g} s\t'.format(epoch_length/1000.0)
+            epoch_names = ['{} epoch of {:g} s'.format(get_ordinal(i+1), epoch_length/1000.0) for i in xrange(N_epochs)]
+        for epoch_name in epoch_names:
+            first_line += epoch_name+'\t'+epochs_line
+    for key, label in JOIN_SCALARS:     # scalars added later are appended, so the columns before them keep their position
+        first_line += label+'\t'
 
         # first row describes all stored parameters
     outputfile_xls.write(first_line)
@@ -1558,15 +1847,15 @@ def store_results(dic_total):
         'N_gaze_white', 'mean_white_gaze_events_freq', 'mean_white_gaze_events_dur', 'N_gaze_funct', 'mean_funct_gaze_events_freq', 
         'mean_funct_gaze_events_dur', 'N_gaze_nonfunct', 'mean_nonfunct_gaze_events_freq', 'mean_nonfunct_gaze_events_dur',
         'N_L_full_gaze_pattern', 'N_R_full_gaze_pattern', 'N_funct_full_gaze_pattern', 'N_nonfunct_full_gaze_pattern',
-        'sac_N', 'sac_mean_freq', 'sac_N_blinks', 'sac_blink_ratio', 'N_epochs']
-        # contains all keys of experiment session subdictionaries
+        'sac_N', 'sac_mean_freq', 'sac_N_blinks', 'sac_blink_ratio']
+        # contains all keys of experiment session subdictionaries stored before the epoch columns
     epochs_keys = ['N_all', 'N_im', 'N_L', 'N_R', 'N_white', 'N_funct', 'N_nonfunct', 'N_L_pattern_ex', 'N_R_pattern_ex',
         'N_funct_pattern_ex', 'N_nonfunct_pattern_ex', 'N_gaze_all', 'N_gaze_im', 'N_gaze_L', 'N_gaze_R', 'N_gaze_white',
         'N_gaze_funct', 'N_gaze_nonfunct']
     N_epochs_keys = len(epochs_keys)
 
     # small version
-    outputfilename_small_xls = './extracted_data/scalars_small.xls'
+    outputfilename_small_xls = './extracted_data/scalars_small{}.xls'.format(file_suffix)
     outputfile_small_xls = open(outputfilename_small_xls, 'w')
     first_line_small = ('subject name\tsession number\tage (months)\tsubject group\tsession type\tgender\tlatency\tfunctioning side\t'
                   'lab setup\t'
@@ -1591,21 +1880,29 @@ def store_results(dic_total):
                 value = '.'
             write_string = str(value)
             outputfile_xls.write(write_string+'\t')     # put tab-separation
-        N_epochs = dic_total[outer_key]['N_epochs']
-        epochs_data = dic_total[outer_key]['epochs_data']
-        for i_epoch in xrange(5):
-            outputfile_xls.write('\t')
-            if i_epoch < N_epochs:
-                for epoch_key in epochs_keys:
-                    try:
-                        value = epochs_data[i_epoch][epoch_key]
-                    except KeyError:
-                        value = '.'
-                    write_string = str(value)
-                    outputfile_xls.write(write_string+'\t')
-            else:
-                for i in xrange(N_epochs_keys):
-                    outputfile_xls.write('\t')
+        for epoch_scheme in dic_total[outer_key]['epoch_schemes']:   # loop over epoch schemes
+            N_epochs = epoch_scheme['N_epochs']
+            epochs_data = epoch_scheme['epochs_data']
+            outputfile_xls.write(str(N_epochs)+'\t')
+            for i_epoch in xrange(len(epochs_data)):
+                outputfile_xls.write('\t')
+                if i_epoch < N_epochs:
+                    for epoch_key in epochs_keys:
+                        try:
+                            value = epochs_data[i_epoch][epoch_key]
+                        except KeyError:
+                            value = '.'
+                        write_string = str(value)
+                        outputfile_xls.write(write_string+'\t')
+                else:
+                    for i in xrange(N_epochs_keys):
+                        outputfile_xls.write('\t')
+        for inner_key, label in JOIN_SCALARS:     # loop over scalars of the event joins
+            try:    # check whether the datum was stored
+                value = dic_total[outer_key][inner_key]
+            except KeyError:    # put token where stored value couldn't be retrieved
+                value = '.'
+            outputfile_xls.write(str(value)+'\t')
 
     outputfile_xls.close()
 
@@ -1622,7 +1919,7 @@ def store_results(dic_total):
     outputfile_small_xls.close()
 
         # store inter trigger intervals in separate file, also tab-separated
-    outputfilename_intertrigger = './extracted_data/inter_trigger_intervals.xls'
+    outputfilename_intertrigger = './extracted_data/inter_trigger_intervals{}.xls'.format(file_suffix)
     outputfile_intertrigger = open(outputfilename_intertrigger, 'w')
     first_line = 'subject name\tsession number\tinter trigger intervals'
     outputfile_intertrigger.write(first_line+'\n')
@@ -1639,6 +1936,8 @@ def store_results(dic_total):
             outputfile_intertrigger.write('\n')
     outputfile_intertrigger.close()
 
+    store_peri_trigger_occupancy(dic_total, dic_total_keys, file_suffix)
+
     if not error:
         print 'Storing successful.'
     break
@@ -1651,61 +1950,53 @@ def store_results(dic_total):
 ###
 
 
-def initialize_fixation_data():
+def store_peri_trigger_occupancy(dic_total, dic_total_keys, file_suffix):
     """
-    function for resetting the data that are processed during fixation file extraction
-    -> variables and lists are reset for each experiment session
+    function for storing the interest area occupancy around image triggers in two tab-separated text files
+    -> one row for each session and interest area, and one row for each group of sessions with the same age,
+        subject group, and session type and each interest area of the pooled triggers
 
-    output: see below
+    input:
+        dic_total (dictionary), dictionary containing for each experiment session all parameters and evaluated data
+        dic_total_keys (list), sorted session names
+        file_suffix (str), suffix of output file names
     """
 
-    all_times = []          # this will contain all fixation start times
-    all_durations = []      # this will contain all fixation durations
-    R_times = []            # this will contain all start times of fixations on the right disc
-    R_durations = []        # this will contain all durations of fixations on the right disc
-    L_times = []            # this will contain all start times of fixations on the left disc
-    L_durations = []        # this will contain all durations of fixations on the left disc
-    im_times = []           # this will contain all start times of fixations on the image
-    im_durations = []       # this will contain all durations of fixations on the image
-    white_times = []        # this will contain all start times of fixations on the white background
-    white_durations = []    # this will contain all durations of fixations on the white background
-    R_pattern_im_times = []    # this will contain all start times of the fixation sequence "image -> right disc -> image"
-    L_pattern_im_times = []    # this will contain all start times of the fixation sequence "image -> left disc -> image"
-    R_pattern_ex_times = []    # this will contain all start times of fixation sequences 
-                               #  "image -> arbitrary number of fixations with at least one on right disc and none on left disc
-                               #    -> image"
-    L_pattern_ex_times = []    # this will contain all start times of fixation sequences 
-                               #  "image -> arbitrary number of fixations with at least one on left disc and none on right disc
-                               #    -> image"
-    LR_pattern_ex_times = []    # this will contain all start times of fixation sequences
-                                # "image" -> arbitrary number of fixations with at least one on right and one on left disc -> "image"
-    gaze_pattern_ex_time_temp = -42     # some initial dummy value for start time of current extended gaze pattern
-    gaze_pattern_ex_loc_temp = []   # this will contain the fixation areas since last image fixation 
-                                    # -> used for processing extended gaze patterns
-    all_gaze_events_times = []      # this will contain all gaze event start times
-    all_gaze_events_durations = []  # this will contain all gaze event durations
-    R_gaze_events_times = []        # this will contain all start times of gaze events on the right disc
-    R_gaze_events_durations = []    # this will contain all durations of gaze events on the right disc
-    L_gaze_events_times = []        # this will contain all start times of gaze events on the left disc
-    L_gaze_events_durations = []    # this will contain all durations of gaze events on the left disc
-    im_gaze_events_times = []       # this will contain all start times of gaze events on the image
-    im_gaze_events_durations = []   # this will contain all durations of gaze events on the image
-    white_gaze_events_times = []    # this will contain all start times of gaze events on the white background
-    white_gaze_events_durations = []    # this will contain all durations of gaze events on the white background
-    fixation_trajectory = []        # this will contain the sequence of fixated areas
-    gaze_event_trajectory = []      # this will contain the sequence of gazed at areas
-    fixation_trajectory_epochs = []
-    pattern_ex_epochs = []
-    gaze_event_trajectory_epochs = []
-    coordinates = [[],[]]
+    bin_names = ''
+    for i_bin in xrange(len(PERI_TRIGGER_EDGES)-1):
+        bin_names += '\t{} to {} ms'.format(PERI_TRIGGER_EDGES[i_bin], PERI_TRIGGER_EDGES[i_bin+1])
+
+    outputfile = open('./extracted_data/peri_trigger_sessions{}.xls'.format(file_suffix), 'w')
+    outputfile.write('subject name\tsession number\tage\tgroup\tsession type\tinterest area\tnumber of triggers'
+        + bin_names)
+    for outer_key in dic_total_keys:    # loop over experiment sessions
+        session_dic = dic_total[outer_key]
+        if 'peri_trigger' not in session_dic:
+            continue
+        session_columns = '\n{}\t{}\t{}\t{}\t{}'.format(session_dic['subject_name'], session_dic['session_number'],
+            session_dic.get('age', '.'), session_dic.get('group', '.'), session_dic.get('session_type', '.'))
+        N_triggers = len(session_dic['peri_trigger']['dwell'])
+        occupancy = session_dic['peri_trigger']['occupancy']
+        for code in xrange(len(AOI_NAMES)):     # loop over interest areas, i.e. rows of output file
+            outputfile.write('{}\t{}\t{}'.format(session_columns, AOI_NAMES[code], N_triggers))
+            for value in occupancy[:, code]:
+                outputfile.write('\t{}'.format(value))
+    outputfile.close()
+
+    records = [dic_total[outer_key] for outer_key in dic_total_keys]
+    groups = aggregate_peri_events(records, ['age', 'group', 'session_type'])
+    outputfile = open('./extracted_data/peri_trigger_groups{}.xls'.format(file_suffix), 'w')
+    outputfile.write('age\tgroup\tsession type\tinterest area\tnumber of sessions\tnumber of triggers' + bin_names)
+    for group_key in sorted(groups):    # loop over groups of sessions
+        group_dic = groups[group_key]
+        for i_area in xrange(len(PERI_AREAS)):  # loop over interest areas, i.e. rows of output file
+            outputfile.write('\n{}\t{}\t{}\t{}\t{}\t{}'.format(group_key[0], group_key[1], group_key[2],
+                PERI_AREAS[i_area], group_dic['N_sessions'], group_dic['N_events']))
+            for value in group_dic['occupancy'][:, i_area]:
+                outputfile.write('\t{}'.format(value))
+    outputfile.close()
 
-    return (all_times, all_durations, R_times, R_durations, L_times, L_durations, im_times, im_durations, white_times,
-        white_durations, R_pattern_im_times, L_pattern_im_times, R_pattern_ex_times, L_pattern_ex_times, LR_pattern_ex_times, 
-        gaze_pattern_ex_time_temp, 
-        gaze_pattern_ex_loc_temp, all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times,
-        R_gaze_events_durations, L_gaze_events_times, L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations,
-        white_gaze_events_times, white_gaze_events_durations, fixation_trajectory, gaze_event_trajectory,
-        fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs, coordinates)
+    return
 
 
 ###
@@ -1713,221 +2004,1815 @@ def initialize_fixation_data():
 ###
 
 
-def process_message_files(files_msg, dic_total):
+def store_cutoff_comparison(dic_totals):
     """
-    function for extracting and processing data from message report files
-
-    input:
-        files_msg (list): list of message report files found in reports folder
-        dic_total (dictionary): total dictionary which stores all data
-            -> contains a subdictionary with all data for each experiment session
+    function for storing the scalars depending on the saccade filter of all cutoff values of a sweep
+        in one tab-separated text file
+    -> long format with one row for each session, scalar, and cutoff value
+    -> each scalar is named by its key and by its label in scalars.xls
 
-    output:
-        dic_total (dictionary): updated total dictionary
-        error_in_loop (bool): indicates whether an error was encountered during function execution
+    input: dic_totals (dictionary), total dictionary of each cutoff value
     """
 
-    print 'Processing messages.'
-    error_in_loop = False   # indicates something went wrong in one of the following loops
+    if EPOCH_SCHEMES[0][0] == 60000:
+        N_epochs_label = 'number of full minutes'
+    else:
+        N_epochs_label = 'number of full epochs of {:g} s'.format(EPOCH_SCHEMES[0][0]/1000.0)
+    join_labels = dict(JOIN_SCALARS)
+    scalars_to_compare = [('total_time', 'total time (ms)'), ('N_epochs', N_epochs_label), ('N_triggers', 'trigger count'),
+        ('mean_trigger_freq', 'mean trigger rate'), ('N_all', 'fixation count'), ('mean_all_freq', 'mean fixation rate'),
+        ('mean_all_dur', 'mean fixation duration'), ('N_im', 'image fixation count'),
+        ('mean_im_freq', 'mean image fixation rate'), ('N_R', 'right fixation count'),
+        ('mean_R_freq', 'mean right fixation rate'), ('N_L', 'left fixation count'), ('mean_L_freq', 'mean left fixation rate'),
+        ('N_white', 'white fixation count'), ('mean_white_freq', 'mean white fixation rate'),
+        ('N_funct', 'functioning side fixation count'), ('mean_funct_freq', 'mean functioning side fixation rate'),
+        ('N_nonfunct', 'nonfunctioning side fixation count'), ('mean_nonfunct_freq', 'mean nonfunctioning side fixation rate'),
+        ('N_pattern_ex_total', 'total number of extended gaze patterns'),
+        ('mean_pattern_ex_total_freq', 'mean total extended gaze pattern rate'),
+        ('N_funct_pattern_ex', 'functioning side extended gaze pattern count'),
+        ('mean_funct_pattern_ex_freq', 'mean functioning side extended gaze pattern rate'),
+        ('N_nonfunct_pattern_ex', 'nonfunctioning side extended gaze pattern count'),
+        ('mean_nonfunct_pattern_ex_freq', 'mean nonfunctioning side extended gaze pattern rate'),
+        ('mean_funct_pattern_ex_freq_est', 'estimated mean functioning extended gaze pattern rate'),
+        ('mean_nonfunct_pattern_ex_freq_est', 'estimated mean nonfunctioning extended gaze pattern rate'),
+        ('N_gaze_all', 'gaze event count'), ('mean_all_gaze_events_freq', 'mean gaze event rate'),
+        ('mean_all_gaze_events_dur', 'mean gaze event duration'), ('sac_N', 'number of saccades'),
+        ('sac_mean_freq', 'mean saccade rate'), ('median_trigger_latency', join_labels['median_trigger_latency']),
+        ('trigger_fixation_ratio', join_labels['trigger_fixation_ratio'])]
+        # scalars which depend on the time transformation of the saccade filter and their labels in scalars.xls
+
+    session_names = set()
+    for cutoff_value in DT_CUTOFFS:
+        session_names.update(dic_totals[cutoff_value].keys())
+
+    outputfile = open('./extracted_data/cutoff_comparison.xls', 'w')
+    outputfile.write('subject name\tsession number\tscalar\tsaccade cutoff duration (ms)\tvalue\tscalar label')
+    for session_name in sorted(session_names):  # loop over experiment sessions
+        for key, label in scalars_to_compare:     # loop over scalars
+            for cutoff_value in DT_CUTOFFS:     # loop over cutoff values, i.e. rows of output file
+                try:    # check whether the datum was stored
+                    current_dic = dic_totals[cutoff_value][session_name]
+                    subject_name = current_dic['subject_name']
+                    session_number = current_dic['session_number']
+                    value = current_dic[key]
+                except KeyError:    # put token where stored value couldn't be retrieved
+                    subject_name, session_number, value = session_name, '.', '.'
+                outputfile.write('\n{}\t{}\t{}\t{}\t{}\t{}'.format(subject_name, session_number, key, cutoff_value, value,
+                    label))
+    outputfile.close()
 
-    for report_msg in files_msg:    # loop over message reports
-        if not error_in_loop:
-            print 'Extracting data from', report_msg
+    return
 
-            inputfile_msg = open(reports_folder+report_msg, 'r')
-            inputdata_msg = inputfile_msg.read()    # load message report as text file
-            inputfile_msg.close()
 
-            lines_msg = inputdata_msg.split('\n')[1:-1]
-#            lines_msg = inputdata_msg.split(linebreak)[1:-1]    
-                # lines_msg is a list of all rows containing data
-                # -> first row contains descriptions, last row is empty
-    
-            try:
-                current_label = lines_msg[0].split('\t')[0]
-                    # all report files are basically tab-separated text files
-                    # -> splitting each line by \t yields a list of the different data
-                    # -> first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
-                    #       where X is subject number and y is session number
-            except IndexError:
-                print '\n\nError: could not load message file!\nMake sure file format is right.'
-                error_in_loop = True
-                break
-            if 'vp' in current_label:
-                current_name = current_label[2:]    # get session label in the form X.y
-            else:
-                current_name = current_label
-            #print 'current_name:', current_name
-            #print 'current_dic:', dic_total[current_name]
-            #print 'cutoff_data:', dic_total[current_name]['cutoff_data']
+###
+#
+###
 
-            # saccade filter time transformation
-            try:
-                current_dic = dic_total[current_name]
-                cutoff_data = current_dic['cutoff_data']
-                #print 'retrieving cutoff_data: success'
-            except KeyError:
-            #    cutoff_data = [[0,0,0]]
-                cutoff_data = [[]]
-            #if len(cutoff_data) == 0:
-            #    cutoff_data = [[0,0,0]]
-                #print 'retrieving cutoff_data: fail.\ncreating new cutoff_data.'
-            cutoff_data = [[0,0,0]] + cutoff_data
-            N_cutoffs = len(cutoff_data)
-            i_cutoff = 0
-            cutoff_start = cutoff_data[0][0]
-            cutoff_end = cutoff_data[0][1]
-            t_correct = cutoff_data[0][2]
-
-            trigger_times = []      # this will contain all trigger times of one session
-            trigger_times_real = []
-            inter_trigger_intervals = []    # this will contain all inter trigger intervals of one session
-
-            for i_line in tqdm(xrange(len(lines_msg))):   # loop over messages
-
-                line = lines_msg[i_line].split('\t')    # yields list [session label, time, message text]
-                try:
-                    label = line[0]
-                    time = line[1]
-                    message = line[2]
-                except IndexError:
-                    print '\n\nError: message file could not be loaded!\nMake sure the file format is right.'
-                    error_in_loop = True
-                    break
-                
-                try:        # check whether time is a numerical value
-                    time = int(time)
-                except ValueError:
-                    print '\n\nError: {} not recognized as number! (file {}, line {})'.format(time, report_msg, i_line)
-                    error_in_loop = True
-                    break   
-                
-
-                # actual time transformation
-                real_time = time        # unfiltered time for plotting
-                if i_cutoff < N_cutoffs-1:
-                    while time > cutoff_end:
-                        if i_cutoff < N_cutoffs-1:
-                            i_cutoff += 1
-                            #print 'cutoff_data:', cutoff_data
-                            #print 'i_cutoff:', i_cutoff
-                            try:
-                                cutoff_start = cutoff_data[i_cutoff][0]
-                                cutoff_end = cutoff_data[i_cutoff][1]
-                                t_correct = cutoff_data[i_cutoff-1][2]
-                            except IndexError:
-                                print '\n\nError: could not access cutoff_data of subject {}!'.format(current_name)
-                                print 'Make sure subjects are labelled consistently in all report files!'
-                                error_in_loop = True
-                                break
-                        else:
-                            break
-                    if time > cutoff_start:
-                        time = cutoff_start + 10    # residual saccade after filtering has duration 10 ms                    
-                time -= t_correct
-#                print 'real time: {}\tt_correct: {}\tcorrected time: {}'.format(real_time, t_correct, time)
-
-                if current_label != label:      # triggered whenever line contains data of a new session
-
-                    N_triggers = len(trigger_times)
-
-                    try:        # check whether the number of triggers of current session was stored before
-                        total_time = dic_total[current_name]['total_time']
-                        mean_trigger_freq = 1000.0 * N_triggers / total_time    # mean trigger frequency
-                    except KeyError:
-                        print '\nWarning: could not load session duration.'
-                        mean_trigger_freq = -42     # some dummy value
-                    except TypeError:
-                        print '\nWarning: session duration in wrong format.'
-                        mean_trigger_freq = -42
-
-                    trigger_times = np.array(trigger_times, dtype=int)  # convert lists into numpy array for computational reasons
-                    trigger_times_real = np.array(trigger_times_real, dtype=int)
-                    inter_trigger_intervals = np.array(inter_trigger_intervals, dtype=int)
-                        # call function set_key_key_value() to store values of current experiment session
-#                    print 'trigger times: {}'.format(trigger_times)
-                    dic_total = set_key_key_value(dic_total, current_name, 'trigger_times', trigger_times)
-#                    print 'trigger times real: {}'.format(trigger_times_real)
-                    dic_total = set_key_key_value(dic_total, current_name, 'trigger_times_real', trigger_times_real)
-                    dic_total = set_key_key_value(dic_total, current_name, 'N_triggers', N_triggers)
-                    dic_total = set_key_key_value(dic_total, current_name, 'inter_trigger_intervals', inter_trigger_intervals)
-                    dic_total = set_key_key_value(dic_total, current_name, 'mean_trigger_freq', mean_trigger_freq)
-
-                    # saccade filter time transformation
-                    #print 'current_name:', current_name
-                    try:
-                        current_dic = dic_total[current_name]
-                        cutoff_data = current_dic['cutoff_data']
-                    #    print 'retrieving cutoff_data: success'
-                    except KeyError:
-                    #    cutoff_data = [[0,0,0]]
-                        cutoff_data = [[]]
-                    #if len(cutoff_data) == 0:
-                    #    cutoff_data = [[0,0,0]]
-                    #    print 'retrieving cutoff_data: fail\ncreating new cutoff_data'
-                    cutoff_data = [[0,0,0]] + cutoff_data
-                    N_cutoffs = len(cutoff_data)
-                    i_cutoff = 0
-                    try:
-                        cutoff_start = cutoff_data[i_cutoff][0]
-                        cutoff_end = cutoff_data[i_cutoff][1]
-                        t_correct = cutoff_data[i_cutoff-1][2]
-                    except IndexError:
-                        print '\n\nError: could not access cutoff_data of subject {}!'.format(current_name)
-                        print 'Make sure subjects are labelled consistently in all report files!'
-                        error_in_loop = True
-                        break
-    
-                    trigger_times = []      # reinitialization for next session
-                    trigger_times_real = []
-                    inter_trigger_intervals = []
-    
-                    current_label = line[0]     # get new session label
-                    if 'vp' in current_label:
-                        current_name = current_label[2:]
-                    else:
-                        current_name = current_label
-    
-                if 'PLAY_SOUND_b' in message:      # message for sound playback signals image trigger
-                    if len(trigger_times) == 0:
-                        trigger_times.append(time)
-                        trigger_times_real.append(real_time)
-                    elif len(trigger_times) > 0:    # image triggers after the first image is shown
-                        inter_trigger_time = time-trigger_times[-1]
-                        inter_trigger_intervals.append(inter_trigger_time)
-                        trigger_times.append(time)
-                        trigger_times_real.append(real_time)
-                    else:       # other cases should not occur
-                        print 'Error: len(trigger_times)={} and t_0={}! (file {}, line {})'.format(len(trigger_times),
-                                 t_0, report_msg, i_line)
-                        error_in_loop = True
-                        break
 
-            # end of message loop
+def build_report_index(report):
+    """
+    function for scanning a memory-mapped report file for the byte ranges of its experiment sessions
+    -> a new session starts whenever the session label changes from one row to the next
 
-        if len(files_msg) > 0:      
-            # if the previous message loop was executed at least once, we have to store the data of the last processed session
+    input: report (str), name of report file in reports folder
 
-            N_triggers = len(trigger_times)
+    output: session_index (list), list of (session label, first byte, byte after last row, index of first row) of each session
+    """
+
+    session_index = []
+
+    inputfile = open(reports_folder+report, 'rb')
+    if os.fstat(inputfile.fileno()).st_size == 0:     # empty files cannot be memory-mapped
+        inputfile.close()
+        return session_index
+    report_map = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+    inputfile.close()
+
+    pos = report_map.find('\n') + 1     # first row contains descriptions
+    current_label = None
+    session_start = pos
+    i_first_line = 0
+    i_line = 0
+    while pos > 0:
+        line_end = report_map.find('\n', pos)
+        if line_end == -1:      # last row is only regarded as data row if terminated by a linebreak
+            break
+        label_end = report_map.find('\t', pos, line_end)
+        if label_end == -1:
+            label_end = line_end
+        label = report_map[pos:label_end]   # first item is "RECORDING_SESSION_LABEL"
+        if label != current_label:
+            if current_label is not None:
+                session_index.append((current_label, session_start, pos, i_first_line))
+            current_label = label
+            session_start = pos
+            i_first_line = i_line
+        pos = line_end + 1
+        i_line += 1
+    if current_label is not None:
+        session_index.append((current_label, session_start, pos, i_first_line))
+    report_map.close()
+
+    return session_index
+
+
+###
+#
+###
+
+
+def load_report_index(report):
+    """
+    function for loading the session index of a report file
+    -> the index is stored next to the report as <report>.idx and rebuilt whenever the report was changed since
+
+    input: report (str), name of report file in reports folder
+
+    output: session_index (list), see build_report_index()
+    """
+
+    report_stat = os.stat(reports_folder+report)
+    index_file = reports_folder+report+'.idx'
+
+    try:
+        inputfile = open(index_file, 'rb')
+        index_dic = cPickle.load(inputfile)
+        inputfile.close()
+        if index_dic['size'] == report_stat.st_size and index_dic['mtime'] == report_stat.st_mtime:
+            return index_dic['sessions']
+    except (IOError, EOFError, KeyError, TypeError, ValueError, cPickle.UnpicklingError):
+        pass    # no valid index stored yet
+
+    session_index = build_report_index(report)
+    index_dic = {'size':report_stat.st_size, 'mtime':report_stat.st_mtime, 'sessions':session_index}
+    try:
+        outputfile = open(index_file, 'wb')
+        cPickle.dump(index_dic, outputfile, protocol=cPickle.HIGHEST_PROTOCOL)
+        outputfile.close()
+    except IOError:
+        print '\nWarning: could not store session index {}.'.format(index_file)
+
+    return session_index
+
+
+###
+#
+###
+
+
+def read_report_lines(report, session_start, session_end, raw=False):
+    """
+    function for reading the rows of one experiment session from a memory-mapped report file
+
+    input:
+        report (str), name of report file in reports folder
+        session_start (int), first byte of session, see build_report_index()
+        session_end (int), byte after last row of session
+        raw (bool), if True, the rows are returned as one string including their linebreaks
+
+    output: lines (list), data rows of session, str if raw
+    """
+
+    inputfile = open(reports_folder+report, 'rb')
+    report_map = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+    inputfile.close()
+    if raw:
+        lines = report_map[session_start:session_end]
+    else:
+        lines = report_map[session_start:session_end-1].split('\n')     # last row ends with linebreak
+    report_map.close()
+
+    return lines
+
+
+###
+#
+###
+
+
+def iter_report_sessions(report, session_labels=None, raw=False):
+    """
+    generator for reading a report file session by session
+    -> sessions are sliced from the memory-mapped report using its session index,
+        so only the rows of the current experiment session are held in memory
+
+    input:
+        report (str), name of report file in reports folder
+        session_labels (list), optional, only sessions with these labels are read
+        raw (bool), if True, the rows of each session are yielded as one string, see read_report_lines()
+
+    yields:
+        i_first_line (int), index of first row of session among all data rows of report
+        lines (list), data rows of session, str if raw
+    """
+
+    for label, session_start, session_end, i_first_line in load_report_index(report):
+        if session_labels is None or label in session_labels:
+            yield i_first_line, read_report_lines(report, session_start, session_end, raw)
+
+
+###
+#
+###
+
+
+def get_file_hash(path):
+    """
+    function for computing the SHA-1 hash of a file
+
+    input: path (str), path of file
+
+    output: file_hash (str), hexadecimal SHA-1 hash of file content
+    """
+
+    sha1 = hashlib.sha1()
+    inputfile = open(path, 'rb')
+    while True:
+        chunk = inputfile.read(2**20)
+        if not chunk:
+            break
+        sha1.update(chunk)
+    inputfile.close()
+
+    return sha1.hexdigest()
+
+
+###
+#
+###
+
+
+def load_report_cache(report, report_stat):
+    """
+    function for loading the parsed sessions of a report file from the parse cache
+    -> a cache entry is valid if the size of the report and either its mtime or its SHA-1 hash are unchanged
+
+    input:
+        report (str), name of report file in reports folder
+        report_stat (os.stat_result), current status of report file
+
+    output: parsed_sessions (list), list of parsed columns of each session, None if no valid cache entry exists
+    """
+
+    cache_file = cache_folder+report+'.npz'
+    if not os.path.exists(cache_file):
+        return None
+
+    try:
+        cache_data = np.load(cache_file)
+        try:
+            if (int(cache_data['version']) != CACHE_VERSION or int(cache_data['size']) != report_stat.st_size):
+                return None
+            if float(cache_data['mtime']) != report_stat.st_mtime:
+                if str(cache_data['hash']) != get_file_hash(reports_folder+report):
+                    return None
+
+            N_rows = cache_data['N_rows'].tolist()
+            scalar_keys = cache_data['scalar_keys'].tolist()
+            list_keys = cache_data['list_keys'].tolist()
+            array_keys = cache_data['array_keys'].tolist()
+            scalars = dict((key, cache_data['scalar_'+key].tolist()) for key in scalar_keys)
+            columns = dict((key, cache_data['column_'+key]) for key in list_keys+array_keys)
+        finally:
+            cache_data.close()
+    except (IOError, ValueError, KeyError, TypeError, zipfile.BadZipfile):
+        return None     # broken cache entry is rebuilt
+
+    parsed_sessions = []
+    row_starts = [0]*len(list_keys+array_keys)
+    for i_session in xrange(len(N_rows)):
+        session_columns = {}
+        for key in scalar_keys:
+            session_columns[key] = scalars[key][i_session]
+        for i_key, key in enumerate(list_keys+array_keys):
+            row_end = row_starts[i_key] + N_rows[i_session][i_key]
+            if key in list_keys:
+                session_columns[key] = columns[key][row_starts[i_key]:row_end].tolist()
+            else:
+                session_columns[key] = columns[key][row_starts[i_key]:row_end]
+            row_starts[i_key] = row_end
+        parsed_sessions.append(session_columns)
+
+    return parsed_sessions
+
+
+###
+#
+###
+
+
+def store_report_cache(report, report_stat, parsed_sessions):
+    """
+    function for storing the parsed sessions of a report file in the parse cache
+    -> the columns of all sessions are concatenated and stored in one uncompressed .npz file per report,
+        together with the number of rows of each column of each session
+
+    input:
+        report (str), name of report file in reports folder
+        report_stat (os.stat_result), status of report file before parsing
+        parsed_sessions (list), list of parsed columns of each session
+    """
+
+    if len(parsed_sessions) > 0:
+        first_session = parsed_sessions[0]
+    else:
+        first_session = {}
+    scalar_keys = sorted([key for key in first_session if not isinstance(first_session[key], (list, np.ndarray))])
+    list_keys = sorted([key for key in first_session if isinstance(first_session[key], list)])
+    array_keys = sorted([key for key in first_session if isinstance(first_session[key], np.ndarray)])
+
+    cache_data = {'version':CACHE_VERSION, 'size':report_stat.st_size, 'mtime':report_stat.st_mtime,
+        'hash':get_file_hash(reports_folder+report),
+        'N_rows':np.array([[len(session_columns[key]) for key in list_keys+array_keys]
+            for session_columns in parsed_sessions], dtype=int).reshape(
+            len(parsed_sessions), len(list_keys+array_keys)),
+            # columns of one session may differ in length, e.g. message times and message types
+        'scalar_keys':np.array(scalar_keys, dtype=str), 'list_keys':np.array(list_keys, dtype=str),
+        'array_keys':np.array(array_keys, dtype=str)}
+    for key in scalar_keys:
+        cache_data['scalar_'+key] = np.array([session_columns[key] for session_columns in parsed_sessions])
+    for key in list_keys+array_keys:
+        cache_data['column_'+key] = np.concatenate([np.asarray(session_columns[key])
+            for session_columns in parsed_sessions])
+
+    try:
+        if not os.path.exists(cache_folder):
+            os.makedirs(cache_folder)
+        temp_file = cache_folder+report+'.{}.tmp'.format(os.getpid())
+        outputfile = open(temp_file, 'wb')
+        np.savez(outputfile, **cache_data)
+        outputfile.close()
+        if os.path.exists(cache_folder+report+'.npz'):
+            os.remove(cache_folder+report+'.npz')
+        os.rename(temp_file, cache_folder+report+'.npz')
+    except (IOError, OSError):
+        print '\nWarning: could not store parse cache of {}.'.format(report)
+
+    return
+
+
+###
+#
+###
+
+
+def clear_report_cache():
+    """
+    function for deleting all entries of the parse cache
+    """
+
+    if os.path.exists(cache_folder):
+        for cache_file in os.listdir(cache_folder):
+            if cache_file[-4:] in ['.npz', '.tmp']:
+                os.remove(cache_folder+cache_file)
+    print 'Parse cache cleared.'
+
+    return
+
+
+###
+#
+###
+
+
+def iter_parsed_sessions(report, parse_lines, use_cache, raw=False):
+    """
+    generator for reading the parsed sessions of a report file
+    -> sessions are taken from the parse cache if possible,
+        otherwise the report is parsed session by session and the result is stored in the cache
+
+    input:
+        report (str), name of report file in reports folder
+        parse_lines (function), parsing function of report type,
+            called as parse_lines(lines, report, i_first_line) and returning (columns, error)
+        use_cache (bool), True if parse cache is used
+        raw (bool), if True, parse_lines is called with the rows of each session as one string
+
+    yields:
+        columns (dictionary), parsed columns of session
+        error (bool), True if error encountered while parsing session
+    """
+
+    report_stat = os.stat(reports_folder+report)
+    if use_cache:
+        parsed_sessions = load_report_cache(report, report_stat)
+        if parsed_sessions is not None:
+            for columns in parsed_sessions:
+                yield columns, False
+            return
+
+    parsed_sessions = []
+    for i_first_line, lines in iter_report_sessions(report, raw=raw):
+        columns, error = parse_lines(lines, report, i_first_line)
+        yield columns, error
+        if error:
+            return
+        if use_cache:
+            parsed_sessions.append(columns)
+
+    if use_cache:
+        store_report_cache(report, report_stat, parsed_sessions)
+
+
+###
+#
+###
+
+
+def build_time_correction(times, durations, dt_cutoff):
+    """
+    function for computing the saccade filter time transformation of one experiment session
+    -> saccades between fixations that are longer than dt_cutoff are shortened to 10 ms,
+        so all later times are shifted by the cumulative time correction of the preceding cutoffs
+
+    input:
+        times (ndarray), unfiltered fixation start times in ms
+        durations (ndarray), fixation durations in ms
+        dt_cutoff (int), cutoff value of saccade duration in ms
+
+    output:
+        time_correction (dictionary), dictionary containing
+            - starts: start times of cutoffs in ms (end of preceding fixation)
+            - ends: end times of cutoffs in ms (start of next fixation)
+            - corrections: cumulative time correction up to and including each cutoff in ms
+        cutoff_data (list), list of [cutoff start, cutoff end, time correction] of each cutoff
+    """
+
+    times = np.asarray(times, dtype=int)
+    durations = np.asarray(durations, dtype=int)
+    previous_end_times = np.append(10000, times + durations)[:len(times)]
+    dt = times - previous_end_times
+    cutoffs = dt > dt_cutoff
+    corrections = np.cumsum(np.where(cutoffs, dt - 10, 0))  # shorten saccade duration to 10 ms
+
+    time_correction = {'starts':previous_end_times[cutoffs], 'ends':times[cutoffs],
+        'corrections':corrections[cutoffs]}
+    cutoff_data = np.column_stack((time_correction['starts'], time_correction['ends'],
+        time_correction['corrections'])).tolist()
+
+    return time_correction, cutoff_data
+
+
+###
+#
+###
+
+
+def correct_times(time_correction, times):
+    """
+    function for applying the saccade filter time transformation to a column of unfiltered times
+    -> each time is shifted by the cumulative time correction of all cutoffs ending before it,
+        times within a cutoff are set to the end of the residual saccade of 10 ms
+
+    input:
+        time_correction (dictionary), time transformation returned by build_time_correction()
+        times (ndarray), unfiltered times in ms
+
+    output: corrected_times (ndarray), filtered times in ms
+    """
+
+    times = np.asarray(times, dtype=int)
+    starts = time_correction['starts']
+    i_cutoffs = np.searchsorted(time_correction['ends'], times)     # first cutoff not ending before each time
+    previous_corrections = np.append(0, time_correction['corrections'])[i_cutoffs]
+    cutoff_starts = np.append(starts, np.iinfo(starts.dtype).max)[i_cutoffs]
+    corrected_times = np.where(times > cutoff_starts, cutoff_starts + 10, times) - previous_corrections
+        # residual saccade after filtering has duration 10 ms
+
+    return corrected_times
+
+
+###
+#
+###
+
+
+def get_time_correction(dic_total, current_name):
+    """
+    function for loading the saccade filter time transformation of one experiment session
+    -> cutoff data of each session are stored in dic_total during fixation processing
+
+    input:
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+        current_name (str), session name in the form X.y
+
+    output: time_correction (dictionary), see build_time_correction(), None if session was not processed
+    """
+
+    try:
+        cutoff_data = dic_total[current_name]['cutoff_data']
+    except KeyError:
+        return None
+
+    cutoff_data = np.array(cutoff_data, dtype=int).reshape(-1, 3)
+    time_correction = {'starts':cutoff_data[:,0], 'ends':cutoff_data[:,1], 'corrections':cutoff_data[:,2]}
+
+    return time_correction
+
+
+###
+#
+###
+
+
+def parse_message_rows(rows_msg, report_msg, i_first_line):
+    """
+    function for parsing the message report rows of one experiment session
+    -> only rows containing TRIGGER_MESSAGE contribute to the image triggers, so they are found by a byte-level search
+        of the rows and only their time is parsed
+    -> the message event index of all messages is parsed from the same rows, see parse_message_events()
+    -> does not depend on fixation data, the time transformation is applied in join_message_session()
+
+    input:
+        rows_msg (str), data rows of session returned by iter_report_sessions() with raw=True
+        report_msg (str), name of message report file
+        i_first_line (int), index of first row of session in report
+
+    output:
+        message_columns (dictionary), dictionary containing
+            - label: session label
+            - trigger_times: unfiltered times of messages signalling an image trigger in ms
+            - times: unfiltered times of all messages in ms
+            - types: sorted names of all message types of session
+            - type_codes: index of type of each message in types
+        error (bool), True if error encountered in function
+    """
+
+    error = False
+
+    row_starts = [0]    # first row is checked for the file format, even if it is no trigger
+    row_ends = [rows_msg.find('\n')]
+    pos = rows_msg.find(TRIGGER_MESSAGE)
+    while pos != -1:    # loop over trigger messages
+        row_start = rows_msg.rfind('\n', 0, pos) + 1
+        row_end = rows_msg.find('\n', pos)     # last row ends with linebreak
+        if row_start != row_starts[-1]:
+            row_starts.append(row_start)
+            row_ends.append(row_end)
+        pos = rows_msg.find(TRIGGER_MESSAGE, row_end)
+
+    trigger_times = []
+    for row_start, row_end in zip(row_starts, row_ends):     # loop over first row and trigger rows
+        line = rows_msg[row_start:row_end].split('\t')    # yields list [session label, time, message text]
+        try:
+            time = line[1]
+            message = line[2]
+        except IndexError:
+            print '\n\nError: message file could not be loaded!\nMake sure the file format is right.'
+            error = True
+            break
+
+        try:        # check whether time is a numerical value
+            time = int(time)
+        except ValueError:
+            i_line = i_first_line + rows_msg.count('\n', 0, row_start)
+            print '\n\nError: {} not recognized as number! (file {}, line {})'.format(time, report_msg, i_line)
+            error = True
+            break
+
+        if TRIGGER_MESSAGE in message:
+            trigger_times.append(time)
+
+    message_columns = {'label':rows_msg[:rows_msg.find('\t')]}
+        # all report files are basically tab-separated text files
+        # -> first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
+        #       where X is subject number and y is session number
+    if not error:
+        message_columns['trigger_times'] = np.array(trigger_times, dtype=int)
+        message_columns['times'], message_columns['types'], message_columns['type_codes'], error = parse_message_events(
+            rows_msg, report_msg, i_first_line)
+
+    return message_columns, error
+
+
+###
+#
+###
+
+
+def parse_message_events(rows_msg, report_msg, i_first_line):
+    """
+    function for parsing the times and types of all messages of one experiment session for the message event index
+    -> the rows are split in bulk, the type of each message is the first word of its text (e.g. 'TRIALID')
+
+    input:
+        rows_msg (str), data rows of session returned by iter_report_sessions() with raw=True
+        report_msg (str), name of message report file
+        i_first_line (int), index of first row of session in report
+
+    output:
+        times (ndarray), unfiltered message times in ms
+        types (list), sorted names of all message types of session
+        type_codes (ndarray), index of type of each message in types
+        error (bool), True if error encountered in function
+    """
+
+    error = False
+    times = None
+    types = None
+    type_codes = None
+
+    label = rows_msg[:rows_msg.find('\t')]
+    N_msg = rows_msg.count('\n')     # last row ends with linebreak
+    items = rows_msg.replace('\r', '').replace('\n', '\t').split('\t')[:-1]
+    if len(items) == 3*N_msg and items[0::3].count(label) == N_msg:
+            # each row contains session label, time, and message text
+        time_column = items[1::3]
+        messages = items[2::3]
+    else:       # rows with missing or additional columns
+        time_column = []
+        messages = []
+        for line in rows_msg.replace('\r', '').split('\n')[:-1]:     # loop over messages
+            line = line.split('\t')    # yields list [session label, time, message text]
+            try:
+                time_column.append(line[1])
+                messages.append(line[2])
+            except IndexError:
+                print '\n\nError: message file could not be loaded!\nMake sure the file format is right.'
+                error = True
+                break
+
+    if not error:
+        times, i_bad = cast_column(time_column, int)    # check whether times are numerical values
+        if times is None:
+            print '\n\nError: {} not recognized as number! (file {}, line {})'.format(time_column[i_bad], report_msg,
+                i_first_line + i_bad)
+            error = True
+
+    if not error:
+        message_types = [message.partition(' ')[0].strip() for message in messages]
+        types = sorted(set(message_types))
+        type_index = dict(zip(types, xrange(len(types))))
+        type_codes = np.array([type_index[message_type] for message_type in message_types], dtype=int)
+
+    return times, types, type_codes, error
+
+
+###
+#
+###
+
+
+def build_message_events(types, type_codes, times, times_real):
+    """
+    function for building the message event index of one experiment session
+    -> the times of all messages are grouped by message type and sorted within each type,
+        so the messages of one type in a time window are found by binary search, see get_message_events() in
+        session_record.py
+
+    input:
+        types (list), sorted names of all message types of session
+        type_codes (ndarray), index of type of each message in types
+        times (ndarray), filtered message times in ms
+        times_real (ndarray), unfiltered message times in ms
+
+    output: message_events (dictionary), dictionary containing, all arrays of dtype int32
+        - types: sorted names of all message types of session
+        - offsets: index of first message of each type in times and times_real, followed by number of messages
+        - times: filtered times of messages, grouped by type
+        - times_real: unfiltered times of messages, grouped by type
+    """
+
+    type_codes = np.asarray(type_codes, dtype=int)
+    i_sorted = np.lexsort((times_real, type_codes))      # the time transformation keeps the order of times
+    offsets = np.searchsorted(type_codes[i_sorted], np.arange(len(types)+1))
+
+    message_events = {'types':list(types), 'offsets':offsets.astype(np.int32),
+        'times':times[i_sorted].astype(np.int32), 'times_real':times_real[i_sorted].astype(np.int32)}
+        # 32 bit times in ms cover sessions of more than 24 days, so the index takes half the space
+
+    return message_events
+
+
+###
+#
+###
+
+
+def parse_message_files(files_msg, use_cache, session_names=None):
+    """
+    function for parsing all message report files
+    -> executed concurrently to the fixation stage, see start_report_parsing()
+
+    input:
+        files_msg (list), list of message report files found in reports folder
+        use_cache (bool), True if parse cache is used
+        session_names (set), optional, only sessions with these names are returned
+
+    output:
+        parsed_sessions (list), list of message_columns of each session, see parse_message_rows()
+        error_in_loop (bool), indicates whether an error was encountered during function execution
+    """
+
+    print 'Processing messages.'
+    error_in_loop = False   # indicates something went wrong in one of the following loops
+    parsed_sessions = []
+
+    for report_msg in files_msg:    # loop over message reports
+        if not error_in_loop:
+            print 'Extracting data from', report_msg
+
+            N_sessions = 0
+            for message_columns, error in iter_parsed_sessions(report_msg, parse_message_rows, use_cache, raw=True):
+                    # loop over sessions
+                N_sessions += 1
+                if error:
+                    error_in_loop = True
+                    break
+                if session_names is None or get_session_name(message_columns['label']) in session_names:
+                    parsed_sessions.append(message_columns)
+            if N_sessions == 0:
+                print '\n\nError: could not load message file!\nMake sure file format is right.'
+                error_in_loop = True
+                break
+
+    return parsed_sessions, error_in_loop
+
+
+###
+#
+###
+
+
+def join_message_session(dic_total, message_columns):
+    """
+    function for applying the saccade filter time transformation to the messages of one experiment session
+        and storing the results in total dictionary
+    -> requires cutoff_data and total_time of the session from the fixation stage
+
+    input:
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+        message_columns (dictionary), parsed messages of session returned by parse_message_rows()
+
+    output:
+        dic_total (dictionary), updated total dictionary
+        error (bool), True if error encountered in function
+    """
+
+    error = False
+
+    current_label = message_columns['label']
+    if 'vp' in current_label:
+        current_name = current_label[2:]    # get session label in the form X.y
+    else:
+        current_name = current_label
+
+    # saccade filter time transformation
+    time_correction = get_time_correction(dic_total, current_name)
+    if time_correction is None:
+        print '\n\nError: could not access cutoff_data of subject {}!'.format(current_name)
+        print 'Make sure subjects are labelled consistently in all report files!'
+        error = True
+
+    if not error:
+        trigger_times_real = np.asarray(message_columns['trigger_times'], dtype=int)  # unfiltered times for plotting
+        trigger_times = correct_times(time_correction, trigger_times_real)
+        inter_trigger_intervals = np.diff(trigger_times)    # image triggers after the first image is shown
+        times_real = np.asarray(message_columns['times'], dtype=int)
+        message_events = build_message_events(message_columns['types'], message_columns['type_codes'],
+            correct_times(time_correction, times_real), times_real)
+
+    if not error:
+        N_triggers = len(trigger_times)
+
+        try:        # check whether the number of triggers of current session was stored before
+            total_time = dic_total[current_name]['total_time']
+            mean_trigger_freq = 1000.0 * N_triggers / total_time    # mean trigger frequency
+        except KeyError:
+            print '\nWarning: could not load session duration.'
+            mean_trigger_freq = -42     # some dummy value
+        except TypeError:
+            print '\nWarning: session duration in wrong format.'
+            mean_trigger_freq = -42
+
+            # call function set_key_key_value() to store values of current experiment session
+        dic_total = set_key_key_value(dic_total, current_name, 'trigger_times', trigger_times)
+        dic_total = set_key_key_value(dic_total, current_name, 'trigger_times_real', trigger_times_real)
+        dic_total = set_key_key_value(dic_total, current_name, 'N_triggers', N_triggers)
+        dic_total = set_key_key_value(dic_total, current_name, 'inter_trigger_intervals', inter_trigger_intervals)
+        dic_total = set_key_key_value(dic_total, current_name, 'mean_trigger_freq', mean_trigger_freq)
+        dic_total = set_key_key_value(dic_total, current_name, 'message_events', message_events)
+
+    return dic_total, error
+
+
+###
+#
+###
+
+
+def join_message_files(parsed_sessions, dic_total):
+    """
+    function for joining the parsed message reports with the results of the fixation stage
+
+    input:
+        parsed_sessions (list), parsed messages of each session returned by parse_message_files()
+        dic_total (dictionary), total dictionary which stores all data
+            -> contains a subdictionary with all data for each experiment session
+
+    output:
+        dic_total (dictionary), updated total dictionary
+        error_in_loop (bool), indicates whether an error was encountered during function execution
+    """
+
+    error_in_loop = False
+
+    for message_columns in tqdm(parsed_sessions):   # loop over sessions
+        dic_total, error = join_message_session(dic_total, message_columns)
+        if error:
+            error_in_loop = True
+            break
+
+    return dic_total, error_in_loop
+
+
+###
+#
+###
+
+
+def classify_interest_areas(labels):
+    """
+    function for classifying interest area labels of a fixation report into interest area codes
+    -> each distinct label is classified once, the codes of all rows are looked up from these
+
+    input: labels (list), interest area labels, e.g. 'R', 'L', 'image', or '.'
+
+    output: codes (ndarray), int8 array of interest area codes AOI_RIGHT, AOI_LEFT, AOI_IMAGE, or AOI_BACKGROUND
+    """
+
+    labels_unique, i_labels = np.unique(np.array(labels, dtype=str), return_inverse=True)
+    codes_unique = np.zeros(len(labels_unique), dtype=np.int8)
+    for i_label in xrange(len(labels_unique)):
+        label = labels_unique[i_label]
+        if 'R' in label:
+            codes_unique[i_label] = AOI_RIGHT
+        elif 'L' in label:
+            codes_unique[i_label] = AOI_LEFT
+        elif 'image' in label:
+            codes_unique[i_label] = AOI_IMAGE
+        else:
+            codes_unique[i_label] = AOI_BACKGROUND
+
+    return codes_unique[i_labels]
+
+
+###
+#
+###
+
+
+def parse_fixation_lines(lines, report_fix, i_first_line):
+    """
+    function for parsing the fixation report rows of one experiment session into typed columns
+    -> all rows are converted at once instead of line by line
+
+    input:
+        lines (list), data rows of session returned by iter_report_sessions()
+        report_fix (str), name of fixation report file
+        i_first_line (int), index of first row of session in report
+
+    output:
+        fixation_columns (dictionary), dictionary containing one array per report column:
+            - label: session label
+            - times: fixation start times in ms
+            - durations: fixation durations in ms
+            - IA_current, IA_previous, IA_next: interest area codes of current, previous and next fixation
+            - IA_changed: True if interest area labels of previous and current fixation differ
+            - x_coords, y_coords: fixation coordinates
+        error (bool), True if error encountered in function
+    """
+
+    error = False
+    fixation_columns = None
+
+    while not error:
+
+        N_lines = len(lines)
+
+        N_fields = [line.count('\t')+1 for line in lines]
+        if N_lines > 0 and min(N_fields) >= 8 and min(N_fields) == max(N_fields):
+                # all lines have the same number of columns
+                # -> columns are slices of the list of all tab-separated entries
+            N_columns = N_fields[0]
+            entries = '\t'.join(lines).split('\t')
+            columns = [entries[i_column::N_columns] for i_column in xrange(8)]
+            del entries
+            i_short = N_lines   # first line with missing columns
+        else:
+            i_short = N_lines
+            for i_line in xrange(N_lines):
+                if N_fields[i_line] < 8:
+                    i_short = i_line
+                    break
+            if i_short == 0:
+                print 'Error: could not load fixation file!\nMake sure the file format is right.'
+                error = True
+                break
+            columns = [list(column) for column in zip(*[line.split('\t')[:8] for line in lines[:i_short]])]
+            # yields lists [session labels, fixation start times, current interest areas, previous interest areas,
+            #               next interest areas, fixation durations, x coordinates, y coordinates]
+
+        times, i_bad_time = cast_column(columns[1], int)
+        durations, i_bad_duration = cast_column(columns[5], int)
+        x_coords_str = convert_numbers(columns[6])
+        x_coords, i_bad_x = cast_column(x_coords_str, float)
+        y_coords_str = convert_numbers(columns[7])
+        y_coords, i_bad_y = cast_column(y_coords_str, float)
+
+            # report first broken line, checking its columns in the same order as the line by line parser did
+        i_bad_lines = [i_bad for i_bad in [i_bad_time, i_bad_duration, i_bad_x, i_bad_y] if i_bad is not None]
+        if len(i_bad_lines) > 0:
+            i_bad = min(i_bad_lines)
+            i_line = i_first_line + i_bad
+            if i_bad == i_bad_time:
+                print 'Error: time {} not recognized as number! (file {}, line {})'.format(columns[1][i_bad], report_fix, i_line)
+            elif i_bad == i_bad_duration:
+                print 'Error: duration {} not recognized as a number! (file {}, line {})'.format(columns[5][i_bad], report_fix,
+                    i_line)
+            elif i_bad == i_bad_x:
+                print 'Error: x coordinate {} not recognized as a number! (file {}, line {})'.format(x_coords_str[i_bad],
+                    report_fix, i_line)
+            else:
+                print 'Error: y coordinate {} not recognized as a number! (file {}, line {})'.format(y_coords_str[i_bad],
+                    report_fix, i_line)
+            error = True
+            break
+        if i_short < N_lines:
+            print 'Error: could not load fixation file!\nMake sure the file format is right.'
+            error = True
+            break
+
+        fixation_columns = {'label':columns[0][0], 'times':times, 'durations':durations,
+            'IA_current':classify_interest_areas(columns[2]), 'IA_previous':classify_interest_areas(columns[3]),
+            'IA_next':classify_interest_areas(columns[4]), 'IA_changed':np.array(columns[3]) != np.array(columns[2]),
+            'x_coords':x_coords, 'y_coords':y_coords}
+        break
+
+    return fixation_columns, error
+
+
+###
+#
+###
+
+
+def segment_gaze_events(codes, times, durations, changed=None):
+    """
+    function for segmenting the fixations of a session into gaze events
+    -> a gaze event consists of successive fixations of the same interest area,
+        its duration is the end of its last fixation minus the start of its first fixation
+
+    input:
+        codes (ndarray), interest area codes of fixations
+        times (ndarray), fixation start times in ms
+        durations (ndarray), fixation durations in ms
+        changed (ndarray), optional, True for each fixation whose interest area differs from that of the previous fixation,
+            by default taken from the changes of codes
+
+    output:
+        i_events (ndarray), index of first fixation of each gaze event
+        event_times (ndarray), gaze event start times in ms
+        event_durations (ndarray), gaze event durations in ms
+        event_codes (ndarray), interest area codes of gaze events
+    """
+
+    codes = np.asarray(codes)
+    times = np.asarray(times)
+    durations = np.asarray(durations)
+    if changed is None:
+        changed = np.concatenate([[True], codes[1:] != codes[:-1]])
+    else:
+        changed = np.array(changed, dtype=bool)
+        changed[:1] = True      # first gaze event starts with first fixation
+
+    i_events = np.flatnonzero(changed)
+    i_last = np.append(i_events[1:], len(codes)) - 1    # index of last fixation of each gaze event
+    event_times = times[i_events]
+    event_durations = times[i_last] + durations[i_last] - event_times
+        # takes into account saccades in between the fixations of a gaze event
+    event_codes = codes[i_events]
+
+    return i_events, event_times, event_durations, event_codes
+
+
+###
+#
+###
+
+
+def process_fixation_session(dic_total, fixation_columns, dt_cutoff, overview_dic):
+    """
+    function for processing the fixations of one experiment session and storing the results in total dictionary
+
+    input:
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+        fixation_columns (dictionary), typed report columns of session returned by parse_fixation_lines()
+        dt_cutoff (int), cutoff value of saccade duration for filtering in ms
+        overview_dic (dictionary), subject data extracted from overview files
+
+    output:
+        dic_total (dictionary), updated total dictionary
+        error (bool), True if error encountered in function
+    """
+
+    current_label = fixation_columns['label']
+        # first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
+        #       where X is subject number and y is session number
+    if 'vp' in current_label:
+        current_name = current_label[2:]
+    else:
+        current_name = current_label
+
+    # saccade filter time transformation, shared with the message and saccade stages
+    time_correction, cutoff_data = build_time_correction(fixation_columns['times'], fixation_columns['durations'],
+        dt_cutoff)
+    all_times_array = correct_times(time_correction, fixation_columns['times'])
+    all_durations = np.asarray(fixation_columns['durations'], dtype=int)
+    fixation_trajectory = fixation_columns['IA_current']
+    coordinates = np.array([fixation_columns['x_coords'], fixation_columns['y_coords']])
+
+        # process fixations, each fixation is assigned to the interest area it is listed in
+    is_R_fix = fixation_trajectory == AOI_RIGHT
+    is_L_fix = fixation_trajectory == AOI_LEFT
+    is_im_fix = fixation_trajectory == AOI_IMAGE
+    is_white_fix = ~(is_R_fix | is_L_fix | is_im_fix)
+    R_times = all_times_array[is_R_fix]
+    L_times = all_times_array[is_L_fix]
+    im_times = all_times_array[is_im_fix]
+    white_times = all_times_array[is_white_fix]
+    R_durations = all_durations[is_R_fix]
+    L_durations = all_durations[is_L_fix]
+    im_durations = all_durations[is_im_fix]
+    white_durations = all_durations[is_white_fix]
+
+        # process immediate gaze patterns
+        # -> fixation sequence "image -> X -> image" is an immediate gaze pattern if X is a disc
+    is_between_im = (fixation_columns['IA_previous'] == AOI_IMAGE) & (fixation_columns['IA_next'] == AOI_IMAGE)
+    R_pattern_im_times = all_times_array[is_between_im & is_R_fix]     # "image -> right disc -> image"
+    L_pattern_im_times = all_times_array[is_between_im & is_L_fix]     # "image -> left disc -> image"
+
+    # process extended gaze patterns
+    patterns_ex = scan_patterns(PATTERNS_EX, fixation_columns['IA_current'], all_times_array)
+        # patterns start with an image fixation
+    for name in PATTERNS_EX['names']:
+        patterns_ex[name]['times'][patterns_ex[name]['i_starts'] == 0] = -42
+            # start time of a pattern starting with the first fixation of the session has always been stored as dummy value
+    R_pattern_ex_times = patterns_ex['R_pattern_ex']['times']
+    L_pattern_ex_times = patterns_ex['L_pattern_ex']['times']
+    LR_pattern_ex_times = patterns_ex['LR_pattern_ex']['times']
+
+    # process gaze events
+    i_events, all_gaze_events_times, all_gaze_events_durations, gaze_event_trajectory = segment_gaze_events(
+        fixation_columns['IA_current'], all_times_array, fixation_columns['durations'], fixation_columns['IA_changed'])
+        # new gaze event starts whenever the interest area label changes
+    is_R_event = gaze_event_trajectory == AOI_RIGHT
+    is_L_event = gaze_event_trajectory == AOI_LEFT
+    is_im_event = gaze_event_trajectory == AOI_IMAGE
+    is_white_event = ~(is_R_event | is_L_event | is_im_event)
+    R_gaze_events_times = all_gaze_events_times[is_R_event]
+    L_gaze_events_times = all_gaze_events_times[is_L_event]
+    im_gaze_events_times = all_gaze_events_times[is_im_event]
+    white_gaze_events_times = all_gaze_events_times[is_white_event]
+
+        # durations are assigned to the area that the report lists as previous area when the next gaze event starts
+        # -> same as area of gaze event if report is consistent, last gaze event ends with last fixation
+    closing_codes = np.append(fixation_columns['IA_previous'][i_events[1:]], fixation_columns['IA_current'][-1:])
+    R_gaze_events_durations = all_gaze_events_durations[closing_codes == AOI_RIGHT]
+    L_gaze_events_durations = all_gaze_events_durations[closing_codes == AOI_LEFT]
+    im_gaze_events_durations = all_gaze_events_durations[closing_codes == AOI_IMAGE]
+    white_gaze_events_durations = all_gaze_events_durations[(closing_codes != AOI_RIGHT) & (closing_codes != AOI_LEFT) &
+        (closing_codes != AOI_IMAGE)]
+
+    # process full gaze patterns "image -> disc -> image" of successive gaze events
+    patterns_full = scan_patterns(PATTERNS_FULL, gaze_event_trajectory)
+    N_full_gaze_pattern_R = patterns_full['R_full_gaze_pattern']['N']
+    N_full_gaze_pattern_L = patterns_full['L_full_gaze_pattern']['N']
+
+    # process epoch indices, the epochs of each epoch scheme are evaluated from them in wrap_up()
+        # fixations and gaze events are assigned to the epoch of their start time,
+        # extended gaze patterns to the epoch of the image fixation finishing them
+    pattern_ex_end_times = np.concatenate([all_times_array[patterns_ex[name]['i_ends']] for name in PATTERNS_EX['names']])
+    pattern_ex_codes = np.repeat(np.arange(len(PATTERNS_EX['names'])),
+        [patterns_ex[name]['N'] for name in PATTERNS_EX['names']])
+    i_sorted = np.argsort(pattern_ex_end_times, kind='mergesort')
+    epoch_indices = {'fixations':build_epoch_index(all_times_array, fixation_columns['IA_current'],
+            fixation_columns['durations'], len(AOI_NAMES)),
+        'gaze_events':build_epoch_index(all_gaze_events_times, gaze_event_trajectory, all_gaze_events_durations,
+            len(AOI_NAMES)),
+        'patterns_ex':build_epoch_index(pattern_ex_end_times[i_sorted], pattern_ex_codes[i_sorted], None,
+            len(PATTERNS_EX['names']))}
+
+    dic_total = set_key_key_value(dic_total, current_name, 'dt_cutoff', dt_cutoff)
+    dic_total, error = wrap_up(dic_total, current_name, R_times, L_times, im_times, 
+        white_times, all_times_array, L_pattern_im_times, R_pattern_im_times, L_pattern_ex_times, R_pattern_ex_times, 
+        LR_pattern_ex_times,
+        all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times, R_gaze_events_durations, L_gaze_events_times, 
+        L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, white_gaze_events_times, 
+        white_gaze_events_durations, all_durations, R_durations, L_durations, im_durations, white_durations,
+        fixation_trajectory, gaze_event_trajectory, N_full_gaze_pattern_R, N_full_gaze_pattern_L,
+        epoch_indices, cutoff_data, overview_dic, coordinates)
+            # call function wrap_up() to process fixation data and store in dic_total
+
+    return dic_total, error
+
+
+###
+#
+###
+
+
+def init_worker(failure_rate, kde_method, peak_tolerance, validate_peaks, epoch_schemes, folder, folder_cache):
+    """
+    function for initializing a worker process of the fixation, message, or saccade stage
+    -> the global variables set by the main script are handed over explicitly,
+        since worker processes do not necessarily inherit them
+
+    input:
+        failure_rate (bool), True if failure rate will be calculated
+        kde_method (str), method of kernel density estimate used for failure rate, 'fft', 'exact', or 'search'
+        peak_tolerance (int), step of finest grid of peak search in pixels
+        validate_peaks (bool), True if peak search results are compared with exhaustive grid evaluation
+        epoch_schemes (list), list of (epoch length in ms, number of epochs)
+        folder (str), path of reports folder
+        folder_cache (str), path of parse cache folder
+    """
+    global FAILURE_RATE, KDE_METHOD, PEAK_TOLERANCE, VALIDATE_PEAKS, EPOCH_SCHEMES, reports_folder, cache_folder
+
+    FAILURE_RATE = failure_rate
+    KDE_METHOD = kde_method
+    PEAK_TOLERANCE = peak_tolerance
+    VALIDATE_PEAKS = validate_peaks
+    EPOCH_SCHEMES = epoch_schemes
+    reports_folder = folder
+    cache_folder = folder_cache
+
+    return
+
+
+###
+#
+###
+
+
+def process_fixation_job(job):
+    """
+    function for processing one experiment session of a fixation report in a worker process
+    -> used if the fixation stage runs in parallel
+
+    input: job (tuple), (fixation_columns, dt_cutoffs, overview_dic)
+        -> fixation_columns are the typed report columns of session returned by parse_fixation_lines(),
+            dt_cutoffs is the list of cutoff values
+
+    output:
+        session_dics (dictionary), for each cutoff value a dictionary containing the subdictionary of the processed session
+        error (bool), True if error encountered in function
+    """
+
+    fixation_columns, dt_cutoffs, overview_dic = job
+
+    session_dics = {}
+    error = False
+    for dt_cutoff in dt_cutoffs:    # loop over cutoff values, the parsed session is shared
+        session_dics[dt_cutoff], error = process_fixation_session({}, fixation_columns, dt_cutoff, overview_dic)
+            # call function process_fixation_session() to process fixation data and store in session_dics
+        if error:
+            break
+
+    return session_dics, error
+
+
+###
+#
+###
+
+
+def iter_fixation_jobs(report_fix, dt_cutoffs, overview_dic, use_cache, session_names, parse_status):
+    """
+    generator for the jobs of the sessions of a fixation report in the order of the report
+    -> used if the fixation stage runs in parallel, the pool takes each job as soon as its session is parsed,
+        so the sessions of a report are not held in memory all at once
+
+    input:
+        report_fix (str), name of fixation report file in reports folder
+        dt_cutoffs (list), cutoff values of saccade duration for filtering in ms
+        overview_dic (dictionary), subject data extracted from overview files
+        use_cache (bool), True if parse cache is used
+        session_names (set), only sessions with these names are yielded, all sessions if None
+        parse_status (dictionary), updated with the number of parsed sessions ('N_sessions')
+            and whether an error was encountered while parsing ('error')
+
+    yields: job (tuple), (fixation_columns, dt_cutoffs, overview_dic) for process_fixation_job()
+    """
+
+    for fixation_columns, error in iter_parsed_sessions(report_fix, parse_fixation_lines, use_cache):
+            # loop over sessions
+        parse_status['N_sessions'] += 1
+        if error:
+            parse_status['error'] = True
+            break
+        if session_names is not None and get_session_name(fixation_columns['label']) not in session_names:
+            continue
+        yield fixation_columns, dt_cutoffs, overview_dic
+
+
+###
+#
+###
+
+
+def process_fixation_files(files_fix, dic_totals, dt_cutoffs, overview_dic, jobs=1, use_cache=True, session_names=None,
+    failure_rate_jobs=None):
+    """
+    function for extracting and processing data from fixation report files
+    -> with jobs > 1, sessions are processed by a pool of worker processes
+        and merged into dic_totals in the order of the report
+    -> each session is parsed once and processed for every cutoff value
+
+    input:
+        files_fix (list): list of fixation report files found in reports folder
+        dic_totals (dictionary): total dictionary of each cutoff value which stores all data
+            -> contains a subdictionary with all data for each experiment session
+        dt_cutoffs (list): cutoff values of saccade duration for filtering in ms
+        overview_dic (dictionary): subject data extracted from overview files
+        jobs (int): number of worker processes
+        use_cache (bool): True if parse cache is used
+        session_names (set): optional, only sessions with these names are processed
+        failure_rate_jobs (dictionary): optional, state of failure rate estimation returned by init_failure_rate_jobs(),
+            the failure rate estimation of each processed session is submitted to it once for all cutoff values
+
+    output:
+        dic_totals (dictionary): updated total dictionary of each cutoff value
+        error_in_loop (bool): indicates whether an error was encountered during function execution
+    """
+
+    print 'Processing fixations.'
+    error_in_loop = False       # indicates something went wrong in one of the following loops
+    pool = None
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs, init_worker, (FAILURE_RATE, KDE_METHOD, PEAK_TOLERANCE, VALIDATE_PEAKS,
+            EPOCH_SCHEMES, reports_folder, cache_folder))
+
+    try:
+      for report_fix in files_fix:    # loop over fixation files
+        if not error_in_loop:     # only continue if no errors encountered
+          print 'Extracting data from', report_fix
+
+          parse_status = {'N_sessions':0, 'error':False}
+          if pool is None:
+              for fixation_columns, error in tqdm(iter_parsed_sessions(report_fix, parse_fixation_lines, use_cache)):
+                    # loop over sessions
+                  parse_status['N_sessions'] += 1
+                  if error:
+                      parse_status['error'] = True
+                      break
+                  if session_names is not None and get_session_name(fixation_columns['label']) not in session_names:
+                      continue
+                  for dt_cutoff in dt_cutoffs:    # loop over cutoff values, the parsed session is shared
+                      dic_totals[dt_cutoff], error = process_fixation_session(dic_totals[dt_cutoff], fixation_columns,
+                          dt_cutoff, overview_dic)
+                        # call function process_fixation_session() to process fixation data and store in dic_totals
+                      if error:
+                          break
+                  if error:
+                      error_in_loop = True
+                      break
+                  current_name = get_session_name(fixation_columns['label'])
+                  dic_total = dic_totals[dt_cutoffs[0]]
+                  if failure_rate_jobs is not None and current_name in dic_total:
+                      submit_failure_rate_job(failure_rate_jobs, current_name, dic_total[current_name]['fix_coordinates'],
+                          dic_total[current_name]['functioning_side'])
+          else:
+              jobs_fix = iter_fixation_jobs(report_fix, dt_cutoffs, overview_dic, use_cache, session_names, parse_status)
+                # sessions are parsed while the pool processes the jobs of the preceding sessions
+              for session_dics, error in tqdm(pool.imap(process_fixation_job, jobs_fix)):
+                    # loop over sessions, results are returned in the order of the jobs
+                  if error:
+                      error_in_loop = True
+                      break
+                  for dt_cutoff in dt_cutoffs:    # loop over cutoff values
+                      dic_total = dic_totals[dt_cutoff]
+                      session_dic = session_dics[dt_cutoff]
+                      for current_name in session_dic:
+                          if current_name in dic_total:
+                              dic_total[current_name].update(session_dic[current_name])
+                          else:
+                              dic_total[current_name] = session_dic[current_name]
+                  if failure_rate_jobs is not None:
+                      dic_total = dic_totals[dt_cutoffs[0]]
+                      for current_name in session_dics[dt_cutoffs[0]]:
+                          submit_failure_rate_job(failure_rate_jobs, current_name,
+                              dic_total[current_name]['fix_coordinates'], dic_total[current_name]['functioning_side'])
+          if parse_status['error']:
+              error_in_loop = True
+          if error_in_loop:
+              break
+          if parse_status['N_sessions'] == 0:
+              print 'Error: could not load fixation file!\nMake sure the file format is right.'
+              error_in_loop = True
+              break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()     # terminating the pool while a worker is sending its result might deadlock
+
+    return dic_totals, error_in_loop
+
+
+##
+#
+##
+
+
+def parse_saccade_rows(rows_sac, report_sac, i_first_line):
+    """
+    function for parsing the saccade report rows of one experiment session into one structured array
+    -> the rows are split in bulk and each column is converted at once
+    -> does not depend on fixation data, the time transformation is applied in join_saccade_session()
+
+    input:
+        rows_sac (str), data rows of session returned by iter_report_sessions() with raw=True
+        report_sac (str), name of saccade report file
+        i_first_line (int), index of first row of session in report
+
+    output:
+        saccade_columns (dictionary), dictionary containing
+            - label: session label
+            - saccades: saccade data of session as structured array of dtype SACCADE_DTYPE (see session_record.py),
+                time and time_real both contain the unfiltered saccade start times in ms
+            - N_blinks: number of saccades containing a blink
+        error (bool), True if error encountered in function
+    """
+
+    error = False
+    saccade_columns = None
+
+    while not error:
+
+        label = rows_sac[:rows_sac.find('\t')]
+            # all report files are basically tab-separated text files
+            # -> first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
+            #       where X is subject number and y is session number
+        N_sac = rows_sac.count('\n')     # last row ends with linebreak
+        items = rows_sac.replace('\r', '').replace('\n', '\t').split('\t')[:-1]
+        if len(items) == 10*N_sac and items[0::10].count(label) == N_sac:
+                # each row contains [session label, time, start area, end area, duration, amplitude, angle,
+                #                   average velocity, peak velocity, blink]
+                # -> columns are slices of the list of all tab-separated entries
+            columns = [items[i_column::10] for i_column in xrange(10)]
+            i_short = N_sac     # first row with missing columns
+        else:       # rows with missing or additional columns
+            rows = [line.split('\t') for line in rows_sac.replace('\r', '').split('\n')[:-1]]
+            i_short = N_sac
+            for i_sac in xrange(N_sac):
+                if len(rows[i_sac]) < 10:
+                    i_short = i_sac
+                    break
+            columns = [[row[i_column] for row in rows[:i_short]] for i_column in xrange(10)]
+            del rows
+        del items
+
+        times, i_bad_time = cast_column(columns[1], np.int32)
+        durations, i_bad_duration = cast_column(columns[4], np.int32)
+        amplitudes, i_bad_amplitude, amplitudes_str = cast_decimal_column(columns[5], np.float32)
+        angles, i_bad_angle, angles_str = cast_decimal_column(columns[6], np.float32)
+        velocities_avg, i_bad_velocity_avg, velocities_avg_str = cast_decimal_column(columns[7], np.float32)
+        velocities_peak, i_bad_velocity_peak, velocities_peak_str = cast_decimal_column(columns[8], np.float32)
+        blinks_str = np.array(columns[9], dtype=str)
+        blinks = blinks_str == 'true'
+        i_bad_blink = None
+        for i_sac in np.flatnonzero(~blinks & (blinks_str != 'false')):
+                # only executed for unusual entries -> same test as the line by line parser did
+            if 'true' in columns[9][i_sac]:
+                blinks[i_sac] = True
+            elif 'false' not in columns[9][i_sac]:
+                i_bad_blink = i_sac
+                break
+
+            # report first broken row, checking its columns in the same order as the line by line parser did
+        i_bad_rows = [i_bad for i_bad in [i_bad_time, i_bad_duration, i_bad_amplitude, i_bad_angle, i_bad_velocity_avg,
+            i_bad_velocity_peak, i_bad_blink] if i_bad is not None]
+        if len(i_bad_rows) > 0:
+            i_bad = min(i_bad_rows)
+            i_line = i_first_line + i_bad
+            if i_bad == i_bad_time:
+                print 'Error: time {} not recognized as number! (file {}, line {})'.format(columns[1][i_bad], report_sac, i_line)
+            elif i_bad == i_bad_duration:
+                print 'Error: duration {} not recognized as number! (file {}, line {})'.format(columns[4][i_bad], report_sac,
+                    i_line)
+            elif i_bad == i_bad_amplitude:
+                print 'Error: amplitude {} not recognized as number! (file {}, line {})'.format(amplitudes_str[i_bad],
+                    report_sac, i_line)
+                print 'line: {}'.format(rows_sac.split('\n')[i_bad].split('\t'))
+            elif i_bad == i_bad_angle:
+                print 'Error: angle {} not recognized as number! (file {}, line {})'.format(angles_str[i_bad], report_sac,
+                    i_line)
+            elif i_bad == i_bad_velocity_avg:
+                print 'Error: average velocity {} not recognized as number! (file {}, line {})'.format(
+                    velocities_avg_str[i_bad], report_sac, i_line)
+            elif i_bad == i_bad_velocity_peak:
+                print 'Error: peak velocity {} not recognized as number! (file {}, line {})'.format(
+                    velocities_peak_str[i_bad], report_sac, i_line)
+            else:
+                print 'Error: {} not recognized as boolean! (file {}, line {})'.format(columns[9][i_bad], report_sac, i_line)
+            error = True
+            break
+        if i_short < N_sac:
+            print 'Error: could not load saccade file!\nMake sure file format is right.'
+            error = True
+            break
+
+        saccades = np.zeros(N_sac, dtype=SACCADE_DTYPE)
+        saccades['time'] = times
+        saccades['time_real'] = times
+        saccades['duration'] = durations
+        saccades['amplitude'] = amplitudes
+        saccades['angle'] = angles
+        saccades['velocity_avg'] = velocities_avg
+        saccades['velocity_peak'] = velocities_peak
+        saccades['blink'] = blinks
+
+        saccade_columns = {'label':label, 'saccades':saccades, 'N_blinks':int(np.count_nonzero(blinks))}
+        break
+
+    return saccade_columns, error
+
+
+###
+#
+###
+
+
+def parse_saccade_files(files_sac, use_cache, session_names=None):
+    """
+    function for parsing all saccade report files
+    -> executed concurrently to the fixation stage, see start_report_parsing()
+
+    input:
+        files_sac (list), list of saccade report files found in reports folder
+        use_cache (bool), True if parse cache is used
+        session_names (set), optional, only sessions with these names are returned
+
+    output:
+        parsed_sessions (list), list of saccade_columns of each session, see parse_saccade_rows()
+        error_in_loop (bool), indicates whether an error was encountered during function execution
+    """
+
+    print 'Processing saccades.'
+    error_in_loop = False   # indicates something went wrong in one of the following loops
+    parsed_sessions = []
+
+    for report_sac in files_sac:    # loop over saccade reports
+        if not error_in_loop:
+            print 'Extracting data from', report_sac
+
+            N_sessions = 0
+            for saccade_columns, error in iter_parsed_sessions(report_sac, parse_saccade_rows, use_cache, raw=True):
+                    # loop over sessions
+                N_sessions += 1
+                if error:
+                    error_in_loop = True
+                    break
+                if session_names is None or get_session_name(saccade_columns['label']) in session_names:
+                    parsed_sessions.append(saccade_columns)
+            if N_sessions == 0:
+                print 'Error: could not load saccade file!\nMake sure file format is right.'
+                error_in_loop = True
+                break
+
+    return parsed_sessions, error_in_loop
+
+
+###
+#
+###
+
+
+def join_saccade_session(dic_total, saccade_columns):
+    """
+    function for applying the saccade filter time transformation to the saccades of one experiment session
+        and storing the results in total dictionary
+    -> requires cutoff_data and total_time of the session from the fixation stage
+
+    input:
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+        saccade_columns (dictionary), parsed saccades of session returned by parse_saccade_rows()
+
+    output: dic_total (dictionary), updated total dictionary
+    """
+
+    current_label = saccade_columns['label']
+    if 'vp' in current_label:
+        current_name = current_label[2:]    # get session label in the form X.y
+    else:
+        current_name = current_label
+
+    # saccade filter time transformation
+    time_correction = get_time_correction(dic_total, current_name)
+    if time_correction is None:
+        print '\nWarning: could not access cutoff_data of subject {}, saccade times are not filtered.'.format(current_name)
+        time_correction = {'starts':np.zeros(0, dtype=int), 'ends':np.zeros(0, dtype=int),
+            'corrections':np.zeros(0, dtype=int)}
+    saccades = saccade_columns['saccades'].copy()    # parsed saccades are joined with the results of each cutoff value
+    saccades['time'] = correct_times(time_correction, saccades['time_real'])
+
+    N_saccades = len(saccades)
+    N_blinks = saccade_columns['N_blinks']
+    if N_saccades > 0:
+        blink_ratio = 1.0 * N_blinks / N_saccades
+    else:
+        blink_ratio = 0.0
+
+    try:        # check whether the session duration was stored before
+        total_time = dic_total[current_name]['total_time']
+        mean_sac_freq = 1000.0 * N_saccades / total_time    # mean saccade frequency
+    except KeyError:
+        mean_sac_freq = -42     # some dummy value
+
+    dic_total = set_key_key_value(dic_total, current_name, 'saccades', saccades)
+        # sac_times, sac_durations, etc. are derived from the fields of saccades, see session_record.py
+    dic_total = set_key_key_value(dic_total, current_name, 'sac_N', N_saccades)
+    dic_total = set_key_key_value(dic_total, current_name, 'sac_mean_freq', mean_sac_freq)
+    dic_total = set_key_key_value(dic_total, current_name, 'sac_blink_ratio', blink_ratio)
+    dic_total = set_key_key_value(dic_total, current_name, 'sac_N_blinks', N_blinks)
+
+    return dic_total
+
+
+###
+#
+###
+
+
+def join_saccade_files(parsed_sessions, dic_total):
+    """
+    function for joining the parsed saccade reports with the results of the fixation stage
+
+    input:
+        parsed_sessions (list), parsed saccades of each session returned by parse_saccade_files()
+        dic_total (dictionary), total dictionary which stores all data
+            -> contains a subdictionary with all data for each experiment session
+
+    output: dic_total (dictionary), updated total dictionary
+    """
+
+    for saccade_columns in tqdm(parsed_sessions):   # loop over sessions
+        dic_total = join_saccade_session(dic_total, saccade_columns)
+
+    return dic_total
+
+
+###
+#
+###
+
+
+def join_session_events(dic_total, current_name):
+    """
+    function for relating the fixations, image triggers, and saccades of one experiment session to each other
+        and storing the event tables and their scalars in total dictionary
+    -> requires the results of the fixation, message, and saccade stages, see event_joins.py for the joins
+
+    input:
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+        current_name (str), session name in the form X.y
+
+    output: dic_total (dictionary), updated total dictionary
+    """
+
+    session_dic = dic_total[current_name]
+    if 'all_times' not in session_dic:    # no fixations of session
+        return dic_total
+    fixation_times = session_dic['all_times']
+    fixation_codes = session_dic['fixation_trajectory']
+
+    if 'trigger_times' in session_dic:
+        if session_dic['functioning_side'] == 'R':
+            funct_code = AOI_RIGHT
+        elif session_dic['functioning_side'] == 'L':
+            funct_code = AOI_LEFT
+        else:
+            funct_code = None
+        trigger_events = join_triggers(fixation_times, session_dic['all_durations'], fixation_codes,
+            session_dic['trigger_times'], funct_code)
+            # each trigger is joined with the preceding fixation on the functioning disc
+        joined = trigger_events['i_fixation'] >= 0
+        if np.any(joined):
+            median_trigger_latency = float(np.median(trigger_events['latency'][joined]))
+        else:
+            median_trigger_latency = -42    # some dummy value
+        N_triggers = len(trigger_events)
+        if N_triggers > 0:
+            trigger_fixation_ratio = 1.0 * np.count_nonzero(trigger_events['during_fixation']) / N_triggers
+        else:
+            trigger_fixation_ratio = 0.0
+        dic_total = set_key_key_value(dic_total, current_name, 'trigger_events', trigger_events)
+        dic_total = set_key_key_value(dic_total, current_name, 'median_trigger_latency', median_trigger_latency)
+        dic_total = set_key_key_value(dic_total, current_name, 'trigger_fixation_ratio', trigger_fixation_ratio)
+
+        dwell = get_peri_event_dwell(fixation_times, session_dic['all_durations'], fixation_codes,
+            session_dic['trigger_times'], PERI_TRIGGER_EDGES, len(AOI_NAMES))
+            # time spent on each interest area in each time bin around each trigger
+        peri_trigger = {'bin_edges':PERI_TRIGGER_EDGES, 'dwell':dwell,
+            'occupancy':get_occupancy(dwell.sum(axis=0), N_triggers, PERI_TRIGGER_EDGES)}
+        dic_total = set_key_key_value(dic_total, current_name, 'peri_trigger', peri_trigger)
+
+    if 'saccades' in session_dic:
+        saccade_events = join_saccades(fixation_times, fixation_codes, session_dic['saccades']['time'])
+        source_areas = saccade_events['source_area']
+        target_areas = saccade_events['target_area']
+        joined = (source_areas >= 0) & (target_areas >= 0)
+        N_joined = np.count_nonzero(joined)
+        if N_joined > 0:
+            area_change_ratio = 1.0 * np.count_nonzero(joined & (source_areas != target_areas)) / N_joined
+        else:
+            area_change_ratio = 0.0
+        dic_total = set_key_key_value(dic_total, current_name, 'saccade_events', saccade_events)
+        dic_total = set_key_key_value(dic_total, current_name, 'sac_area_change_ratio', area_change_ratio)
+
+    return dic_total
+
+
+###
+#
+###
+
+
+def join_event_streams(dic_total):
+    """
+    function for relating the fixations, image triggers, and saccades of all experiment sessions to each other
+    -> executed after the message and saccade reports were joined with the results of the fixation stage
+
+    input: dic_total (dictionary), total dictionary which stores all data
+        -> contains a subdictionary with all data for each experiment session
+
+    output: dic_total (dictionary), updated total dictionary
+    """
+
+    for current_name in dic_total.keys():    # loop over sessions
+        dic_total = join_session_events(dic_total, current_name)
+
+    return dic_total
+
+
+###
+#
+###
+
+
+def run_captured(function, args):
+    """
+    function for calling a function while capturing everything it prints
+    -> stages running concurrently to the fixation stage hand their messages back to the main script,
+        which prints them when the stage is joined
+
+    input:
+        function (function), function to be called
+        args (tuple), arguments of function
+
+    output:
+        result (any), return value of function
+        output (str), printed text
+    """
+
+    stdout = sys.stdout
+    sys.stdout = StringIO.StringIO()
+    try:
+        result = function(*args)
+        output = sys.stdout.getvalue()
+    finally:
+        sys.stdout = stdout
+
+    return result, output
+
+
+###
+#
+###
+
+
+def start_report_parsing(files_msg, files_sac, use_cache, session_names=None):
+    """
+    function for parsing message and saccade reports in background processes
+    -> parsing does not depend on the fixation stage, so it runs concurrently to it,
+        only the time transformation requires fixation results and is applied by join_message_files() and
+        join_saccade_files()
+
+    input:
+        files_msg (list), list of message report files found in reports folder
+        files_sac (list), list of saccade report files found in reports folder
+        use_cache (bool), True if parse cache is used
+        session_names (set), optional, only sessions with these names are returned
+
+    output:
+        pool (multiprocessing.Pool), pool of the background processes
+        parse_jobs (dictionary), pending results of run_captured(parse_message_files) under 'msg'
+            and of run_captured(parse_saccade_files) under 'sac'
+    """
+
+    pool = multiprocessing.Pool(2, init_worker, (FAILURE_RATE, KDE_METHOD, PEAK_TOLERANCE, VALIDATE_PEAKS,
+        EPOCH_SCHEMES, reports_folder, cache_folder))
+    parse_jobs = {'msg':pool.apply_async(run_captured, (parse_message_files, (files_msg, use_cache, session_names))),
+        'sac':pool.apply_async(run_captured, (parse_saccade_files, (files_sac, use_cache, session_names)))}
+    pool.close()    # no further jobs
+
+    return pool, parse_jobs
+
+
+###
+#
+###
+
+
+def get_failure_rate_key(coordinates, functioning_side):
+    """
+    function for computing the key of a failure rate estimation in the failure rate memo
+    -> the key covers all inputs of extract_failure_rate(), i.e. the fixation coordinates, the functioning side,
+        the method of the density estimate, and the declarations of the extended gaze patterns counted in the estimate,
+        as well as FAILURE_RATE_MEMO_VERSION
+
+    input:
+        coordinates (ndarray), fixation x- and y-coordinate for each fixation
+        functioning_side (str), 'R' or 'L'
+
+    output: memo_key (str), hexadecimal SHA-1 hash of inputs
+    """
+
+    coordinates = np.ascontiguousarray(coordinates, dtype=float)
+    sha1 = hashlib.sha1()
+    sha1.update(repr((FAILURE_RATE_MEMO_VERSION, coordinates.shape, functioning_side, KDE_METHOD, PEAK_TOLERANCE,
+        PATTERNS_EX['names'], PATTERNS_EX['patterns'])))
+    sha1.update(coordinates.tobytes())
+    memo_key = sha1.hexdigest()
+
+    return memo_key
+
+
+###
+#
+###
+
+
+def load_failure_rate_memo(memo_key):
+    """
+    function for loading the results of a failure rate estimation from the failure rate memo
+    -> the modification time of a loaded entry is updated, so that the least recently used entries are evicted first
+
+    input: memo_key (str), key of estimation returned by get_failure_rate_key()
+
+    output: results (tuple), (trigger_failure_rate, fixation_trajectory_est, N_patterns_ex_est)
+        as returned by extract_failure_rate(), None if no valid memo entry exists
+    """
+
+    memo_file = memo_folder+memo_key+'.npz'
+    if not os.path.exists(memo_file):
+        return None
+
+    try:
+        memo_data = np.load(memo_file)
+        try:
+            results = (float(memo_data['failure_rate']), memo_data['fixation_trajectory_est'],
+                memo_data['N_patterns_ex_est'])
+        finally:
+            memo_data.close()
+        os.utime(memo_file, None)
+    except (IOError, OSError, ValueError, KeyError, zipfile.BadZipfile):
+        return None     # broken memo entry is rebuilt
+
+    return results
+
+
+###
+#
+###
+
+
+def store_failure_rate_memo(memo_key, results):
+    """
+    function for storing the results of a failure rate estimation in the failure rate memo
+
+    input:
+        memo_key (str), key of estimation returned by get_failure_rate_key()
+        results (tuple), (trigger_failure_rate, fixation_trajectory_est, N_patterns_ex_est)
+            as returned by extract_failure_rate()
+    """
+
+    failure_rate, fixation_trajectory_est, N_patterns_ex_est = results
+    try:
+        if not os.path.exists(memo_folder):
+            os.makedirs(memo_folder)
+        temp_file = memo_folder+memo_key+'.{}.tmp'.format(os.getpid())
+        outputfile = open(temp_file, 'wb')
+        np.savez(outputfile, failure_rate=failure_rate, fixation_trajectory_est=fixation_trajectory_est,
+            N_patterns_ex_est=N_patterns_ex_est)
+        outputfile.close()
+        if os.path.exists(memo_folder+memo_key+'.npz'):
+            os.remove(memo_folder+memo_key+'.npz')
+        os.rename(temp_file, memo_folder+memo_key+'.npz')
+    except (IOError, OSError):
+        print '\nWarning: could not store failure rate memo entry of {}.'.format(memo_key)
 
-            try:        # check whether the number of triggers of current session was stored before
-                total_time = dic_total[current_name]['total_time']
-                mean_trigger_freq = 1000.0 * N_triggers / total_time    # mean trigger frequency
-            except KeyError:
-                mean_trigger_freq = -42     # some dummy value
-    
-            trigger_times = np.array(trigger_times, dtype=int)
-            trigger_times_real = np.array(trigger_times_real, dtype=int)
-            inter_trigger_intervals = np.array(inter_trigger_intervals, dtype=int)
-            dic_total = set_key_key_value(dic_total, current_name, 'inter_trigger_intervals', inter_trigger_intervals)
-#            print 'trigger times: {}'.format(trigger_times)
-            dic_total = set_key_key_value(dic_total, current_name, 'trigger_times', trigger_times)
-#            print 'trigger times real: {}'.format(trigger_times_real)
-            dic_total = set_key_key_value(dic_total, current_name, 'trigger_times_real', trigger_times_real)
-            dic_total = set_key_key_value(dic_total, current_name, 'N_triggers', len(trigger_times))
-            dic_total = set_key_key_value(dic_total, current_name, 'mean_trigger_freq', mean_trigger_freq)
-        
-    return dic_total, error_in_loop
+    return
 
 
 ###
@@ -1935,636 +3820,414 @@ def process_message_files(files_msg, dic_total):
 ###
 
 
-def process_fixation_files(files_fix, dic_total, dt_cutoff, overview_dic):
+def evict_failure_rate_memo():
     """
-    function for extracting and processing data from fixation report files
+    function for deleting the least recently used entries of the failure rate memo
+        until its size does not exceed FAILURE_RATE_MEMO_SIZE
+    """
+
+    if not os.path.exists(memo_folder):
+        return
+
+    memo_entries = []
+    for memo_file in os.listdir(memo_folder):
+        if memo_file[-4:] == '.npz':
+            memo_stat = os.stat(memo_folder+memo_file)
+            memo_entries.append((memo_stat.st_mtime, memo_stat.st_size, memo_file))
+    memo_entries.sort()     # least recently used entries first
+
+    memo_size = sum([memo_entry[1] for memo_entry in memo_entries])
+    for mtime, size, memo_file in memo_entries:
+        if memo_size <= FAILURE_RATE_MEMO_SIZE:
+            break
+        try:
+            os.remove(memo_folder+memo_file)
+        except OSError:
+            continue
+        memo_size -= size
+
+    return
+
+
+###
+#
+###
+
+
+def clear_failure_rate_memo():
+    """
+    function for deleting all entries of the failure rate memo
+    """
+
+    if os.path.exists(memo_folder):
+        for memo_file in os.listdir(memo_folder):
+            if memo_file[-4:] in ['.npz', '.tmp']:
+                os.remove(memo_folder+memo_file)
+    print 'Failure rate memo cleared.'
+
+    return
+
+
+###
+#
+###
+
+
+def init_failure_rate_jobs(N_processes, use_memo=True):
+    """
+    function for initializing the state of the failure rate estimation
+    -> the failure rate of each session is estimated in a separate process as soon as its fixations are processed,
+        so the estimation runs concurrently to the rest of the extraction
+    -> with use_memo, results of previous estimations with the same inputs are taken from the failure rate memo
 
     input:
-        files_fix (list): list of fixation report files found in reports folder
-        dic_total (dictionary): total dictionary which stores all data
-            -> contains a subdictionary with all data for each experiment session
+        N_processes (int), maximal number of concurrently running estimation processes
+        use_memo (bool), True if failure rate memo is used
+
+    output: failure_rate_jobs (dictionary), dictionary containing
+        - N_processes: maximal number of concurrently running estimation processes
+        - use_memo: True if failure rate memo is used
+        - memo_keys: memo key of each session which is not found in the failure rate memo
+        - names: names of all submitted sessions in the order of submission
+        - queue: (session name, coordinates, functioning side) of each session waiting for a process
+        - running: (session name, process, connection, start time) of each running process
+        - results: (results of extract_failure_rate(), printed text) of each finished session,
+            None if estimation failed or exceeded the time budget
+        - timed_out: names of sessions whose estimation exceeded the time budget
+    """
 
-    output:
-        dic_total (dictionary): updated total dictionary
-        error_in_loop (bool): indicates whether an error was encountered during function execution
+    failure_rate_jobs = {'N_processes':max(N_processes, 1), 'use_memo':use_memo, 'memo_keys':{}, 'names':[], 'queue':[],
+        'running':[], 'results':{}, 'timed_out':set()}
+
+    return failure_rate_jobs
+
+
+###
+#
+###
+
+
+def run_failure_rate_job(connection, worker_args, coordinates, functioning_side, subject_name):
     """
+    function for estimating the failure rate of one session in a separate process
+    -> results and printed text of extract_failure_rate() are sent back to the main script through connection
 
-    print 'Processing fixations.'
-    error_in_loop = False       # indicates something went wrong in one of the following loops
-    for report_fix in files_fix:    # loop over fixation files
-      if not error_in_loop:     # only continue if no errors encountered
-        print 'Extracting data from', report_fix
+    input:
+        connection (multiprocessing.Connection), sending end of pipe to main script
+        worker_args (tuple), arguments of init_worker()
+        coordinates (ndarray), fixation x- and y-coordinate for each fixation
+        functioning_side (str), 'R' or 'L'
+        subject_name (str), name of session
+    """
 
-        inputfile = open(reports_folder+report_fix, 'r')
-        inputdata = inputfile.read()    # load fixation report as text file
-        inputfile.close()
+    init_worker(*worker_args)
+    connection.send(run_captured(extract_failure_rate, (coordinates, functioning_side, subject_name)))
+    connection.close()
 
-        lines = inputdata.split('\n')[1:-1]
-#        lines = inputdata.split(linebreak)[1:-1]
-            # lines is a list of all rows containing data
-            # -> first row contains descriptions, last row is empty
-        N_lines = len(lines)
+    return
 
-        print 'Processing fixation times.'
 
-        current_label = lines[0].split('\t')[0]
-            # all report files are basically tab-separated text files
-            # -> splitting each line by \t yields a list of the different data
-            # -> first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
-            #       where X is subject number and y is session number
-        if 'vp' in current_label:
-            current_name = current_label[2:]
-        else:
-            current_name = current_label
-       
-        current_min = 0
-        fixation_trajectory_min = []
-        pattern_ex_min = []
-        gaze_event_trajectory_min = []
-
-        t_correct = 0
-        cutoff_data = []
-        previous_end_time = 10000
-
-            # get empty lists and initialized parameters for data processing
-        (all_times, all_durations, R_times, R_durations, L_times, L_durations, im_times, im_durations, white_times,
-            white_durations, R_pattern_im_times, L_pattern_im_times, R_pattern_ex_times, L_pattern_ex_times, LR_pattern_ex_times,
-            gaze_pattern_ex_time_temp, gaze_pattern_ex_loc_temp, all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times,
-            R_gaze_events_durations, L_gaze_events_times, L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations,
-            white_gaze_events_times, white_gaze_events_durations, fixation_trajectory, gaze_event_trajectory,
-            fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs,
-            coordinates) = initialize_fixation_data()
-
-        for i_line in tqdm(xrange(N_lines)):   # loop over fixations
-
-            line = lines[i_line].split('\t')    
-                # yields list [session label, fixation start time, current interest area, previous interest area, 
-                #               next interest area, fixation duration]
-            #print 'i_line:', i_line, '\nline:', line
-            try:
-                label = line[0]
-                time = line[1]
-                duration = line[5]
-                IA_current = line[2]        # interest area of current fixation
-                IA_previous = line[3]       # interest area of previous fixation
-                IA_next = line[4]           # interest area of next fixation
-                x_coord_str = convert_number(line[6])
-                y_coord_str = convert_number(line[7])
-            except IndexError:
-                print 'Error: could not load fixation file!\nMake sure the file format is right.'
-                error_in_loop = True
-                break
+###
+#
+###
 
-            try:        # check whether time is a numerical value
-                time = int(time)
-            except ValueError:
-                print 'Error: time {} not recognized as number! (file {}, line {})'.format(time, report_fix, i_line)
-                error_in_loop = True
-                break
 
-            try:        # check whether duration is a numerical value
-                duration = int(duration)
-            except ValueError:
-                print 'Error: duration {} not recognized as a number! (file {}, line {})'.format(duration, report_fix, i_line)
-                error_in_loop = True
-                break
+def update_failure_rate_jobs(failure_rate_jobs):
+    """
+    function for collecting finished failure rate estimations, stopping estimations which exceeded their time budget,
+        and starting queued estimations
+    -> the time budget FAILURE_RATE_TIMEOUT of a session starts when its process is started
 
+    input: failure_rate_jobs (dictionary), state of failure rate estimation returned by init_failure_rate_jobs()
+    """
+
+    running = []
+    for current_name, process, connection, start_time in failure_rate_jobs['running']:
+        if connection.poll():       # results sent or process ended
             try:
-                x_coord = float(x_coord_str)
-            except ValueError:
-                print 'Error: x coordinate {} not recognized as a number! (file {}, line {})'.format(x_coord_str, report_fix, i_line)
-                error_in_loop = True
-                break
-            try:
-                y_coord = float(y_coord_str)
-            except ValueError:
-                print 'Error: y coordinate {} not recognized as a number! (file {}, line {})'.format(y_coord_str, report_fix, i_line)
-                error_in_loop = True
-                break
+                failure_rate_jobs['results'][current_name] = connection.recv()
+            except EOFError:        # process ended without sending results
+                failure_rate_jobs['results'][current_name] = None
+            connection.close()
+            process.join()
+        elif time.time() - start_time > FAILURE_RATE_TIMEOUT:
+            process.terminate()
+            process.join()
+            connection.close()
+            failure_rate_jobs['results'][current_name] = None
+            failure_rate_jobs['timed_out'].add(current_name)
+        else:
+            running.append((current_name, process, connection, start_time))
+
+    worker_args = (FAILURE_RATE, KDE_METHOD, PEAK_TOLERANCE, VALIDATE_PEAKS, EPOCH_SCHEMES, reports_folder, cache_folder)
+    while len(running) < failure_rate_jobs['N_processes'] and len(failure_rate_jobs['queue']) > 0:
+        current_name, coordinates, functioning_side = failure_rate_jobs['queue'].pop(0)
+        connection, child_connection = multiprocessing.Pipe(False)
+        process = multiprocessing.Process(target=run_failure_rate_job,
+            args=(child_connection, worker_args, coordinates, functioning_side, current_name))
+        process.daemon = True       # process is stopped if main script exits
+        process.start()
+        child_connection.close()    # only the process may keep the sending end open, so that its end is noticed
+        running.append((current_name, process, connection, time.time()))
+    failure_rate_jobs['running'] = running
 
-            if current_label != label:      # triggered whenever line contains data of a new session
-
-                gaze_duration = previous_fix_start + previous_fix_duration - all_gaze_events_times[-1]
-                    # gaze duration is end of last fixation in current area minus start of first fixation in that area
-                    # -> takes into account saccades in between these fixations                
-                all_gaze_events_durations.append(gaze_duration)
-                if 'R' in previous_IA:           # right disc gaze event
-                    R_gaze_events_durations.append(gaze_duration) 
-                elif 'L' in previous_IA:         # left disc gaze event
-                    L_gaze_events_durations.append(gaze_duration)
-                elif 'image' in previous_IA:     # image gaze event
-                    im_gaze_events_durations.append(gaze_duration)
-                else:                           # background gaze event
-                    white_gaze_events_durations.append(gaze_duration)
-
-                # process full gaze patterns
-    
-                N_gaze = len(gaze_event_trajectory)
-                N_full_gaze_pattern_R = 0
-                N_full_gaze_pattern_L = 0
-                for i in xrange(N_gaze-2):
-                    current_gaze_area = gaze_event_trajectory[i]
-                    area_after_next_gaze_area = gaze_event_trajectory[i+2]
-                    if current_gaze_area == 'image' and area_after_next_gaze_area == 'image':
-                        area_in_between = gaze_event_trajectory[i+1]
-                        if area_in_between == 'right':
-                            N_full_gaze_pattern_R += 1
-                        elif area_in_between == 'left':
-                            N_full_gaze_pattern_L += 1
-
-#                print 'storing fixation_trajectory_epochs:', fixation_trajectory_epochs
-
-                dic_total = set_key_key_value(dic_total, current_name, 'dt_cutoff', dt_cutoff)
-                dic_total, error = wrap_up(dic_total, current_name, R_times, L_times, im_times, 
-                    white_times, all_times, L_pattern_im_times, R_pattern_im_times, L_pattern_ex_times, R_pattern_ex_times,
-                    LR_pattern_ex_times,
-                    all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times, R_gaze_events_durations, 
-                    L_gaze_events_times, L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, 
-                    white_gaze_events_times, white_gaze_events_durations, all_durations, R_durations, L_durations, im_durations,
-                    white_durations, fixation_trajectory, gaze_event_trajectory, N_full_gaze_pattern_R, N_full_gaze_pattern_L,
-                    fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs, cutoff_data, overview_dic,
-                    coordinates)
-                if error:
-                    error_in_loop = True
-                    break
+    return
 
-                    # call function wrap_up() to process fixation data and store in dic_total
-
-                    # reinitialize containers
-                (all_times, all_durations, R_times, R_durations, L_times, L_durations, im_times, im_durations, white_times,
-                    white_durations, R_pattern_im_times, L_pattern_im_times, R_pattern_ex_times, L_pattern_ex_times,
-                    LR_pattern_ex_times,
-                    gaze_pattern_ex_time_temp, gaze_pattern_ex_loc_temp, all_gaze_events_times, 
-                    all_gaze_events_durations, R_gaze_events_times, R_gaze_events_durations, L_gaze_events_times, 
-                    L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, white_gaze_events_times, 
-                    white_gaze_events_durations, fixation_trajectory, gaze_event_trajectory,
-                    fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs,
-                    coordinates) = initialize_fixation_data()
-
-                current_min = 0
-                fixation_trajectory_min = []
-                pattern_ex_min = []
-                gaze_event_trajectory_min = []
-
-                t_correct = 0
-                cutoff_data = []
-                previous_end_time = 10000
-                # end of current_label != label clause
-
-
-            # process coordinates
-            coordinates[0].append(x_coord)
-            coordinates[1].append(y_coord)
-
-            # process saccade duration filter
-            dt = time - previous_end_time
-            if dt > dt_cutoff:
-                t_correct += dt - 10    # shorten saccade duration to 10 ms
-                cutoff_data.append([previous_end_time, time, t_correct])
-            previous_end_time = time + duration
-            time -= t_correct
-
-            # process epoch data
-            i_min = time // 60000   # minute index
-#            print 'i_min:', i_min
-            if i_min != current_min:    # minute completed
-#                print 'minute completed.'
-                fixation_trajectory_epochs.append(fixation_trajectory_min)
-                pattern_ex_epochs.append(pattern_ex_min)
-                gaze_event_trajectory_epochs.append(gaze_event_trajectory_min)
-#                print 'fixation_trajectory_epochs:', fixation_trajectory_epochs
-            
-                fixation_trajectory_min = []
-                pattern_ex_min = []
-                gaze_event_trajectory_min = []
-                current_min = i_min
-
-            current_label = line[0]     # get new session label
-            if 'vp' in current_label:
-                current_name = current_label[2:]
-            else:
-                current_name = current_label
-
-                # process fixations
-            all_times.append(time)
-            all_durations.append(duration)
-            if 'R' in IA_current:       # look at current fixation interest area for appending to fixation times list
-                R_times.append(time)
-                R_durations.append(duration)
-                fixation_trajectory.append('right')
-                fixation_trajectory_min.append('right')
-            elif 'L' in IA_current:
-                L_times.append(time)
-                L_durations.append(duration)
-                fixation_trajectory.append('left')
-                fixation_trajectory_min.append('left')
-            elif 'image' in IA_current:
-                im_times.append(time)
-                im_durations.append(duration)
-                fixation_trajectory.append('image')
-                fixation_trajectory_min.append('image')
+
+###
+#
+###
+
+
+def submit_failure_rate_job(failure_rate_jobs, current_name, coordinates, functioning_side):
+    """
+    function for queuing the failure rate estimation of one session
+
+    input:
+        failure_rate_jobs (dictionary), state of failure rate estimation returned by init_failure_rate_jobs()
+        current_name (str), name of session
+        coordinates (ndarray), fixation x- and y-coordinate for each fixation
+        functioning_side (str), 'R' or 'L'
+    """
+
+    failure_rate_jobs['names'].append(current_name)
+    if failure_rate_jobs['use_memo']:
+        memo_key = get_failure_rate_key(coordinates, functioning_side)
+        results = load_failure_rate_memo(memo_key)
+        if results is not None:     # inputs unchanged since a previous estimation
+            failure_rate_jobs['results'][current_name] = (results, '')
+            return
+        failure_rate_jobs['memo_keys'][current_name] = memo_key
+    failure_rate_jobs['queue'].append((current_name, coordinates, functioning_side))
+    update_failure_rate_jobs(failure_rate_jobs)
+
+    return
+
+
+###
+#
+###
+
+
+def join_failure_rates(failure_rate_jobs, dic_total):
+    """
+    function for waiting for all failure rate estimations and storing their results in total dictionary
+    -> sessions whose estimation failed or exceeded the time budget keep failure rate 5
+        and the scalars of the interest areas as recorded by the eye tracker
+
+    input:
+        failure_rate_jobs (dictionary), state of failure rate estimation returned by init_failure_rate_jobs()
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+
+    output:
+        dic_total (dictionary), updated total dictionary
+        failed_sessions (list), names of sessions without estimated failure rate
+    """
+
+    while len(failure_rate_jobs['queue']) > 0 or len(failure_rate_jobs['running']) > 0:
+        update_failure_rate_jobs(failure_rate_jobs)
+        if len(failure_rate_jobs['running']) > 0:
+            time.sleep(0.01)
+
+    failed_sessions = []
+    for current_name in failure_rate_jobs['names']:
+        if failure_rate_jobs['results'][current_name] is None:
+            if current_name in failure_rate_jobs['timed_out']:
+                print '\nWarning: failure rate estimation of session {} exceeded time budget of {} s!'.format(
+                    current_name, FAILURE_RATE_TIMEOUT)
             else:
-                white_times.append(time)
-                white_durations.append(duration)
-                fixation_trajectory.append('background')
-                fixation_trajectory_min.append('background')
-
-                # process immediate gaze patterns
-            if ('image' in IA_previous) and ('image' in IA_next):
-                # fixation sequence "image -> X -> image" might be immediate fixation pattern
-                if 'R' in IA_current:   # right immediate fixation pattern "image -> right disc -> image"
-                    R_pattern_im_times.append(time)
-                elif 'L' in IA_current: # left immediate fixation pattern "image -> left disc -> image"
-                    L_pattern_im_times.append(time)
-
-                # process extended gaze patterns
-            #print '\ntime:', time
-            #print 'IA_current:', IA_current
-            
-            if 'image' in IA_current:   # if image is fixated, it can start or finish an extended pattern
-              if len(gaze_pattern_ex_loc_temp) > 0:
-                if 'image' in gaze_pattern_ex_loc_temp[0]:      
-                    # disregards the beginning of the session when the image hasn't been fixated yet
-                    if ((('R' in gaze_pattern_ex_loc_temp) or ('R ' in gaze_pattern_ex_loc_temp)) and not (('L' in gaze_pattern_ex_loc_temp) or ('L ' in gaze_pattern_ex_loc_temp))):   
-                            # requirement for R pattern
-                        #print 'R pattern detected.'
-                        R_pattern_ex_times.append(gaze_pattern_ex_time_temp)
-                        pattern_ex_min.append('R')
-                    elif ((('L' in gaze_pattern_ex_loc_temp) or ('L ' in gaze_pattern_ex_loc_temp)) and not (('R ' in gaze_pattern_ex_loc_temp) or ('R' in gaze_pattern_ex_loc_temp))): 
-                        # requirement for L pattern
-                        #print 'L pattern detected.'
-                        L_pattern_ex_times.append(gaze_pattern_ex_time_temp)
-                        pattern_ex_min.append('L')
-                    elif ((('L' in gaze_pattern_ex_loc_temp) or ('L ' in gaze_pattern_ex_loc_temp)) and (('R' in gaze_pattern_ex_loc_temp) or ('R ' in gaze_pattern_ex_loc_temp))):
-                        LR_pattern_ex_times.append(gaze_pattern_ex_time_temp)
-                        pattern_ex_min.append('LR')
-                gaze_pattern_ex_loc_temp = []       # reset the areas fixated since last image fixation
-                gaze_pattern_ex_time_temp = time    # potential start time of next extended pattern
-            gaze_pattern_ex_loc_temp.append(IA_current)     # update the list of fixated areas
-            #print 'gaze_pattern_ex_loc_temp:', gaze_pattern_ex_loc_temp
-
-                # process gaze events
-            if len(all_gaze_events_times) == 0:     # the first gaze event starts with the first fixation
-                all_gaze_events_times.append(time)
-                if 'R' in IA_current:           # right disc gaze event
-                    R_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('right')
-                    gaze_event_trajectory_min.append('right')
-                elif 'L' in IA_current:         # left disc gaze event
-                    L_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('left')
-                    gaze_event_trajectory_min.append('left')
-                elif 'image' in IA_current:     # image gaze event
-                    im_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('image')
-                    gaze_event_trajectory_min.append('image')
-                else:                           # background gaze event
-                    white_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('background')
-                    gaze_event_trajectory_min.append('background')
-            elif IA_previous != IA_current:     # gaze events are defined by successive fixations of the same interest area
-                                                # -> new gaze event starts whenever the fixated area changes
-                gaze_duration = previous_fix_start + previous_fix_duration - all_gaze_events_times[-1]
-                    # gaze duration is end of last fixation in current area minus start of first fixation in that area
-                    # -> takes into account saccades in between these fixations                
-                all_gaze_events_durations.append(gaze_duration)
-                all_gaze_events_times.append(time)
-                if 'R' in IA_current:           # right disc gaze event
-                    R_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('right')
-                    gaze_event_trajectory_min.append('right')
-                elif 'L' in IA_current:         # left disc gaze event
-                    L_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('left')
-                    gaze_event_trajectory_min.append('left')
-                elif 'image' in IA_current:     # image gaze event
-                    im_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('image')
-                    gaze_event_trajectory_min.append('image')
-                else:                           # background gaze event
-                    white_gaze_events_times.append(time)
-                    gaze_event_trajectory.append('background')
-                    gaze_event_trajectory_min.append('background')
-
-                if 'R' in IA_previous:           # right disc gaze event
-                    R_gaze_events_durations.append(gaze_duration) 
-                elif 'L' in IA_previous:         # left disc gaze event
-                    L_gaze_events_durations.append(gaze_duration)
-                elif 'image' in IA_previous:     # image gaze event
-                    im_gaze_events_durations.append(gaze_duration)
-                else:                           # background gaze event
-                    white_gaze_events_durations.append(gaze_duration)
-
-            previous_fix_start = time           # store fixation start times and durations
-            previous_fix_duration = duration    # -> needed for gaze duration evaluation in case gaze event ends after current fixation
-            previous_IA = IA_current
-            # end of fixation loop
-
-
-        if len(files_fix) > 0:      
-            # if the previous fixation loop was executed at least once, we have to store the data of the last processed session
-
-            gaze_duration = previous_fix_start + previous_fix_duration - all_gaze_events_times[-1]
-                # gaze duration is end of last fixation in current area minus start of first fixation in that area
-                # -> takes into account saccades in between these fixations                
-            all_gaze_events_durations.append(gaze_duration)
-            if 'R' in IA_previous:           # right disc gaze event
-                R_gaze_events_durations.append(gaze_duration) 
-            elif 'L' in IA_previous:         # left disc gaze event
-                L_gaze_events_durations.append(gaze_duration)
-            elif 'image' in IA_previous:     # image gaze event
-                im_gaze_events_durations.append(gaze_duration)
-            else:                           # background gaze event
-                white_gaze_events_durations.append(gaze_duration)
-
-            # process full gaze patterns    
-            N_gaze = len(gaze_event_trajectory)
-            N_full_gaze_pattern_R = 0
-            N_full_gaze_pattern_L = 0
-            for i in xrange(N_gaze-2):
-                current_gaze_area = gaze_event_trajectory[i]
-                area_after_next_gaze_area = gaze_event_trajectory[i+2]
-                if current_gaze_area == 'image' and area_after_next_gaze_area == 'image':
-                    area_in_between = gaze_event_trajectory[i+1]
-                    if area_in_between == 'right':
-                        N_full_gaze_pattern_R += 1
-                    elif area_in_between == 'left':
-                        N_full_gaze_pattern_L += 1
-
-            dic_total = set_key_key_value(dic_total, current_name, 'dt_cutoff', dt_cutoff)
-            dic_total, error = wrap_up(dic_total, current_name, R_times, L_times, im_times, 
-                white_times, all_times, L_pattern_im_times, R_pattern_im_times, L_pattern_ex_times, R_pattern_ex_times, 
-                LR_pattern_ex_times,
-                all_gaze_events_times, all_gaze_events_durations, R_gaze_events_times, R_gaze_events_durations, L_gaze_events_times, 
-                L_gaze_events_durations, im_gaze_events_times, im_gaze_events_durations, white_gaze_events_times, 
-                white_gaze_events_durations, all_durations, R_durations, L_durations, im_durations, white_durations,
-                fixation_trajectory, gaze_event_trajectory, N_full_gaze_pattern_R, N_full_gaze_pattern_L,
-                fixation_trajectory_epochs, pattern_ex_epochs, gaze_event_trajectory_epochs, cutoff_data, overview_dic, coordinates)
-                    # call function wrap_up() to process fixation data and store in dic_total
-            if error:
-                error_in_loop = True
-                break
+                print '\nWarning: failure rate estimation of session {} failed!'.format(current_name)
+            print 'Failure rate of session {} set to 5.'.format(current_name)
+            failed_sessions.append(current_name)
+            continue
 
-    return dic_total, error_in_loop
+        result, output = failure_rate_jobs['results'][current_name]
+        if current_name in failure_rate_jobs['memo_keys']:
+            store_failure_rate_memo(failure_rate_jobs['memo_keys'][current_name], result)
+        sys.stdout.write(output)
+    if failure_rate_jobs['use_memo']:
+        evict_failure_rate_memo()
+    dic_total = store_failure_rates(failure_rate_jobs, dic_total)
 
+    return dic_total, failed_sessions
 
-##
+
+###
 #
-##
+###
 
 
-def process_saccade_files(files_sac, dic_total):
+def store_failure_rates(failure_rate_jobs, dic_total):
     """
-    function for extracting and processing data from message report files
+    function for storing the results of the finished failure rate estimations in total dictionary
+    -> the failure rate does not depend on the cutoff value, so in a sweep over cutoff values it is estimated once
+        and stored in the total dictionary of each cutoff value
 
     input:
-        files_msg (list): list of message report files found in reports folder
-        dic_total (dictionary): total dictionary which stores all data
-            -> contains a subdictionary with all data for each experiment session
+        failure_rate_jobs (dictionary), state of failure rate estimation after join_failure_rates()
+        dic_total (dictionary), total dictionary containing data of each experiment in subdictionaries
+
+    output: dic_total (dictionary), updated total dictionary
+    """
+
+    for current_name in failure_rate_jobs['names']:
+        if failure_rate_jobs['results'][current_name] is None:
+            continue
+        (failure_rate, fixation_trajectory_est, N_patterns_ex_est), output = failure_rate_jobs['results'][current_name]
+        dic_est = get_estimated_scalars(np.bincount(fixation_trajectory_est, minlength=len(AOI_NAMES)),
+            N_patterns_ex_est, dic_total[current_name]['total_time'])
+            # estimated rates depend on the session duration after the saccade filter
+        dic_total[current_name]['failure_rate'] = failure_rate
+        dic_total[current_name].update(dic_est)
+
+    return dic_total
+
+
+###
+#
+###
+
+
+def get_session_name(label):
+    """
+    function for getting the session name from the session label of a report row
+
+    input: label (str), session label in the format vpX.y or X.y, where X is subject number and y is session number
+
+    output: session_name (str), session name in the format X.y
+    """
+
+    if 'vp' in label:
+        session_name = label[2:]
+    else:
+        session_name = label
+
+    return session_name
+
+
+###
+#
+###
+
+
+def get_session_fingerprints(files, overview_dic):
+    """
+    function for computing a fingerprint of the inputs of each experiment session
+    -> the fingerprint covers the report rows of the session in all report files, its experiment parameters
+        from the overview files, the extraction parameters, and the script itself
+
+    input:
+        files (list), list of all report files found in reports folder
+        overview_dic (dictionary), subject data extracted from overview files
 
     output:
-        dic_total (dictionary): updated total dictionary
-        error_in_loop (bool): indicates whether an error was encountered during function execution
+        fingerprints (dictionary), for each cutoff value a dictionary of the SHA-1 fingerprint (str) of each session name
+        report_sessions (dictionary), set of session names for each report file
     """
 
-    print 'Processing messages.'
-    error_in_loop = False   # indicates something went wrong in one of the following loops
+    session_hashes = {}
+    report_sessions = {}
+    for report in files:    # loop over report files
+        report_sessions[report] = set()
+        session_index = load_report_index(report)
+        if len(session_index) == 0:
+            continue
+        inputfile = open(reports_folder+report, 'rb')
+        report_map = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+        inputfile.close()
+        for label, session_start, session_end, i_first_line in session_index:
+            session_name = get_session_name(label)
+            report_sessions[report].add(session_name)
+            if session_name not in session_hashes:
+                session_hashes[session_name] = hashlib.sha1()
+            session_hashes[session_name].update(report)
+            session_hashes[session_name].update(report_map[session_start:session_end])
+        report_map.close()
+
+    script_hashes = (get_file_hash(os.path.realpath(__file__)),
+        get_file_hash(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'gaze_patterns.py')),
+        get_file_hash(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'event_joins.py')))
+    fingerprints = dict((cutoff_value, {}) for cutoff_value in DT_CUTOFFS)
+    for session_name in session_hashes:
+        (params_dic, error), output = run_captured(get_parameters, (session_name, overview_dic))
+            # messages of get_parameters() are printed when the session is processed
+        if params_dic is not None:
+            params_dic = sorted(params_dic.items())
+        session_hashes[session_name].update(repr(params_dic))
+        for cutoff_value in DT_CUTOFFS:     # report rows are hashed once for all cutoff values
+            session_hash = session_hashes[session_name].copy()
+            session_hash.update(repr((cutoff_value, FAILURE_RATE, KDE_METHOD, PEAK_TOLERANCE, EPOCH_SCHEMES,
+                PERI_TRIGGER_EDGES.tolist()) + script_hashes))
+            fingerprints[cutoff_value][session_name] = session_hash.hexdigest()
+
+    return fingerprints, report_sessions
 
-    for report_sac in files_sac:    # loop over message reports
-        if not error_in_loop:
-            print 'Extracting data from', report_sac
 
-            inputfile_sac = open(reports_folder+report_sac, 'r')
-            inputdata_sac = inputfile_sac.read()    # load message report as text file
-            inputfile_sac.close()
+###
+#
+###
 
-            lines_sac = inputdata_sac.split('\n')[1:-1]   
-#            lines_sac = inputdata_sac.split(linebreak)[1:-1]  
-                # lines_msg is a list of all rows containing data
-                # -> first row contains descriptions, last row is empty
-    
-            current_label = lines_sac[0].split('\t')[0]
-                # all report files are basically tab-separated text files
-                # -> splitting each line by \t yields a list of the different data
-                # -> first item is "RECORDING_SESSION_LABEL" and contains the session name in the format vpX.y or X.y
-                #       where X is subject number and y is session number
-            if 'vp' in current_label:
-                current_name = current_label[2:]    # get session label in the form X.y
-            else:
-                current_name = current_label
 
-            # saccade filter time transformation
-            try:
-                current_dic = dic_total[current_name]
-                cutoff_data = current_dic['cutoff_data']
-            except KeyError:
-                cutoff_data = [[]]
-            cutoff_data = [[0,0,0]] + cutoff_data
-            N_cutoffs = len(cutoff_data)
-            i_cutoff = 0
-            cutoff_start = cutoff_data[0][0]
-            cutoff_end = cutoff_data[0][1]
-            t_correct = cutoff_data[0][2]
-
-            sac_times = []      # this will contain all trigger times of one session
-            durations = []
-            amplitudes = []
-            angles = []
-            velocities_avg = []
-            velocities_peak = []
-            blinks = []
-            N_blinks = 0
-
-            for i_line in tqdm(xrange(len(lines_sac))):   # loop over messages
-
-                line = lines_sac[i_line].split('\t')    # yields list [session label, time, message text]
-                try:
-                    label = line[0]
-                    time = line[1]
-                    start_IA = line[2]
-                    end_IA = line[3]
-                    duration = line[4]
-                    amplitude = convert_number(line[5])
-                    angle = convert_number(line[6])
-                    velocity_avg = convert_number(line[7])
-                    velocity_peak = convert_number(line[8])
-                    contains_blink = line[9]
-                except IndexError:
-                    print 'Error: could not load saccade file!\nMake sure file format is right.'
-                    error_in_loop = True
-                    break
-                try:        # check whether time is a numerical value
-                    time = int(time)
-                except ValueError:
-                    print 'Error: time {} not recognized as number! (file {}, line {})'.format(time, report_sac, i_line)
-                    error_in_loop = True
-                    break   
-                try:        # check whether time is a numerical value
-                    duration = int(duration)
-                except ValueError:
-                    print 'Error: duration {} not recognized as number! (file {}, line {})'.format(duration, report_sac, i_line)
-                    error_in_loop = True
-                    break 
-                try:        # check whether time is a numerical value
-                    amplitude = float(amplitude)
-                except ValueError:
-                    if amplitude == '.':
-                        amplitude = 0.0
-                    else:
-                        print 'Error: amplitude {} not recognized as number! (file {}, line {})'.format(amplitude, report_sac, i_line)
-                        print 'line: {}'.format(line)
-                        error_in_loop = True
-                        break 
-                try:        # check whether time is a numerical value
-                    angle = float(angle)
-                except ValueError:
-                    if angle == '.':
-                        angle = 0.0
-                    else:
-                        print 'Error: angle {} not recognized as number! (file {}, line {})'.format(angle, report_sac, i_line)
-                        error_in_loop = True
-                        break 
-                try:        # check whether time is a numerical value
-                    velocity_avg = float(velocity_avg)
-                except ValueError:
-                    if velocity_avg == '.':
-                        velocity_avg = 0.0
-                    else:
-                        print 'Error: average velocity {} not recognized as number! (file {}, line {})'.format(velocity_avg, report_sac, i_line)
-                        error_in_loop = True
-                        break 
-                try:        # check whether time is a numerical value
-                    velocity_peak = float(velocity_peak)
-                except ValueError:
-                    if velocity_peak == '.':
-                        velocity_peak = 0.0
-                    else:
-                        print 'Error: peak velocity {} not recognized as number! (file {}, line {})'.format(velocity_peak, report_sac, i_line)
-                        error_in_loop = True
-                        break 
-                if 'true' in contains_blink:
-                    blink = True
-                    N_blinks += 1
-                elif 'false' in contains_blink:
-                    blink = False
-                else:
-                    print 'Error: {} not recognized as boolean! (file {}, line {})'.format(contains_blink, report_sac, i_line)
-                    error_in_loop = True
-                    break
+def load_previous_results(fingerprints, check_up_to_date=True):
+    """
+    function for loading the results of the previous extraction and finding the sessions with changed inputs
+    -> results of a session are reused if its fingerprint is the same as in the manifest of the previous extraction
 
-                # actual time transformation
-                real_time = time        # unfiltered time for plotting
-                if i_cutoff < N_cutoffs-1:
-                    while time > cutoff_end:
-                        if i_cutoff < N_cutoffs-1:
-                            i_cutoff += 1
-                            cutoff_start = cutoff_data[i_cutoff][0]
-                            cutoff_end = cutoff_data[i_cutoff][1]
-                            t_correct = cutoff_data[i_cutoff-1][2]
-                        else:
-                            break
-                    if time > cutoff_start:
-                        time = cutoff_start + 10    # residual saccade after filtering has duration 10 ms                    
-                time -= t_correct
-#                print 'real time: {}\tt_correct: {}\tcorrected time: {}'.format(real_time, t_correct, time)
+    input:
+        fingerprints (dictionary), current fingerprint of each session of one cutoff value,
+            see get_session_fingerprints()
+        check_up_to_date (bool), if False, the stored data are also returned if they are up to date
 
+    output:
+        dic_previous (dictionary), stored data of the sessions which are reused,
+            None if the stored results are up to date
+        changed_sessions (set), names of sessions which must be processed
+    """
 
-                if current_label != label:      # triggered whenever line contains data of a new session
+    dic_previous = {}
+    changed_sessions = set(fingerprints)
 
-                    N_saccades = len(sac_times)
-                    if N_saccades > 0:
-                        blink_ratio = 1.0 * N_blinks / N_saccades
-                    else:
-                        blink_ratio = 0.0
+    try:
+        inputfile = open(manifest_file, 'rb')
+        previous_fingerprints = cPickle.load(inputfile)
+        inputfile.close()
+        if check_up_to_date and previous_fingerprints == fingerprints and os.path.exists(results_file):
+            return None, set()
+        inputfile = open(results_file, 'rb')
+        dic_stored = cPickle.load(inputfile)
+        inputfile.close()
+    except (IOError, EOFError, TypeError, ValueError, AttributeError, ImportError, cPickle.UnpicklingError):
+        print 'No previous results found, processing all sessions.'
+        return dic_previous, changed_sessions
 
-                    try:        # check whether the number of triggers of current session was stored before
-                        total_time = dic_total[current_name]['total_time']
-                        mean_sac_freq = 1000.0 * N_saccades / total_time    # mean trigger frequency
-                    except KeyError:
-                        mean_sac_freq = -42     # some dummy value
-            
-                    sac_times = np.array(sac_times, dtype=int)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_times', sac_times)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_durations', durations)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_amplitudes', amplitudes)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_angles', angles)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_velocities_avg', velocities_avg)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_velocities_peak', velocities_peak)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_blinks', blinks)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_N', N_saccades)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_mean_freq', mean_sac_freq)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_blink_ratio', blink_ratio)
-                    dic_total = set_key_key_value(dic_total, current_name, 'sac_N_blinks', N_blinks)
-
-                    # saccade filter time transformation
-                    try:
-                        current_dic = dic_total[current_name]
-                        cutoff_data = current_dic['cutoff_data']
-                    except KeyError:
-                        cutoff_data = [[]]
-                    cutoff_data = [[0,0,0]] + cutoff_data
-                    N_cutoffs = len(cutoff_data)
-                    i_cutoff = 0
-                    cutoff_start = cutoff_data[0][0]
-                    cutoff_end = cutoff_data[0][1]
-                    t_correct = cutoff_data[0][2]
-    
-                    sac_times = []      # this will contain all trigger times of one session
-                    durations = []
-                    amplitudes = []
-                    angles = []
-                    velocities_avg = []
-                    velocities_peak = []
-                    blinks = []
-                    N_blinks = 0
-    
-                    current_label = line[0]     # get new session label
-                    if 'vp' in current_label:
-                        current_name = current_label[2:]
-                    else:
-                        current_name = current_label
-    
-                sac_times.append(time)
-                durations.append(duration)
-                amplitudes.append(amplitude)
-                angles.append(angle)
-                velocities_avg.append(velocity_avg)
-                velocities_peak.append(velocity_peak)
-                blinks.append(blink)
+    for session_name in fingerprints:
+        if previous_fingerprints.get(session_name) == fingerprints[session_name]:
+            changed_sessions.discard(session_name)
+            if session_name in dic_stored:     # sessions removed by filter_dic() were not stored
+                dic_previous[session_name] = dic_stored[session_name]
+    print 'Processing {} of {} sessions with changed inputs.'.format(len(changed_sessions), len(fingerprints))
 
+    return dic_previous, changed_sessions
 
 
-            # end of message loop
+###
+#
+###
 
-        if len(files_msg) > 0:      
-            # if the previous message loop was executed at least once, we have to store the data of the last processed session
 
-            N_saccades = len(sac_times)
-            if N_saccades > 0:
-                blink_ratio = 1.0 * N_blinks / N_saccades
-            else:
-                blink_ratio = 0.0
+def store_manifest(fingerprints):
+    """
+    function for storing the fingerprint of each session next to the stored results
+    -> used by load_previous_results() in the next incremental extraction
 
-            try:        # check whether the number of triggers of current session was stored before
-                total_time = dic_total[current_name]['total_time']
-                mean_sac_freq = 1000.0 * N_saccades / total_time    # mean trigger frequency
-            except KeyError:
-                mean_sac_freq = -42     # some dummy value
-    
-            sac_times = np.array(sac_times, dtype=int)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_times', sac_times)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_durations', durations)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_amplitudes', amplitudes)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_angles', angles)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_velocities_avg', velocities_avg)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_velocities_peak', velocities_peak)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_blinks', blinks)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_N', N_saccades)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_mean_freq', mean_sac_freq)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_blink_ratio', blink_ratio)
-            dic_total = set_key_key_value(dic_total, current_name, 'sac_N_blinks', N_blinks)
-        
-    return dic_total, error_in_loop
+    input: fingerprints (dictionary), fingerprint of each session returned by get_session_fingerprints()
+    """
+
+    outputfile = open(manifest_file, 'wb')
+    cPickle.dump(fingerprints, outputfile, protocol=cPickle.HIGHEST_PROTOCOL)
+    outputfile.close()
+
+    return
 
 
 
@@ -2579,71 +4242,160 @@ def process_saccade_files(files_sac, dic_total):
 
 
 
-try:
-    while True:     
-        # loop broken if script terminated successfully or error encountered during:
-        #   time extraction of message reports or 
-        #   inter trigger interval extraction of message reports or
-        #   time extraction of fixation reports        
+if __name__ == '__main__':
+    parse_pool = None
+    try:
+        while True:     
+            # loop broken if script terminated successfully or error encountered during:
+            #   time extraction of message reports or 
+            #   inter trigger interval extraction of message reports or
+            #   time extraction of fixation reports        
         
-        get_user_args()
-        linebreak = get_linebreak()     # get linebreak encoding characters in current operating system
-        reports_folder = './reports/'
-        files = os.listdir(reports_folder)  # get all files in reports folder
-        files_fix = []      # this will contain all fixation reports
-        files_msg = []      # this will contain all message reports
-        files_sac = []
-        for file in files:      # loop over files
-            if file[-8:] == '_msg.xls':     # message reports must end with _msg.xls
-                files_msg.append(file)
-            elif file[-8:] == '_fix.xls':       # fixation reporst must end with .xls but not with _msg.xls
-                files_fix.append(file)
-            elif file[-8:] == '_sac.xls':
-                files_sac.append(file)
+            get_user_args()
+            linebreak = get_linebreak()     # get linebreak encoding characters in current operating system
+            reports_folder = './reports/'
+            cache_folder = './cache/'
+            memo_folder = './cache/failure_rate/'
+            if args.clear_cache:
+                clear_report_cache()
+                clear_failure_rate_memo()
+            files = os.listdir(reports_folder)  # get all files in reports folder
+            files_fix = []      # this will contain all fixation reports
+            files_msg = []      # this will contain all message reports
+            files_sac = []
+            for file in files:      # loop over files
+                if file[-8:] == '_msg.xls':     # message reports must end with _msg.xls
+                    files_msg.append(file)
+                elif file[-8:] == '_fix.xls':       # fixation reporst must end with .xls but not with _msg.xls
+                    files_fix.append(file)
+                elif file[-8:] == '_sac.xls':
+                    files_sac.append(file)
             
-        print '\nExtracting data from report files.'
-        print 'Cutoff value for saccade filtering: {} ms.'.format(dt_cutoff)
-        print 'Found fixation data files:', files_fix
-        print 'Found message data files:', files_msg
-        print 'Found saccade data files:', files_sac
-
-    #    error, subject_index_dic = get_subject_index_dic()
-        error, overview_dic = process_overviews()
-        if error:
-            break
+            print '\nExtracting data from report files.'
+            if len(DT_CUTOFFS) > 1:
+                print 'Cutoff values for saccade filtering: {} ms.'.format(', '.join(str(cutoff_value) for cutoff_value in DT_CUTOFFS))
+            else:
+                print 'Cutoff value for saccade filtering: {} ms.'.format(dt_cutoff)
+            print 'Found fixation data files:', files_fix
+            print 'Found message data files:', files_msg
+            print 'Found saccade data files:', files_sac
 
-        dic_total = {}      # this will contain all data for each experiment session as subdictionaries
+        #    error, subject_index_dic = get_subject_index_dic()
+            error, overview_dic = process_overviews()
+            if error:
+                break
 
-        dic_total, error = process_fixation_files(files_fix, dic_total, dt_cutoff, overview_dic)
-            # call function process_fixation_files() to extract and process data from fixation report files
-        if error:
-            break
+            fingerprints, report_sessions = get_session_fingerprints(files_fix+files_msg+files_sac, overview_dic)
+                # call function get_session_fingerprints() to detect changed inputs of each session
+            dic_previous = dict((cutoff_value, {}) for cutoff_value in DT_CUTOFFS)
+                # this will contain the reused data of sessions with unchanged inputs for each cutoff value
+            changed_sessions = None
+            if incremental:
+                changed_sessions = set()
+                for dt_cutoff in DT_CUTOFFS:    # loop over cutoff values, sessions changed for any of them are processed
+                    results_file = './extracted_data/extracted_data_{}.dat'.format(dt_cutoff)
+                    manifest_file = './extracted_data/extracted_data_{}.manifest'.format(dt_cutoff)
+                    if len(DT_CUTOFFS) > 1:
+                        print 'Cutoff value {} ms:'.format(dt_cutoff),
+                    dic_previous[dt_cutoff], changed = load_previous_results(fingerprints[dt_cutoff], len(DT_CUTOFFS) == 1)
+                        # in a sweep, outputs are always stored again, so that the comparison covers all cutoff values
+                    changed_sessions.update(changed)
+                if dic_previous[dt_cutoff] is None:
+                    print 'Stored results are up to date.'
+                    print 'Success.'
+                    break
+                for dt_cutoff in DT_CUTOFFS:
+                    for session_name in changed_sessions:
+                        dic_previous[dt_cutoff].pop(session_name, None)
+                    # only reports containing changed sessions need to be processed
+                    # -> reports without sessions are kept for the file format check
+                files_fix = [report for report in files_fix
+                    if len(report_sessions[report]) == 0 or len(report_sessions[report] & changed_sessions) > 0]
+                files_msg = [report for report in files_msg
+                    if len(report_sessions[report]) == 0 or len(report_sessions[report] & changed_sessions) > 0]
+                files_sac = [report for report in files_sac
+                    if len(report_sessions[report]) == 0 or len(report_sessions[report] & changed_sessions) > 0]
+
+            parse_pool, parse_jobs = start_report_parsing(files_msg, files_sac, use_cache, changed_sessions)
+                # call function start_report_parsing() to parse message and saccade reports in the background
+                # -> results are joined with the fixation data after the fixation stage
+
+            dic_totals = dict((cutoff_value, {}) for cutoff_value in DT_CUTOFFS)
+                # this will contain all data for each experiment session as subdictionaries for each cutoff value
+            failure_rate_jobs = None
+            if FAILURE_RATE:
+                failure_rate_jobs = init_failure_rate_jobs(jobs, use_cache)
+                    # failure rates are estimated in separate processes while the extraction continues
+
+            dic_totals, error = process_fixation_files(files_fix, dic_totals, DT_CUTOFFS, overview_dic, jobs, use_cache,
+                changed_sessions, failure_rate_jobs)
+                # call function process_fixation_files() to extract and process data from fixation report files
+            if error:
+                break
 
-        dic_total, error = process_message_files(files_msg, dic_total)
-            # call function process_message_files() to extract and process data from message report files
-        if error:
-            break
+            (parsed_msg, error), output = parse_jobs['msg'].get()
+                # wait for parsed message reports
+            sys.stdout.write(output)
+            if error:
+                break
+            for dt_cutoff in DT_CUTOFFS:    # loop over cutoff values
+                dic_totals[dt_cutoff], error = join_message_files(parsed_msg, dic_totals[dt_cutoff])
+                    # call function join_message_files() to process message data and store in dic_totals
+                if error:
+                    break
+            if error:
+                break
 
-        dic_total, error = process_saccade_files(files_sac, dic_total)
-        if error:
-            break
+            (parsed_sac, error), output = parse_jobs['sac'].get()
+                # wait for parsed saccade reports
+            sys.stdout.write(output)
+            if error:
+                break
+            for dt_cutoff in DT_CUTOFFS:    # loop over cutoff values
+                dic_totals[dt_cutoff] = join_saccade_files(parsed_sac, dic_totals[dt_cutoff])
+                    # call function join_saccade_files() to process saccade data and store in dic_totals
+                dic_totals[dt_cutoff] = join_event_streams(dic_totals[dt_cutoff])
+                    # call function join_event_streams() to relate fixations, triggers, and saccades to each other
+            if failure_rate_jobs is not None:
+                print 'Waiting for failure rates.'
+                dic_totals[DT_CUTOFFS[0]], failed_sessions = join_failure_rates(failure_rate_jobs, dic_totals[DT_CUTOFFS[0]])
+                    # call function join_failure_rates() to store estimated failure rates in dic_totals
+                for dt_cutoff in DT_CUTOFFS[1:]:
+                    dic_totals[dt_cutoff] = store_failure_rates(failure_rate_jobs, dic_totals[dt_cutoff])
+                for session_name in failed_sessions:    # sessions without failure rate are processed again next time
+                    for dt_cutoff in DT_CUTOFFS:
+                        fingerprints[dt_cutoff].pop(session_name, None)
+            for dt_cutoff in DT_CUTOFFS:
+                dic_totals[dt_cutoff].update(dic_previous[dt_cutoff])      # merge reused sessions
+                dic_totals[dt_cutoff] = filter_dic(dic_totals[dt_cutoff])
+            if error:
+                break
 
-        dic_total = filter_dic(dic_total)
-        if error:
-            break
+            for dt_cutoff in DT_CUTOFFS:    # loop over cutoff values, the global dt_cutoff is used by store_results()
+                results_file = './extracted_data/extracted_data_{}.dat'.format(dt_cutoff)
+                manifest_file = './extracted_data/extracted_data_{}.manifest'.format(dt_cutoff)
+                if os.path.exists(manifest_file):   # previous manifest is invalid as soon as results are overwritten
+                    os.remove(manifest_file)
+                error = store_results(dic_totals[dt_cutoff])
+                    # call function store_results() to send data in dic_totals to hard disc
+                if error:
+                    break
+                store_manifest(fingerprints[dt_cutoff])
+            if error:
+                break
+            if len(DT_CUTOFFS) > 1:
+                store_cutoff_comparison(dic_totals)
 
-        error = store_results(dic_total)    # call function store_results() to send data in dic_total to hard disc
-        if error:
+            print 'Success.'
             break
+            # end of while loop
 
-        print 'Success.'
-        break
-        # end of while loop
-
-    if error:
-        print 'Extraction failed!'    
-except:
-    print '\n\nExtraction failure!\n'
-    traceback.print_exc(file=sys.stdout)
-finally:
-    raw_input('\nPress Enter to exit.')
+        if error:
+            print 'Extraction failed!'    
+    except:
+        print '\n\nExtraction failure!\n'
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        if parse_pool is not None:      # wait for background parsing, also if extraction was aborted
+            parse_pool.join()
+        raw_input('\nPress Enter to exit.')
@@ -0,0 +1,502 @@
+import re
+import numpy as np
+from session_record import AOI_BACKGROUND, AOI_IMAGE, AOI_LEFT, AOI_RIGHT
+
+
+
+
+###########################################################
+#
+#   Declarative gaze patterns over sequences of interest area codes, see extract_scalars.py
+#
+#   A pattern is declared as a sequence of interest areas, e.g. 'image -> [R white]* -> R -> [R white]* -> image':
+#       white, image, L, R      fixation (or gaze event) on background, image, left disc, or right disc
+#       .                       any interest area
+#       [X Y]                   any of the listed interest areas
+#       !X, ![X Y]              any interest area except the listed ones
+#       (...)                   group
+#       |                       alternative
+#       *, +, ?                 zero or more, one or more, zero or one of the preceding item
+#       ->                      optional separator between successive items
+#   Each pattern is compiled into a transition table over the interest area codes (a deterministic automaton).
+#   An occurrence is counted at each position where a match of the pattern starts,
+#       successive occurrences may share items (e.g. the image fixation finishing one extended gaze pattern starts the next one),
+#       and it is finished by the first item completing the pattern.
+#   All patterns of a pattern set are scanned in one pass over the codes of a session:
+#       the state of the scan is the set of automaton states of the occurrences still running,
+#       where occurrences of one pattern in the same automaton state are merged, since they finish with the same item.
+#   The transitions of the scan are built on first use and kept in the pattern set,
+#       so the time of a scan grows linearly with the number of codes.
+#
+#   Functions:
+#       tokenize_pattern(name, pattern) returns tokens
+#       add_nfa_state(edges) returns i_state
+#       parse_alternation(name, tokens, i_token, edges) returns (i_start, i_end, i_token)
+#       parse_sequence(name, tokens, i_token, edges) returns (i_start, i_end, i_token)
+#       parse_item(name, tokens, i_token, edges) returns (i_start, i_end, i_token)
+#       get_closure(edges, states) returns closure
+#       build_transition_table(edges, i_start, i_accept) returns (table, accepts)
+#       compile_patterns(declarations) returns pattern_set
+#       get_scan_transition(pattern_set, scan_state, symbol) returns next_scan_state
+#       scan_patterns(pattern_set, codes, times=None, epochs=None, N_epochs=0) returns results
+#
+###########################################################
+
+
+PATTERN_SYMBOLS = {'white':AOI_BACKGROUND, 'image':AOI_IMAGE, 'L':AOI_LEFT, 'R':AOI_RIGHT}
+    # interest area names of the pattern language and their codes
+PATTERN_TOKENS = re.compile(r'\s*(->|[A-Za-z_]+|[.!\[\]()|*+?])')
+N_SYMBOLS = max(PATTERN_SYMBOLS.values()) + 2
+    # columns of transition tables: one for each interest area code and one for any other code
+ALL_SYMBOLS = frozenset(range(N_SYMBOLS))
+
+
+
+
+def tokenize_pattern(name, pattern):
+    """
+    function for splitting a gaze pattern declaration into tokens
+
+    input:
+        name (str), name of pattern
+        pattern (str), declared pattern, see header for the pattern language
+
+    output: tokens (list), tokens of pattern
+    """
+
+    tokens = []
+    position = 0
+    pattern_end = len(pattern.rstrip())
+    while position < pattern_end:
+        match = PATTERN_TOKENS.match(pattern, position)
+        if match is None:
+            raise ValueError('gaze pattern {}: could not read {!r}'.format(name, pattern[position:]))
+        tokens.append(match.group(1))
+        position = match.end()
+
+    return tokens
+
+
+###
+#
+###
+
+
+def add_nfa_state(edges):
+    """
+    function for adding a state to a nondeterministic automaton
+
+    input: edges (list), for each state of the automaton a list of edges (symbols, i_target),
+        symbols is a frozenset of symbols or None for an edge without symbol
+
+    output: i_state (int), index of new state
+    """
+
+    edges.append([])
+
+    return len(edges) - 1
+
+
+###
+#
+###
+
+
+def parse_alternation(name, tokens, i_token, edges):
+    """
+    function for translating alternative sequences of a gaze pattern into states of a nondeterministic automaton
+    -> parsing stops at the end of the tokens or at a closing parenthesis
+
+    input:
+        name (str), name of pattern
+        tokens (list), tokens of pattern returned by tokenize_pattern()
+        i_token (int), index of first token of alternation
+        edges (list), edges of automaton, see add_nfa_state(), updated in place
+
+    output:
+        i_start (int), state entering the alternation
+        i_end (int), state leaving the alternation
+        i_token (int), index of first token after alternation
+    """
+
+    i_start, i_end, i_token = parse_sequence(name, tokens, i_token, edges)
+    while i_token < len(tokens) and tokens[i_token] == '|':
+        i_start_next, i_end_next, i_token = parse_sequence(name, tokens, i_token+1, edges)
+        i_start_both = add_nfa_state(edges)
+        i_end_both = add_nfa_state(edges)
+        edges[i_start_both].extend([(None, i_start), (None, i_start_next)])
+        edges[i_end].append((None, i_end_both))
+        edges[i_end_next].append((None, i_end_both))
+        i_start, i_end = i_start_both, i_end_both
+
+    return i_start, i_end, i_token
+
+
+###
+#
+###
+
+
+def parse_sequence(name, tokens, i_token, edges):
+    """
+    function for translating a sequence of items of a gaze pattern into states of a nondeterministic automaton
+
+    input: see parse_alternation()
+
+    output: see parse_alternation()
+    """
+
+    i_start = add_nfa_state(edges)
+    i_end = i_start
+    while i_token < len(tokens) and tokens[i_token] not in ['|', ')']:
+        if tokens[i_token] == '->':
+            i_token += 1
+            continue
+        i_start_item, i_end_item, i_token = parse_item(name, tokens, i_token, edges)
+        edges[i_end].append((None, i_start_item))
+        i_end = i_end_item
+
+    return i_start, i_end, i_token
+
+
+###
+#
+###
+
+
+def parse_item(name, tokens, i_token, edges):
+    """
+    function for translating one item of a gaze pattern and its repetition into states of a nondeterministic automaton
+    -> an item is an interest area, a list of interest areas, any interest area, or a group
+
+    input: see parse_alternation()
+
+    output: see parse_alternation()
+    """
+
+    token = tokens[i_token]
+    negated = token == '!'
+    if negated:
+        i_token += 1
+        if i_token == len(tokens):
+            raise ValueError('gaze pattern {}: ! must be followed by an interest area or a list'.format(name))
+        token = tokens[i_token]
+
+    if token == '(':    # group
+        i_start, i_end, i_token = parse_alternation(name, tokens, i_token+1, edges)
+        if i_token == len(tokens):
+            raise ValueError('gaze pattern {}: missing closing parenthesis'.format(name))
+        if negated:
+            raise ValueError('gaze pattern {}: ! must be followed by an interest area or a list'.format(name))
+    else:
+        if token == '[':    # list of interest areas
+            i_list_end = i_token + 1
+            while i_list_end < len(tokens) and tokens[i_list_end] != ']':
+                i_list_end += 1
+            if i_list_end == len(tokens) or i_list_end == i_token+1:
+                raise ValueError('gaze pattern {}: incomplete list of interest areas'.format(name))
+            area_names = tokens[i_token+1:i_list_end]
+            i_token = i_list_end
+        elif token in PATTERN_SYMBOLS:
+            area_names = [token]
+        elif negated:
+            raise ValueError('gaze pattern {}: ! must be followed by an interest area or a list'.format(name))
+        elif token == '.':
+            area_names = None
+        elif token in ['*', '+', '?']:
+            raise ValueError('gaze pattern {}: {} must follow an interest area or a group'.format(name, token))
+        else:
+            raise ValueError('gaze pattern {}: unknown interest area {}'.format(name, token))
+
+        if area_names is None:
+            symbols = ALL_SYMBOLS
+        else:
+            for area_name in area_names:
+                if area_name not in PATTERN_SYMBOLS:
+                    raise ValueError('gaze pattern {}: unknown interest area {}'.format(name, area_name))
+            symbols = frozenset(PATTERN_SYMBOLS[area_name] for area_name in area_names)
+            if negated:
+                symbols = ALL_SYMBOLS - symbols
+        i_start = add_nfa_state(edges)
+        i_end = add_nfa_state(edges)
+        edges[i_start].append((symbols, i_end))
+    i_token += 1
+
+    if i_token < len(tokens) and tokens[i_token] in ['*', '+', '?']:     # repetition of item
+        repetition = tokens[i_token]
+        i_start_repeated = add_nfa_state(edges)
+        i_end_repeated = add_nfa_state(edges)
+        edges[i_start_repeated].append((None, i_start))
+        edges[i_end].append((None, i_end_repeated))
+        if repetition in ['*', '?']:
+            edges[i_start_repeated].append((None, i_end_repeated))
+        if repetition in ['*', '+']:
+            edges[i_end].append((None, i_start))
+        i_start, i_end = i_start_repeated, i_end_repeated
+        i_token += 1
+
+    return i_start, i_end, i_token
+
+
+###
+#
+###
+
+
+def get_closure(edges, states):
+    """
+    function for finding all states of a nondeterministic automaton reached from given states without a symbol
+
+    input:
+        edges (list), edges of automaton, see add_nfa_state()
+        states (iterable), indices of states
+
+    output: closure (frozenset), indices of reached states including the given states
+    """
+
+    closure = set(states)
+    unvisited = list(closure)
+    while len(unvisited) > 0:
+        for symbols, i_target in edges[unvisited.pop()]:
+            if symbols is None and i_target not in closure:
+                closure.add(i_target)
+                unvisited.append(i_target)
+
+    return frozenset(closure)
+
+
+###
+#
+###
+
+
+def build_transition_table(edges, i_start, i_accept):
+    """
+    function for converting a nondeterministic automaton into the transition table of a deterministic automaton
+    -> each state of the table is a set of states of the nondeterministic automaton (subset construction)
+
+    input:
+        edges (list), edges of automaton, see add_nfa_state()
+        i_start (int), initial state
+        i_accept (int), accepting state
+
+    output:
+        table (ndarray), next state for each state (rows) and symbol (columns), -1 if no match is possible any more,
+            state 0 is the initial state
+        accepts (ndarray), True for each state finishing a match
+    """
+
+    subsets = [get_closure(edges, [i_start])]
+    subset_index = {subsets[0]:0}
+    rows = []
+    while len(rows) < len(subsets):
+        row = []
+        for symbol in xrange(N_SYMBOLS):
+            reached = [i_target for i_state in subsets[len(rows)] for symbols, i_target in edges[i_state]
+                if symbols is not None and symbol in symbols]
+            if len(reached) == 0:
+                row.append(-1)
+                continue
+            subset = get_closure(edges, reached)
+            if subset not in subset_index:
+                subset_index[subset] = len(subsets)
+                subsets.append(subset)
+            row.append(subset_index[subset])
+        rows.append(row)
+
+    table = np.array(rows, dtype=int)
+    accepts = np.array([i_accept in subset for subset in subsets], dtype=bool)
+
+    return table, accepts
+
+
+###
+#
+###
+
+
+def compile_patterns(declarations):
+    """
+    function for compiling gaze pattern declarations into one pattern set
+    -> each pattern is parsed into a nondeterministic automaton and converted into a transition table
+
+    input: declarations (list), list of tuples (name, pattern), see header for the pattern language
+
+    output: pattern_set (dictionary), dictionary containing
+        - names: names of patterns in order of declaration
+        - patterns: declared patterns
+        - tables: transition table of each pattern, see build_transition_table()
+        - accepts: accepting states of each pattern
+        - scan_states, scan_index, scan_table, scan_moves: states and transitions of the scan, see get_scan_transition()
+    """
+
+    names = []
+    patterns = []
+    tables = []
+    accepts = []
+    for name, pattern in declarations:
+        if name in names:
+            raise ValueError('gaze pattern {} declared twice'.format(name))
+
+        tokens = tokenize_pattern(name, pattern)
+        edges = []
+        i_start, i_end, i_token = parse_alternation(name, tokens, 0, edges)
+        if i_token < len(tokens):   # parsing stopped at a closing parenthesis
+            raise ValueError('gaze pattern {}: unexpected closing parenthesis'.format(name))
+        table, accepting = build_transition_table(edges, i_start, i_end)
+        if accepting[0]:
+            raise ValueError('gaze pattern {} matches an empty sequence'.format(name))
+
+        names.append(name)
+        patterns.append(pattern)
+        tables.append(table)
+        accepts.append(accepting)
+
+    if len(names) == 0:
+        raise ValueError('no gaze patterns declared')
+
+    pattern_set = {'names':names, 'patterns':patterns, 'tables':tables, 'accepts':accepts,
+        'scan_states':[()], 'scan_index':{():0}, 'scan_table':[[None] * N_SYMBOLS], 'scan_moves':{}}
+
+    return pattern_set
+
+
+###
+#
+###
+
+
+def get_scan_transition(pattern_set, scan_state, symbol):
+    """
+    function for building the transition of a scan on one interest area code
+    -> a state of the scan is a sorted tuple of slots (i_pattern, state of pattern) of the occurrences still running,
+        before each code a new occurrence of each pattern is started in the initial state of the pattern
+    -> occurrences of the same pattern in the same state are merged into one slot, since they finish with the same item
+    -> transitions are stored in pattern_set, so each one is built only once
+
+    input:
+        pattern_set (dictionary), compiled patterns returned by compile_patterns()
+        scan_state (int), index of current state of scan
+        symbol (int), column of interest area code in transition tables
+
+    output: next_scan_state (int), index of next state of scan
+        -> the moves of the occurrences are stored in pattern_set['scan_moves'][(scan_state, symbol)]
+            as tuple (slot targets, start targets): the slot of the next scan state reached from each slot
+            of the current scan state and from the started occurrence of each pattern,
+            -1 if the occurrence is finished, -2 if it cannot match any more
+    """
+
+    slots = pattern_set['scan_states'][scan_state]
+    sources = slots + tuple((i_pattern, 0) for i_pattern in xrange(len(pattern_set['names'])))
+    reached = []
+    for i_pattern, state in sources:
+        next_state = pattern_set['tables'][i_pattern][state, symbol]
+        if next_state < 0:
+            reached.append(-2)      # no match possible any more
+        elif pattern_set['accepts'][i_pattern][next_state]:
+            reached.append(-1)      # occurrence finished
+        else:
+            reached.append((i_pattern, int(next_state)))
+
+    next_slots = tuple(sorted(set(slot for slot in reached if slot not in [-1, -2])))
+    if next_slots not in pattern_set['scan_index']:
+        pattern_set['scan_index'][next_slots] = len(pattern_set['scan_states'])
+        pattern_set['scan_states'].append(next_slots)
+        pattern_set['scan_table'].append([None] * N_SYMBOLS)
+    next_scan_state = pattern_set['scan_index'][next_slots]
+    slot_index = dict((slot, i_slot) for i_slot, slot in enumerate(next_slots))
+    targets = [slot_index.get(slot, slot) for slot in reached]
+
+    pattern_set['scan_table'][scan_state][symbol] = next_scan_state
+    pattern_set['scan_moves'][(scan_state, symbol)] = (tuple(targets[:len(slots)]), tuple(targets[len(slots):]))
+
+    return next_scan_state
+
+
+###
+#
+###
+
+
+def scan_patterns(pattern_set, codes, times=None, epochs=None, N_epochs=0):
+    """
+    function for finding the occurrences of all patterns of a pattern set in one sequence of interest area codes
+    -> one pass over the codes through the transition table of the scan (see get_scan_transition()),
+        afterwards the finishing item of each running slot is found for all slots at once by pointer jumping
+
+    input:
+        pattern_set (dictionary), compiled patterns returned by compile_patterns()
+        codes (ndarray), interest area codes of fixations or gaze events
+        times (ndarray), optional, times of fixations or gaze events
+        epochs (ndarray), optional, epoch index of each fixation or gaze event
+        N_epochs (int), number of counted epochs, occurrences in later epochs are not counted
+
+    output: results (dictionary), for the name of each pattern a dictionary containing
+        - N: number of occurrences
+        - i_starts: index of first fixation or gaze event of each occurrence
+        - i_ends: index of last fixation or gaze event of each occurrence
+        - times: start time of each occurrence, if times given
+        - N_epochs: number of occurrences finished in each epoch, if epochs given
+    """
+
+    names = pattern_set['names']
+    N_patterns = len(names)
+    codes = np.asarray(codes, dtype=int)
+    symbols = np.where((codes >= 0) & (codes < N_SYMBOLS-1), codes, N_SYMBOLS-1)
+    N_codes = len(symbols)
+
+    scan_table = pattern_set['scan_table']
+    scan_states = [0] * (N_codes+1)     # state of scan before each code and after the last one
+    scan_state = 0
+    i_code = 0
+    for symbol in symbols.tolist():     # loop over fixations or gaze events
+        next_scan_state = scan_table[scan_state][symbol]
+        if next_scan_state is None:
+            next_scan_state = get_scan_transition(pattern_set, scan_state, symbol)
+        i_code += 1
+        scan_states[i_code] = next_scan_state
+        scan_state = next_scan_state
+    scan_states = np.array(scan_states, dtype=int)
+
+        # moves of all transitions built so far as arrays, indexed by scan state and symbol
+    i_transitions = scan_states[:-1]*N_SYMBOLS + symbols
+    N_slots = np.array([len(slots) for slots in pattern_set['scan_states']], dtype=int)
+    slot_targets = np.zeros((len(N_slots)*N_SYMBOLS, max(N_slots.max(), 1)), dtype=int) - 2
+    start_targets = np.zeros((len(N_slots)*N_SYMBOLS, N_patterns), dtype=int) - 2
+    for (scan_state, symbol), (slot_moves, start_moves) in pattern_set['scan_moves'].iteritems():
+        slot_targets[scan_state*N_SYMBOLS + symbol, :len(slot_moves)] = slot_moves
+        start_targets[scan_state*N_SYMBOLS + symbol] = start_moves
+
+        # running slots before each code are numbered consecutively, each slot points to the slot it moves to
+    slot_offsets = np.append(0, np.cumsum(N_slots[scan_states]))
+    N_running = slot_offsets[N_codes]   # slots after the last code are never finished
+    slot_codes = np.repeat(np.arange(N_codes), N_slots[scan_states[:-1]])
+    targets = slot_targets[i_transitions[slot_codes], np.arange(N_running) - slot_offsets[slot_codes]]
+    next_slots = np.zeros(slot_offsets[-1], dtype=int) - 1
+    next_slots[:N_running][targets >= 0] = slot_offsets[slot_codes[targets >= 0]+1] + targets[targets >= 0]
+    slot_ends = np.zeros(slot_offsets[-1], dtype=int) - 1
+    slot_ends[:N_running][targets == -1] = slot_codes[targets == -1]
+    jumping = np.flatnonzero(next_slots >= 0)
+    while len(jumping) > 0:     # each slot takes the end of the slot it moves to, doubling the distance each round
+        slot_ends[jumping] = slot_ends[next_slots[jumping]]
+        next_slots[jumping] = next_slots[next_slots[jumping]]
+        jumping = jumping[next_slots[jumping] >= 0]
+
+    starts = start_targets[i_transitions]   # target of the occurrence of each pattern started at each code
+    ends = np.where(starts == -1, np.arange(N_codes)[:, None], -1)
+    continued = starts >= 0
+    ends[continued] = slot_ends[(slot_offsets[1:-1, None] + starts)[continued]]
+
+    results = {}
+    for i_pattern in xrange(N_patterns):
+        i_starts = np.flatnonzero(ends[:, i_pattern] >= 0)
+        i_ends = ends[i_starts, i_pattern]
+        results[names[i_pattern]] = {'N':len(i_starts), 'i_starts':i_starts, 'i_ends':i_ends}
+        if times is not None:
+            results[names[i_pattern]]['times'] = np.asarray(times)[i_starts]
+        if epochs is not None:
+            results[names[i_pattern]]['N_epochs'] = np.bincount(np.asarray(epochs)[i_ends],
+                minlength=N_epochs)[:N_epochs]
+                # occurrences are assigned to the epoch of the fixation or gaze event finishing them
+
+    return results
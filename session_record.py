@@ -0,0 +1,288 @@
+import numpy as np
+
+
+
+
+
+###########################################################
+#
+#   Compact record of the extracted data of one experiment session, see extract_scalars.py
+#
+#   Functions:
+#       get_message_events(message_events, message_type, t_start=None, t_end=None, real=False) returns times
+#
+#   Classes:
+#       SessionRecord(data=None)
+#
+###########################################################
+
+
+AOI_BACKGROUND, AOI_IMAGE, AOI_LEFT, AOI_RIGHT = 0, 1, 2, 3     # codes of interest areas
+AOI_NAMES = ['background', 'image', 'left', 'right']    # names of interest areas, indexed by code
+
+AREA_PREFIXES = {'R':AOI_RIGHT, 'L':AOI_LEFT, 'im':AOI_IMAGE, 'white':AOI_BACKGROUND}
+    # prefixes of keys of single interest areas and their codes
+AREA_KEYS = {'_times':('all_times', 'fixation_trajectory'), '_durations':('all_durations', 'fixation_trajectory'),
+    '_gaze_events_times':('all_gaze_events_times', 'gaze_event_trajectory')}
+    # suffixes of keys of single interest areas and the keys of all fixations or gaze events they are selected from
+FUNCT_KEYS = ['funct_times', 'nonfunct_times', 'funct_durations', 'nonfunct_durations', 'N_funct', 'N_nonfunct',
+    'mean_funct_freq', 'mean_nonfunct_freq', 'mean_funct_dur', 'mean_nonfunct_dur',
+    'funct_pattern_im_times', 'nonfunct_pattern_im_times', 'N_funct_pattern_im', 'N_nonfunct_pattern_im',
+    'mean_funct_pattern_im_freq', 'mean_nonfunct_pattern_im_freq',
+    'funct_pattern_ex_times', 'nonfunct_pattern_ex_times', 'N_funct_pattern_ex', 'N_nonfunct_pattern_ex',
+    'mean_funct_pattern_ex_freq', 'mean_nonfunct_pattern_ex_freq',
+    'funct_gaze_events_times', 'nonfunct_gaze_events_times', 'funct_gaze_events_durations', 'nonfunct_gaze_events_durations',
+    'N_gaze_funct', 'N_gaze_nonfunct', 'mean_funct_gaze_events_freq', 'mean_nonfunct_gaze_events_freq',
+    'mean_funct_gaze_events_dur', 'mean_nonfunct_gaze_events_dur',
+    'N_funct_full_gaze_pattern', 'N_nonfunct_full_gaze_pattern',
+    'N_funct_est', 'N_nonfunct_est', 'mean_funct_freq_est', 'mean_nonfunct_freq_est',
+    'N_funct_pattern_ex_est', 'N_nonfunct_pattern_ex_est', 'mean_funct_pattern_ex_freq_est',
+    'mean_nonfunct_pattern_ex_freq_est']
+    # keys of functioning and nonfunctioning disc, taken from the keys of the right or left disc
+SACCADE_DTYPE = np.dtype([('time', np.int32), ('time_real', np.int32), ('duration', np.int32), ('amplitude', np.float32),
+    ('angle', np.float32), ('velocity_avg', np.float32), ('velocity_peak', np.float32), ('blink', np.bool_)])
+    # one row per saccade, time and time_real are the filtered and unfiltered start times in ms
+SACCADE_KEYS = {'sac_times':'time', 'sac_durations':'duration', 'sac_amplitudes':'amplitude', 'sac_angles':'angle',
+    'sac_velocities_avg':'velocity_avg', 'sac_velocities_peak':'velocity_peak', 'sac_blinks':'blink'}
+    # keys of single saccade data and the fields of 'saccades' they are taken from
+DERIVED_KEYS = FUNCT_KEYS + [prefix+suffix for prefix in AREA_PREFIXES for suffix in AREA_KEYS] + SACCADE_KEYS.keys()
+    # keys of data which are derived from the stored data and cannot be assigned
+
+
+
+
+def get_message_events(message_events, message_type, t_start=None, t_end=None, real=False):
+    """
+    function for finding the messages of one type within a time window in the message event index of a session
+    -> the times of each message type are sorted, so the window is found by binary search
+
+    input:
+        message_events (dictionary), message event index of session stored as 'message_events', see extract_scalars.py
+        message_type (str), first word of message text, e.g. 'PLAY_SOUND_b' or 'TRIALID'
+        t_start (int), optional, start of time window in ms, included
+        t_end (int), optional, end of time window in ms, included
+        real (bool), if True, time window and results refer to the unfiltered times instead of the filtered times
+
+    output: times (ndarray), sorted times of messages of type in time window, empty if session contains no such message
+    """
+
+    if real:
+        times_key = 'times_real'
+    else:
+        times_key = 'times'
+    try:
+        i_type = message_events['types'].index(message_type)
+    except ValueError:
+        return message_events[times_key][:0]
+
+    times = message_events[times_key][message_events['offsets'][i_type]:message_events['offsets'][i_type+1]]
+    i_start = 0
+    i_end = len(times)
+    if t_start is not None:
+        i_start = np.searchsorted(times, t_start, side='left')
+    if t_end is not None:
+        i_end = np.searchsorted(times, t_end, side='right')
+
+    return times[i_start:i_end]
+
+
+
+
+class SessionRecord(object):
+    """
+    class for storing the extracted data of one experiment session
+    -> data are accessed like a dictionary, e.g. record['R_times']
+    -> only the data of all fixations and gaze events are stored, the data of single interest areas are selected
+        from them by their interest area codes when accessed
+    -> data of the functioning and nonfunctioning disc are the data of the right or left disc, according to
+        'functioning_side'
+    -> single saccade data (e.g. 'sac_durations') are the fields of the structured array 'saccades'
+    -> the data of single interest areas are selected once and cached until stored data are assigned or deleted,
+        the cached arrays are shared by all accesses and therefore read-only
+    -> derived keys (see DERIVED_KEYS) cannot be assigned, since the stored data they are derived from would be
+        shadowed
+
+    input: data (dictionary), optional, stored data of session
+    """
+
+    __slots__ = ('_data', '_cache')
+
+    def __init__(self, data=None):
+        self._data = {}
+        self._cache = {}
+        if data is not None:
+            self.update(data)
+
+    def _get_source(self, key):
+        """
+        function for finding the stored data which a derived key is taken from, without deriving the data
+
+        input: key (str), key of derived data
+
+        output: source (tuple), None if key cannot be derived, otherwise one of
+            - ('alias', key): data of functioning or nonfunctioning disc, key of right or left disc
+            - ('area', values_key, codes_key, code): data of single interest area, selected from stored values_key
+                where stored codes_key equals code
+            - ('saccade', field): single saccade data, field of stored 'saccades'
+        """
+
+        data = self._data
+        if key in FUNCT_KEYS and 'functioning_side' in data:
+            functioning_side = data['functioning_side']
+            if functioning_side == 'R':
+                side, other_side = 'R', 'L'
+            elif functioning_side == 'L':
+                side, other_side = 'L', 'R'
+            else:
+                return None
+            if 'nonfunct' in key:
+                return ('alias', key.replace('nonfunct', other_side))
+            return ('alias', key.replace('funct', side))
+
+        prefix, _, suffix = key.partition('_')
+        suffix = '_'+suffix
+        if prefix in AREA_PREFIXES and suffix in AREA_KEYS:
+            values_key, codes_key = AREA_KEYS[suffix]
+            if values_key in data and codes_key in data:
+                return ('area', values_key, codes_key, AREA_PREFIXES[prefix])
+
+        if key in SACCADE_KEYS and 'saccades' in data:
+            return ('saccade', SACCADE_KEYS[key])
+
+        return None
+
+    def _get_derived(self, key):
+        """
+        function for getting data which are not stored but derived from the stored data
+
+        input: key (str), key of derived data
+
+        output: value (any), derived data, raises KeyError if key cannot be derived
+        """
+
+        source = self._get_source(key)
+        if source is None:
+            raise KeyError(key)
+        if source[0] == 'alias':
+            return self[source[1]]
+        if source[0] == 'saccade':
+            return self._data['saccades'][source[1]]     # field of structured array is a view, not a copy
+
+        if key not in self._cache:
+            values_key, codes_key, code = source[1:]
+            value = self._data[values_key][self._data[codes_key] == code]
+            value.flags.writeable = False
+            self._cache[key] = value
+
+        return self._cache[key]
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            return self._get_derived(key)
+
+    def __setitem__(self, key, value):
+        if key in DERIVED_KEYS:
+            raise KeyError('{} is derived from the stored data and cannot be assigned'.format(key))
+        self._data[key] = value
+        self._cache.clear()
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._cache.clear()
+
+    def __contains__(self, key):
+        if key in self._data:
+            return True
+        source = self._get_source(key)
+        if source is None:
+            return False
+        if source[0] == 'alias':
+            return source[1] in self
+        return True
+
+    has_key = __contains__
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self):
+        return 'SessionRecord({!r})'.format(self._data)
+
+    def __getstate__(self):
+        return self._data
+
+    def __setstate__(self, state):
+        self._data = state
+        self._cache = {}
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """
+        function for listing all keys of the record, stored and derived
+        -> derived keys are listed if the stored data they are derived from exist, they are not derived here
+        """
+
+        keys = self._data.keys()
+        for key in DERIVED_KEYS:
+            if key not in self._data and key in self:
+                keys.append(key)
+
+        return keys
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def iterkeys(self):
+        return iter(self.keys())
+
+    def itervalues(self):
+        return iter(self.values())
+
+    def iteritems(self):
+        return iter(self.items())
+
+    def update(self, data):
+        """
+        function for storing several data at once
+
+        input: data (dictionary or SessionRecord), data to be stored
+            -> only the stored data of a SessionRecord are copied
+            -> raises KeyError if data contain a derived key
+        """
+
+        if isinstance(data, SessionRecord):
+            data = data._data
+        for key in data:
+            if key in DERIVED_KEYS:
+                raise KeyError('{} is derived from the stored data and cannot be assigned'.format(key))
+        self._data.update(data)
+        self._cache.clear()
+
+    def get_message_events(self, message_type, t_start=None, t_end=None, real=False):
+        """
+        function for finding the messages of one type within a time window, see get_message_events()
+        """
+
+        return get_message_events(self['message_events'], message_type, t_start, t_end, real)
+
+    def to_dict(self):
+        """
+        function for converting the record into a dictionary containing stored and derived data
+
+        output: dic (dictionary), data of session
+        """
+
+        return dict(self.items())
@@ -0,0 +1,122 @@
+import unittest
+import numpy as np
+from session_record import AOI_BACKGROUND, AOI_IMAGE, AOI_LEFT, AOI_RIGHT
+from event_joins import join_preceding, join_triggers, join_saccades, get_peri_event_dwell, aggregate_peri_events
+
+
+
+
+###########################################################
+#
+#   Behaviour checks of the temporal joins and peri-event dwell times in event_joins.py on small hand-made streams
+#       -> run with: python -m unittest discover
+#
+###########################################################
+
+
+
+
+class TestJoins(unittest.TestCase):
+    """
+    class for checking the joins of triggers and saccades with fixations
+    """
+
+    def test_join_preceding(self):
+        times = np.array([0, 10, 20, 30])
+        query_times = np.array([-5, 0, 15, 25, 35])
+        np.testing.assert_array_equal(join_preceding(times, query_times), [-1, 0, 1, 2, 3])
+
+    def test_join_preceding_candidates(self):
+        times = np.array([0, 10, 20, 30])
+        candidates = np.array([True, False, True, False])
+        query_times = np.array([-5, 0, 15, 25, 35])
+        np.testing.assert_array_equal(join_preceding(times, query_times, candidates), [-1, 0, 0, 2, 2])
+        np.testing.assert_array_equal(join_preceding(times, query_times, np.zeros(4, dtype=bool)), [-1]*5)
+
+    def test_join_triggers(self):
+        fixation_times = np.array([100, 200, 300, 400])
+        fixation_durations = np.array([50, 50, 50, 50])
+        fixation_codes = np.array([AOI_IMAGE, AOI_RIGHT, AOI_LEFT, AOI_RIGHT])
+        trigger_times = np.array([150, 220, 380, 480])
+        trigger_events = join_triggers(fixation_times, fixation_durations, fixation_codes, trigger_times, AOI_RIGHT)
+
+        np.testing.assert_array_equal(trigger_events['time'], trigger_times)
+        np.testing.assert_array_equal(trigger_events['i_fixation'], [-1, 1, 1, 3])
+            # first trigger precedes all fixations on the right disc
+        np.testing.assert_array_equal(trigger_events['latency'], [-42, 20, 180, 80])
+        np.testing.assert_array_equal(trigger_events['during_fixation'], [False, True, False, False])
+
+    def test_join_triggers_without_code(self):
+        trigger_events = join_triggers(np.array([100]), np.array([50]), np.array([AOI_RIGHT]), np.array([120, 130]),
+            None)
+        np.testing.assert_array_equal(trigger_events['i_fixation'], [-1, -1])
+        np.testing.assert_array_equal(trigger_events['latency'], [-42, -42])
+        np.testing.assert_array_equal(trigger_events['during_fixation'], [False, False])
+
+    def test_join_saccades(self):
+        fixation_times = np.array([100, 200, 300])
+        fixation_codes = np.array([AOI_IMAGE, AOI_LEFT, AOI_BACKGROUND])
+        saccade_times = np.array([50, 150, 250, 350])
+        saccade_events = join_saccades(fixation_times, fixation_codes, saccade_times)
+
+        np.testing.assert_array_equal(saccade_events['i_source'], [-1, 0, 1, 2])
+        np.testing.assert_array_equal(saccade_events['i_target'], [0, 1, 2, -1])
+            # saccade after the last fixation has no target
+        np.testing.assert_array_equal(saccade_events['source_area'], [-1, AOI_IMAGE, AOI_LEFT, AOI_BACKGROUND])
+        np.testing.assert_array_equal(saccade_events['target_area'], [AOI_IMAGE, AOI_LEFT, AOI_BACKGROUND, -1])
+
+
+
+
+class TestPeriEvents(unittest.TestCase):
+    """
+    class for checking the dwell times around events and their pooling over sessions
+    """
+
+    def test_peri_event_dwell(self):
+        fixation_times = np.array([100, 200])
+        fixation_durations = np.array([50, 100])
+        fixation_codes = np.array([AOI_IMAGE, AOI_LEFT])
+        bin_edges = np.array([-100, 0, 120, 250])
+        dwell = get_peri_event_dwell(fixation_times, fixation_durations, fixation_codes, np.array([0, -500]),
+            bin_edges, 4)
+
+        self.assertEqual(dwell.shape, (2, 3, 4))
+        np.testing.assert_array_equal(dwell[0], [[0, 0, 0, 0], [0, 20, 0, 0], [0, 30, 50, 0]])
+            # image fixation spans the edge at 120 ms and left fixation the edge at 250 ms,
+            # no area is fixated from 150 ms to 200 ms
+        np.testing.assert_array_equal(dwell[1], np.zeros((3, 4)))   # all bins before the first fixation
+
+    def test_peri_event_dwell_without_fixations(self):
+        dwell = get_peri_event_dwell(np.zeros(0), np.zeros(0), np.zeros(0), np.array([0]), np.array([0, 10, 20]), 4)
+        np.testing.assert_array_equal(dwell, np.zeros((1, 2, 4)))
+
+    def test_aggregate_peri_events(self):
+        bin_edges = np.array([0, 100, 200])
+        records = [{'functioning_side':'R', 'group':'AA', 'peri_trigger':{'bin_edges':bin_edges,
+                'dwell':np.array([[[0, 10, 20, 30], [0, 0, 50, 50]]])}},
+            {'functioning_side':'L', 'group':'AA', 'peri_trigger':{'bin_edges':bin_edges,
+                'dwell':np.array([[[10, 0, 40, 0], [0, 0, 0, 100]], [[0, 100, 0, 0], [0, 0, 0, 0]]])}},
+            {'functioning_side':None, 'group':'AA', 'peri_trigger':{'bin_edges':bin_edges,
+                'dwell':np.array([[[100, 0, 0, 0], [100, 0, 0, 0]]])}}]    # session without functioning side is skipped
+        groups = aggregate_peri_events(records, ['group'])
+
+        self.assertEqual(groups.keys(), [('AA',)])
+        group = groups[('AA',)]
+        self.assertEqual((group['N_sessions'], group['N_events']), (2, 3))
+        np.testing.assert_array_equal(group['dwell_sum'], [[10, 110, 60, 30, 30+40, 20+0], [0, 0, 50, 150, 50, 150]])
+            # functioning disc is the right disc of the first and the left disc of the second session
+        np.testing.assert_allclose(group['occupancy'], group['dwell_sum'] / 300.0)
+
+    def test_aggregate_peri_events_bin_mismatch(self):
+        records = [{'functioning_side':'R', 'group':'AA', 'peri_trigger':{'bin_edges':np.array([0, 100, 200]),
+                'dwell':np.zeros((1, 2, 4), dtype=int)}},
+            {'functioning_side':'R', 'group':'AA', 'peri_trigger':{'bin_edges':np.array([0, 100, 250]),
+                'dwell':np.zeros((1, 2, 4), dtype=int)}}]
+        self.assertRaises(ValueError, aggregate_peri_events, records, ['group'])
+
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from session_record import AOI_BACKGROUND, AOI_IMAGE, AOI_LEFT, AOI_RIGHT
+from gaze_patterns import compile_patterns, scan_patterns
+
+
+
+
+###########################################################
+#
+#   Behaviour checks of the gaze pattern scan in gaze_patterns.py
+#       -> run with: python -m unittest discover
+#
+#   Functions:
+#       get_baseline_patterns_ex(codes) returns (i_starts, i_ends, names)
+#
+###########################################################
+
+
+PATTERNS_EX_DECLARATIONS = [    # extended gaze patterns as declared in extract_scalars.py
+    ('L_pattern_ex', 'image -> ![R image]* -> L -> ![R image]* -> image'),
+    ('R_pattern_ex', 'image -> ![L image]* -> R -> ![L image]* -> image'),
+    ('LR_pattern_ex', 'image -> !image* -> (L -> !image* -> R | R -> !image* -> L) -> !image* -> image')]
+
+
+
+
+def get_baseline_patterns_ex(codes):
+    """
+    function for finding the extended gaze patterns as the baseline did before they were declared as patterns
+    -> an extended gaze pattern is recorded between two successive image fixations if the fixations in between
+        went to the left disc only, the right disc only, or to both discs
+
+    input: codes (ndarray), interest area codes of fixations
+
+    output:
+        i_starts (ndarray), index of image fixation starting each extended gaze pattern
+        i_ends (ndarray), index of image fixation finishing each extended gaze pattern
+        names (ndarray), name of each extended gaze pattern
+    """
+
+    i_image = np.flatnonzero(codes == AOI_IMAGE)
+    if len(i_image) < 2:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=str)
+
+    has_L = np.logical_or.reduceat(codes == AOI_LEFT, i_image)[:-1]
+    has_R = np.logical_or.reduceat(codes == AOI_RIGHT, i_image)[:-1]
+    is_pattern = has_L | has_R
+    names = np.where(has_R, np.where(has_L, 'LR_pattern_ex', 'R_pattern_ex'), 'L_pattern_ex')
+
+    return i_image[:-1][is_pattern], i_image[1:][is_pattern], names[is_pattern]
+
+
+
+
+class TestScanPatterns(unittest.TestCase):
+    """
+    class for checking the occurrences found by scan_patterns()
+    """
+
+    def setUp(self):
+        self.patterns_ex = compile_patterns(PATTERNS_EX_DECLARATIONS)
+
+    def test_patterns_ex(self):
+        codes = np.array([AOI_IMAGE, AOI_LEFT, AOI_BACKGROUND, AOI_IMAGE, AOI_RIGHT, AOI_LEFT, AOI_IMAGE, AOI_IMAGE,
+            AOI_BACKGROUND, AOI_RIGHT], dtype=np.int8)
+        results = scan_patterns(self.patterns_ex, codes, np.arange(len(codes))*100)
+
+        self.assertEqual([results[name]['N'] for name in self.patterns_ex['names']], [1, 0, 1])
+        np.testing.assert_array_equal(results['L_pattern_ex']['i_starts'], [0])
+        np.testing.assert_array_equal(results['L_pattern_ex']['i_ends'], [3])
+        np.testing.assert_array_equal(results['L_pattern_ex']['times'], [0])
+        np.testing.assert_array_equal(results['LR_pattern_ex']['i_starts'], [3])
+        np.testing.assert_array_equal(results['LR_pattern_ex']['i_ends'], [6])
+            # image fixations without disc fixation in between and the unfinished pattern at the end are not counted
+
+    def test_patterns_ex_baseline(self):
+        random_state = np.random.RandomState(0)
+        for i_trial in xrange(300):     # loop over random sequences
+            codes = random_state.randint(0, 4, random_state.randint(0, 80)).astype(np.int8)
+            results = scan_patterns(self.patterns_ex, codes)
+            i_starts, i_ends, names = get_baseline_patterns_ex(codes)
+            for name in self.patterns_ex['names']:
+                self.assertEqual(results[name]['N'], np.sum(names == name))
+                np.testing.assert_array_equal(results[name]['i_starts'], i_starts[names == name])
+                np.testing.assert_array_equal(results[name]['i_ends'], i_ends[names == name])
+
+    def test_long_excursion(self):
+        codes = np.array([AOI_IMAGE] + [AOI_BACKGROUND, AOI_LEFT, AOI_BACKGROUND, AOI_RIGHT]*20000 + [AOI_IMAGE],
+            dtype=np.int8)
+        results = scan_patterns(self.patterns_ex, codes)
+        self.assertEqual([results[name]['N'] for name in self.patterns_ex['names']], [0, 0, 1])
+        np.testing.assert_array_equal(results['LR_pattern_ex']['i_ends'], [len(codes)-1])
+
+
+
+
+if __name__ == '__main__':
+    unittest.main()